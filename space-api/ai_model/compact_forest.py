@@ -0,0 +1,102 @@
+import numpy as np
+
+from ai_model.feature_vectorizer import FeatureVectorizer
+
+# Array-backed evaluator for the RandomForest pipelines trained in
+# generate_and_train_models.py. The exporter flattens every tree of a fitted
+# forest into contiguous NumPy arrays and stores the StandardScaler /
+# OneHotEncoder parameters alongside them, so serving needs only NumPy.
+#
+# Results are bit-identical to the sklearn pipeline: features are scaled in
+# float64 and cast to float32 before the splits are compared, leaf
+# probabilities are normalised the way DecisionTreeClassifier does it, and
+# per-tree outputs are summed in tree order before averaging.
+
+COMPACT_SUFFIX = ".forest.npz"
+
+
+class CompactForest:
+    def __init__(self, arrays):
+        self.kind = str(arrays["kind"])
+        self.classes = arrays["classes"] if self.kind == "classifier" else None
+
+        bounds = np.cumsum(np.concatenate([[0], arrays["category_counts"]])).astype(np.intp)
+        self.vectorizer = FeatureVectorizer(
+            [str(name) for name in arrays["numeric_features"]],
+            arrays["numeric_mean"],
+            arrays["numeric_scale"],
+            [str(name) for name in arrays["categorical_features"]],
+            [arrays["categories"][bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)],
+        )
+
+        self.feature = arrays["feature"].astype(np.intp)
+        self.threshold = arrays["threshold"]
+        self.values = arrays["values"]
+        self.roots = arrays["roots"].astype(np.intp)
+        self.max_depth = int(arrays["max_depth"])
+        # Interleaved (right, left) children: the next node is children[2 * node + went_left]
+        self._children = np.empty(2 * len(self.feature), dtype=np.intp)
+        self._children[0::2] = arrays["right"]
+        self._children[1::2] = arrays["left"]
+        # Leaves are exported as their own children
+        self._is_leaf = arrays["left"] == np.arange(len(self.feature))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def transform(self, X):
+        """
+        Map raw input columns to the float32 matrix the trees split on.
+        X is any mapping of column name -> sequence (a dict of lists or a DataFrame),
+        or a matrix already produced by self.vectorizer, which is passed through.
+        """
+        if isinstance(X, np.ndarray):
+            return X
+        return self.vectorizer.transform_columns(X)
+
+    def _tree_outputs(self, Xt):
+        """Leaf values of every tree for every row, shaped (n_trees, n_rows, n_values)."""
+        n_rows, n_features = Xt.shape
+        flat = Xt.ravel()
+        # Every (tree, row) pair, tree-major. A pair leaves the active set as
+        # soon as it reaches a leaf, so each step only walks the deeper paths.
+        leaves = np.repeat(self.roots, n_rows)
+        active = np.flatnonzero(~self._is_leaf[leaves])
+        nodes = leaves[active]
+        row_base = (active % n_rows) * n_features
+        for _ in range(self.max_depth):
+            if not len(active):
+                break
+            go_left = flat[row_base + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self._children[2 * nodes + go_left]
+            inner = ~self._is_leaf[nodes]
+            leaves[active[~inner]] = nodes[~inner]
+            active, nodes, row_base = active[inner], nodes[inner], row_base[inner]
+        return self.values[leaves].reshape(self.n_trees, n_rows, -1)
+
+    def _average(self, Xt):
+        # Add the trees one after another, as the forest accumulates them: a
+        # reduce over the tree axis sums pairwise when there is a single row
+        outputs = self._tree_outputs(Xt)
+        out = outputs[0].copy()
+        for tree_output in outputs[1:]:
+            out += tree_output
+        out /= self.n_trees
+        return out
+
+    def predict_proba(self, X):
+        if self.kind != "classifier":
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._average(self.transform(X))
+
+    def predict(self, X):
+        averaged = self._average(self.transform(X))
+        if self.kind == "classifier":
+            return self.classes.take(np.argmax(averaged, axis=1), axis=0)
+        return averaged[:, 0]
@@ -0,0 +1,151 @@
+import threading
+
+import numpy as np
+
+# Feature vectorizer for the preprocessing pipelines trained in
+# generate_and_train_models.py (StandardScaler on the numeric columns, then
+# OneHotEncoder(handle_unknown='ignore') on the categorical ones). It holds the
+# fitted means, scales and categories and writes request feature dicts
+# straight into the float32 matrix the forests split on, with no DataFrame or
+# ColumnTransformer in between.
+#
+# Output is identical to pipeline[:-1].transform(pd.DataFrame(rows)) followed by
+# the forest's float32 cast: numeric features are scaled in float64 with the
+# same subtract-then-divide, and categories are matched on their string form.
+
+
+class FeatureVectorizer:
+    def __init__(self, numeric_features, numeric_mean, numeric_scale, categorical_features, categories):
+        self.numeric_features = list(numeric_features)
+        self.numeric_mean = np.asarray(numeric_mean, dtype=np.float64)
+        self.numeric_scale = np.asarray(numeric_scale, dtype=np.float64)
+        self.categorical_features = list(categorical_features)
+        self.categories = [np.asarray(c, dtype=str) for c in categories]
+
+        # Output column of every known category, per categorical feature
+        column = len(self.numeric_features)
+        self._category_columns = []
+        for name, values in zip(self.categorical_features, self.categories):
+            self._category_columns.append((name, {value: column + i for i, value in enumerate(values.tolist())}))
+            column += len(values)
+        self.n_features = column
+        # Per-thread scratch for single rows (the model executor scores on several threads)
+        self._local = threading.local()
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Read the fitted parameters of a Pipeline whose first step is the 'preprocessor' ColumnTransformer."""
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        numeric_features, numeric_mean, numeric_scale = [], [], []
+        categorical_features, categories = [], []
+        for name, transformer, columns in pipeline.named_steps['preprocessor'].transformers_:
+            if name == 'remainder':
+                if transformer != 'drop':
+                    raise ValueError("Only remainder='drop' pipelines can be vectorized")
+            elif isinstance(transformer, StandardScaler):
+                if categorical_features:
+                    raise ValueError("Numeric columns must precede categorical columns")
+                numeric_features += list(columns)
+                numeric_mean.append(transformer.mean_)
+                numeric_scale.append(transformer.scale_)
+            elif isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None or transformer.handle_unknown != 'ignore':
+                    raise ValueError("Only OneHotEncoder(handle_unknown='ignore') without drop can be vectorized")
+                categorical_features += list(columns)
+                categories += list(transformer.categories_)
+            else:
+                raise ValueError(f"Cannot vectorize transformer {name!r} of type {type(transformer).__name__}")
+        return cls(
+            numeric_features,
+            np.concatenate(numeric_mean) if numeric_mean else [],
+            np.concatenate(numeric_scale) if numeric_scale else [],
+            categorical_features,
+            categories,
+        )
+
+    def _scratch(self):
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = (
+                np.empty(len(self.numeric_features), dtype=np.float64),
+                np.empty((1, self.n_features), dtype=np.float32),
+            )
+        return scratch
+
+    def transform(self, rows):
+        """
+        Map a list of feature dicts to the float32 model input matrix.
+        A single row is written into a preallocated per-thread buffer, so the
+        result is only valid until the next call on the same thread.
+        """
+        if len(rows) == 1:
+            return self._transform_one(rows[0])
+
+        n_rows, n_numeric = len(rows), len(self.numeric_features)
+        Xt = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        if n_numeric:
+            names = self.numeric_features
+            numeric = np.fromiter((row[name] for row in rows for name in names), dtype=np.float64,
+                                  count=n_rows * n_numeric).reshape(n_rows, n_numeric)
+            numeric -= self.numeric_mean
+            numeric /= self.numeric_scale
+            Xt[:, :n_numeric] = numeric
+        row_index = np.arange(n_rows)
+        for name, columns in self._category_columns:
+            # Unknown categories encode as all zeros (handle_unknown='ignore')
+            hit = np.fromiter((columns.get(str(row[name]), -1) for row in rows), dtype=np.intp, count=n_rows)
+            known = hit >= 0
+            Xt[row_index[known], hit[known]] = 1.0
+        return Xt
+
+    def _transform_one(self, row):
+        numeric, Xt = self._scratch()
+        for i, name in enumerate(self.numeric_features):
+            numeric[i] = row[name]
+        numeric -= self.numeric_mean
+        numeric /= self.numeric_scale
+        out = Xt[0]
+        n_numeric = len(numeric)
+        out[:n_numeric] = numeric
+        out[n_numeric:] = 0.0
+        for name, columns in self._category_columns:
+            column = columns.get(str(row[name]))
+            if column is not None:
+                out[column] = 1.0
+        return Xt
+
+    def transform_columns(self, X):
+        """The same matrix from a mapping of column name -> sequence (a dict of lists or a DataFrame)."""
+        columns = [np.asarray(X[name], dtype=np.float64) for name in self.numeric_features]
+        n_rows = len(columns[0]) if columns else len(X[self.categorical_features[0]])
+        Xt = np.empty((n_rows, self.n_features), dtype=np.float32)
+
+        if columns:
+            numeric = np.column_stack(columns)
+            numeric -= self.numeric_mean
+            numeric /= self.numeric_scale
+            Xt[:, :len(columns)] = numeric
+
+        col = len(columns)
+        for name, categories in zip(self.categorical_features, self.categories):
+            # Unknown categories encode as all zeros (handle_unknown='ignore')
+            values = np.asarray(X[name]).astype(str)
+            Xt[:, col:col + len(categories)] = values[:, None] == categories[None, :]
+            col += len(categories)
+        return Xt
+
+
+class VectorizedPipeline:
+    """A fitted sklearn pipeline served through a FeatureVectorizer: only its final estimator runs."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.vectorizer = FeatureVectorizer.from_pipeline(pipeline)
+        self.estimator = pipeline.steps[-1][1]
+
+    def predict(self, Xt):
+        return self.estimator.predict(Xt)
+
+    def predict_proba(self, Xt):
+        return self.estimator.predict_proba(Xt)
@@ -7,19 +7,46 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 import joblib
 import os
+import time
+import sys
+import argparse
+from contextlib import contextmanager
 
 # Define the directory to save models
 MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MODEL_DIR))
+
+from ai_model.compact_forest import COMPACT_SUFFIX  # noqa: E402
+from ai_model.feature_vectorizer import FeatureVectorizer  # noqa: E402
+MODEL_NAMES = ['mission_success_model', 'satellite_collision_risk_model', 'satellite_lifespan_model']
 
 # --- Synthetic Data Generation ---
+# Fully vectorized: every column is drawn for all samples at once, so
+# millions of rows take seconds.
+
+ORBIT_TYPES = np.array(['LEO', 'MEO', 'GEO'])
+RISK_LEVELS = np.array(['Low', 'Medium', 'High'])
+# P(risk level | orbit type), rows in ORBIT_TYPES order
+RISK_PROBABILITIES = np.array([
+    [0.2, 0.4, 0.4],  # LEO -> higher risk
+    [0.4, 0.4, 0.2],  # MEO
+    [0.7, 0.2, 0.1],  # GEO -> lower risk
+])
+MEAN_LIFESPAN_MONTHS = np.array([60, 120, 240])  # LEO, MEO, GEO
+
+@contextmanager
+def timed(label):
+    start = time.perf_counter()
+    yield
+    print(f"  {label}: {time.perf_counter() - start:.2f}s")
 
-def generate_mission_data(num_samples=1000):
-    np.random.seed(42)
+def generate_mission_data(num_samples=1000, seed=42):
+    rng = np.random.default_rng(seed)
     data = {
-        'payload_mass_kg': np.random.uniform(100, 20000, num_samples),
-        'mission_duration_days': np.random.randint(10, 1000, num_samples),
-        'launch_vehicle_reliability': np.random.uniform(0.7, 0.99, num_samples),
-        'num_stages': np.random.randint(1, 4, num_samples),
+        'payload_mass_kg': rng.uniform(100, 20000, num_samples),
+        'mission_duration_days': rng.integers(10, 1000, num_samples),
+        'launch_vehicle_reliability': rng.uniform(0.7, 0.99, num_samples),
+        'num_stages': rng.integers(1, 4, num_samples),
     }
     df = pd.DataFrame(data)
 
@@ -34,43 +61,46 @@ def generate_mission_data(num_samples=1000):
 
     return df
 
-def generate_satellite_data(num_samples=1000):
-    np.random.seed(42)
-    orbit_types = ['LEO', 'MEO', 'GEO']
-    risk_levels = ['Low', 'Medium', 'High']
+def generate_satellite_data(num_samples=1000, seed=42):
+    rng = np.random.default_rng(seed)
+    orbit = rng.integers(0, len(ORBIT_TYPES), num_samples)
 
     data = {
-        'orbit_type': np.random.choice(orbit_types, num_samples),
-        'launch_year': np.random.randint(1990, 2023, num_samples),
-        'age_at_prediction_months': np.random.randint(1, 300, num_samples), # Age in months
-        'maintenance_cost_usd_per_year': np.random.uniform(1000, 50000, num_samples),
-        'component_health_score': np.random.uniform(0.1, 1.0, num_samples), # 1.0 = perfect health
+        'orbit_type': ORBIT_TYPES[orbit],
+        'launch_year': rng.integers(1990, 2023, num_samples),
+        'age_at_prediction_months': rng.integers(1, 300, num_samples), # Age in months
+        'maintenance_cost_usd_per_year': rng.uniform(1000, 50000, num_samples),
+        'component_health_score': rng.uniform(0.1, 1.0, num_samples), # 1.0 = perfect health
     }
     df = pd.DataFrame(data)
 
     # Simple rule for collision risk and lifespan
     # LEO -> Higher risk, shorter lifespan
     # GEO -> Lower risk, longer lifespan
-    df['collision_risk'] = df.apply(lambda row: np.random.choice(
-        risk_levels, p=[0.7, 0.2, 0.1] if row['orbit_type'] == 'GEO' else \
-                       ([0.2, 0.4, 0.4] if row['orbit_type'] == 'LEO' else \
-                        [0.4, 0.4, 0.2])
-    ), axis=1)
-    
-    df['lifespan_months'] = df.apply(lambda row: int(np.random.normal(
-        240 if row['orbit_type'] == 'GEO' else (
-        60 if row['orbit_type'] == 'LEO' else 120), 20
-    )), axis=1).clip(12, 360) # Clip between 1 year and 30 years
+    # Risk: inverse-CDF sampling from each row's orbit-specific distribution
+    cumulative = np.cumsum(RISK_PROBABILITIES, axis=1)[orbit]
+    risk = (rng.random(num_samples)[:, np.newaxis] >= cumulative[:, :-1]).sum(axis=1)
+
+    lifespan = rng.normal(MEAN_LIFESPAN_MONTHS[orbit], 20).astype(int).clip(12, 360) # Clip between 1 year and 30 years
 
     # Adjust risk and lifespan based on other factors
-    df['collision_risk'] = df.apply(lambda row: 'High' if row['component_health_score'] < 0.3 else row['collision_risk'], axis=1)
-    df['lifespan_months'] = df.apply(lambda row: max(12, row['lifespan_months'] * row['component_health_score'] * 0.8), axis=1) # Health affects lifespan
+    health = data['component_health_score']
+    risk[health < 0.3] = len(RISK_LEVELS) - 1 # Poor health -> 'High'
+    df['collision_risk'] = RISK_LEVELS[risk]
+    df['lifespan_months'] = np.maximum(12, lifespan * health * 0.8) # Health affects lifespan
 
     return df
 
 # --- Model Training and Saving ---
 
-def train_and_save_mission_model(df):
+def _fit(model, X, y):
+    model.fit(X, y)
+    # Trees are built in parallel, but the served model scores one request at a
+    # time, where a joblib worker pool per call costs more than it saves
+    model.steps[-1][1].set_params(n_jobs=None)
+    return model
+
+def train_and_save_mission_model(df, n_estimators=100, n_jobs=-1, max_samples=None):
     X = df.drop(columns=['success_chance', 'success'])
     y = df['success']
 
@@ -82,13 +112,13 @@ def train_and_save_mission_model(df):
         ])
 
     model = Pipeline(steps=[('preprocessor', preprocessor),
-                            ('classifier', RandomForestClassifier(random_state=42))])
+                            ('classifier', RandomForestClassifier(n_estimators=n_estimators, n_jobs=n_jobs, max_samples=max_samples, random_state=42))])
 
-    model.fit(X, y)
+    _fit(model, X, y)
     joblib.dump(model, os.path.join(MODEL_DIR, 'mission_success_model.joblib'))
     print("Mission Success Model trained and saved.")
 
-def train_and_save_satellite_models(df):
+def train_and_save_satellite_models(df, n_estimators=100, n_jobs=-1, max_samples=None):
     # Collision Risk Model
     X_risk = df.drop(columns=['collision_risk', 'lifespan_months'])
     y_risk = df['collision_risk']
@@ -103,9 +133,9 @@ def train_and_save_satellite_models(df):
         ])
 
     risk_model = Pipeline(steps=[('preprocessor', preprocessor_risk),
-                                 ('classifier', RandomForestClassifier(random_state=42))])
+                                 ('classifier', RandomForestClassifier(n_estimators=n_estimators, n_jobs=n_jobs, max_samples=max_samples, random_state=42))])
 
-    risk_model.fit(X_risk, y_risk)
+    _fit(risk_model, X_risk, y_risk)
     joblib.dump(risk_model, os.path.join(MODEL_DIR, 'satellite_collision_risk_model.joblib'))
     print("Satellite Collision Risk Model trained and saved.")
 
@@ -123,22 +153,118 @@ def train_and_save_satellite_models(df):
         ])
 
     lifespan_model = Pipeline(steps=[('preprocessor', preprocessor_lifespan),
-                                     ('regressor', RandomForestRegressor(random_state=42))])
+                                     ('regressor', RandomForestRegressor(n_estimators=n_estimators, n_jobs=n_jobs, max_samples=max_samples, random_state=42))])
 
-    lifespan_model.fit(X_lifespan, y_lifespan)
+    _fit(lifespan_model, X_lifespan, y_lifespan)
     joblib.dump(lifespan_model, os.path.join(MODEL_DIR, 'satellite_lifespan_model.joblib'))
     print("Satellite Lifespan Model trained and saved.")
 
 
+# --- Compact Forest Export ---
+
+def export_compact_forest(pipeline, path):
+    """
+    Flatten a fitted preprocessing + RandomForest pipeline into contiguous
+    NumPy arrays (see compact_forest.py) and save them as an .npz file.
+    """
+    # Scaler/encoder parameters, validated the same way the API's vectorizer reads them
+    vectorizer = FeatureVectorizer.from_pipeline(pipeline)
+    forest = pipeline.steps[-1][1]
+    categories = vectorizer.categories
+
+    is_classifier = isinstance(forest, RandomForestClassifier)
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        # Leaves loop back to themselves, which is how the traversal recognises them
+        features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(tree.threshold.astype(np.float64))
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left).astype(np.int32) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right).astype(np.int32) + offset)
+        if is_classifier:
+            # Normalise exactly as DecisionTreeClassifier.predict_proba does
+            proba = tree.value[:, 0, :forest.n_classes_]
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer)
+        else:
+            values.append(tree.value[:, 0, :1])
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    # String labels are stored as fixed-width unicode so the file loads without pickle
+    classes = np.asarray(forest.classes_) if is_classifier else np.array([])
+    if classes.dtype == object:
+        classes = classes.astype(str)
+
+    np.savez(
+        path,
+        kind=np.array('classifier' if is_classifier else 'regressor'),
+        classes=classes,
+        numeric_features=np.array(vectorizer.numeric_features, dtype=str),
+        numeric_mean=vectorizer.numeric_mean,
+        numeric_scale=vectorizer.numeric_scale,
+        categorical_features=np.array(vectorizer.categorical_features, dtype=str),
+        categories=np.concatenate(categories) if categories else np.array([], dtype=str),
+        category_counts=np.array([len(c) for c in categories], dtype=np.int64),
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts),
+        right=np.concatenate(rights),
+        values=np.concatenate(values),
+        roots=np.array(roots, dtype=np.int32),
+        max_depth=np.array(max_depth),
+    )
+
+def export_all_compact_models():
+    for name in MODEL_NAMES:
+        model_path = os.path.join(MODEL_DIR, f'{name}.joblib')
+        if not os.path.exists(model_path):
+            print(f"Skipping {name}: {model_path} not found.")
+            continue
+        export_compact_forest(joblib.load(model_path), os.path.join(MODEL_DIR, f'{name}{COMPACT_SUFFIX}'))
+        print(f"Exported compact forest for {name}.")
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Train the AI models and export compact forests.")
+    parser.add_argument('--export-only', action='store_true',
+                        help="Skip training; export compact forests from the saved .joblib models")
+    parser.add_argument('--mission-samples', type=int, default=1000)
+    parser.add_argument('--satellite-samples', type=int, default=1000)
+    parser.add_argument('--n-estimators', type=int, default=100, help="Trees per forest")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Parallel tree-building jobs (-1 = all cores)")
+    parser.add_argument('--max-samples', type=float, default=None,
+                        help="Fraction of the samples drawn to build each tree (default: all)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.export_only:
+        export_all_compact_models()
+        raise SystemExit(0)
+
+    total_start = time.perf_counter()
     print("Generating synthetic mission data...")
-    mission_df = generate_mission_data()
+    with timed("generate"):
+        mission_df = generate_mission_data(args.mission_samples, args.seed)
     print(f"Generated {len(mission_df)} mission samples.")
-    train_and_save_mission_model(mission_df)
+    with timed("train"):
+        train_and_save_mission_model(mission_df, args.n_estimators, args.n_jobs, args.max_samples)
 
     print("\nGenerating synthetic satellite data...")
-    satellite_df = generate_satellite_data()
+    with timed("generate"):
+        satellite_df = generate_satellite_data(args.satellite_samples, args.seed)
     print(f"Generated {len(satellite_df)} satellite samples.")
-    train_and_save_satellite_models(satellite_df)
+    with timed("train"):
+        train_and_save_satellite_models(satellite_df, args.n_estimators, args.n_jobs, args.max_samples)
+
+    print("\nExporting compact forests...")
+    with timed("export"):
+        export_all_compact_models()
 
-    print("\nSynthetic data generation and model training complete.") 
\ No newline at end of file
+    print(f"\nSynthetic data generation and model training complete in {time.perf_counter() - total_start:.2f}s.")
@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+
+from ai_model.compact_forest import COMPACT_SUFFIX, CompactForest
+from ai_model.feature_vectorizer import VectorizedPipeline
+
+# Registry of the trained models served under /ai. Nothing is read from disk
+# at import time: by default the API starts serving the CRUD routes at once and
+# a background thread loads the models (MODEL_LOADING=background). With
+# MODEL_LOADING=lazy each model is loaded by the first request that needs it,
+# and MODEL_LOADING=eager loads everything before startup completes, failing
+# startup when a model file is missing.
+#
+# Compact forest exports (NumPy only) are preferred; joblib, and with it
+# sklearn, is only imported when a model has no compact export or when a batch
+# of MODEL_SKLEARN_BATCH_ROWS rows or more arrives, which sklearn's compiled
+# traversal scores faster. Either way a served model has a .vectorizer that
+# turns request feature dicts into its input matrix, and predict/predict_proba
+# take that matrix.
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_NAMES = ['mission_success_model', 'satellite_collision_risk_model', 'satellite_lifespan_model']
+MODEL_LOADING = os.getenv("MODEL_LOADING", "background")
+MODEL_LOADING_MODES = ("background", "lazy", "eager")
+# Batches at least this large go to the sklearn forest (0: always the compact one)
+MODEL_SKLEARN_BATCH_ROWS = int(os.getenv("MODEL_SKLEARN_BATCH_ROWS", "1000"))
+
+
+class ModelUnavailable(Exception):
+    """A model could not be loaded (missing, unreadable or incompatible file)."""
+
+
+class BatchRoutedForest:
+    """
+    A CompactForest whose large batches are scored by the fitted sklearn forest
+    it was exported from; both give identical predictions. The joblib file is
+    loaded by the first large batch, and if it cannot be, the compact forest
+    keeps serving every batch.
+    """
+
+    def __init__(self, compact, joblib_path, batch_rows=MODEL_SKLEARN_BATCH_ROWS):
+        self.compact = compact
+        self.vectorizer = compact.vectorizer
+        self.joblib_path = joblib_path
+        self.batch_rows = batch_rows
+        self._estimator = None
+        self._lock = threading.Lock()
+
+    def _model_for(self, Xt):
+        if len(Xt) < self.batch_rows:
+            return self.compact
+        if self._estimator is None:
+            with self._lock:
+                if self._estimator is None:
+                    try:
+                        import joblib
+
+                        self._estimator = joblib.load(self.joblib_path).steps[-1][1]
+                    except Exception as e:
+                        print(f"Warning: {self.joblib_path} could not be loaded ({e}); "
+                              f"large batches stay on the compact forest")
+                        self._estimator = self.compact
+        return self._estimator
+
+    def predict(self, Xt):
+        return self._model_for(Xt).predict(Xt)
+
+    def predict_proba(self, Xt):
+        return self._model_for(Xt).predict_proba(Xt)
+
+
+def load_model(name):
+    # Returns the model and a version string derived from the file that was loaded
+    compact_path = os.path.join(MODEL_DIR, name + COMPACT_SUFFIX)
+    joblib_path = os.path.join(MODEL_DIR, name + '.joblib')
+    if os.path.exists(compact_path):
+        path, model = compact_path, CompactForest.load(compact_path)
+        # Only when the export is at least as new as the pipeline, so both hold the same trees
+        if MODEL_SKLEARN_BATCH_ROWS and os.path.exists(joblib_path) and \
+                os.stat(joblib_path).st_mtime_ns <= os.stat(compact_path).st_mtime_ns:
+            model = BatchRoutedForest(model, joblib_path)
+    else:
+        import joblib
+
+        path = joblib_path
+        model = VectorizedPipeline(joblib.load(path))
+    stat = os.stat(path)
+    return model, f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class ModelRegistry:
+    def __init__(self, names=MODEL_NAMES, mode=MODEL_LOADING, on_reload=None):
+        if mode not in MODEL_LOADING_MODES:
+            raise ValueError(f"MODEL_LOADING must be one of {MODEL_LOADING_MODES}, got {mode!r}")
+        self.names = list(names)
+        self.mode = mode
+        self.on_reload = on_reload
+        # name -> (model, version); entries are replaced whole so a model is never paired with another version
+        self._models = {}
+        self._errors = {}
+        self._load_seconds = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load(self, name):
+        # Called with the lock held
+        start = time.perf_counter()
+        try:
+            self._models[name] = load_model(name)
+        except Exception as e:
+            # Unpickling can fail with anything (e.g. AttributeError or
+            # ModuleNotFoundError for a model saved by another sklearn version)
+            self._errors[name] = f"{type(e).__name__}: {e}"
+            raise ModelUnavailable(f"Model '{name}' is not available: {e}") from e
+        self._errors.pop(name, None)
+        self._load_seconds[name] = round(time.perf_counter() - start, 4)
+        return self._models[name]
+
+    def get(self, name):
+        """(model, version) for `name`, loading it first if needed; raises ModelUnavailable."""
+        entry = self._models.get(name)
+        if entry is not None:
+            return entry
+        with self._lock:
+            # A background load may have finished while we waited for the lock
+            entry = self._models.get(name)
+            return entry if entry is not None else self._load(name)
+
+    def load_all(self):
+        """Load every model not loaded yet; raises ModelUnavailable for the first that fails."""
+        failed = None
+        for name in self.names:
+            try:
+                self.get(name)
+            except ModelUnavailable as e:
+                failed = failed or e
+        if failed:
+            raise failed
+
+    def _load_in_background(self):
+        try:
+            self.load_all()
+            print("AI models loaded successfully!")
+        except ModelUnavailable as e:
+            print(f"Error: {e}. Please run generate_and_train_models.py first.")
+
+    def start(self):
+        """Begin loading according to the loading mode (called on application startup)."""
+        if self.mode == "eager":
+            self.load_all()
+            print("AI models loaded successfully!")
+        elif self.mode == "background" and self._thread is None:
+            self._thread = threading.Thread(target=self._load_in_background, name="model-loader", daemon=True)
+            self._thread.start()
+
+    def reload(self):
+        """Reload every model from disk; the previous set stays in service if any file fails to load."""
+        try:
+            models = {name: load_model(name) for name in self.names}
+        except Exception as e:
+            raise ModelUnavailable(f"Model reload failed: {e}") from e
+        with self._lock:
+            self._models = models
+            self._errors = {}
+        if self.on_reload:
+            self.on_reload()
+
+    def versions(self):
+        return {name: version for name, (_, version) in self._models.items()}
+
+    def ready(self):
+        return all(name in self._models for name in self.names)
+
+    def status(self):
+        loading = self._thread is not None and self._thread.is_alive()
+        models = {}
+        for name in self.names:
+            if name in self._models:
+                models[name] = {"state": "ready", "version": self._models[name][1],
+                                "load_seconds": self._load_seconds.get(name)}
+            elif name in self._errors:
+                models[name] = {"state": "failed", "error": self._errors[name]}
+            else:
+                models[name] = {"state": "loading" if loading else "not_loaded"}
+        return {"ready": self.ready(), "mode": self.mode, "models": models}
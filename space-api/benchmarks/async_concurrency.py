@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import anyio
+import httpx
+from fastapi import FastAPI
+
+# Compares a sync `def` handler (run on FastAPI's worker threadpool) with an
+# `async def` handler on the asyncio pool, both waiting on a slow query.
+# The sync handler can never have more requests in flight than the threadpool
+# has threads; the async one is only bounded by the session pool.
+#
+#   python benchmarks/async_concurrency.py --concurrency 200 --latency-ms 50
+#   python benchmarks/async_concurrency.py --simulate   # no database needed
+#
+# Against a real database, size ORACLE_POOL_MAX / ORACLE_ASYNC_POOL_MAX to at
+# least --concurrency so the session pools are not the bottleneck.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SLEEP_SQL = "BEGIN DBMS_SESSION.SLEEP(:1); END;"
+
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        self.current -= 1
+
+
+def build_app(latency, simulate):
+    app = FastAPI()
+    counters = {"sync": InFlight(), "async": InFlight()}
+
+    if simulate:
+        def slow_query():
+            time.sleep(latency)
+
+        async def slow_query_async():
+            await asyncio.sleep(latency)
+    else:
+        from database import get_db, get_db_async
+
+        def slow_query():
+            with get_db() as connection:
+                connection.cursor().execute(SLEEP_SQL, [latency])
+
+        async def slow_query_async():
+            async with get_db_async() as connection:
+                await connection.cursor().execute(SLEEP_SQL, [latency])
+
+    @app.get("/sync")
+    def sync_handler():
+        with counters["sync"]:
+            slow_query()
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_handler():
+        with counters["async"]:
+            await slow_query_async()
+        return {"ok": True}
+
+    return app, counters
+
+
+async def run(app, path, concurrency, rounds):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm-up (pool creation, first session)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            responses = await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+            assert all(r.status_code == 200 for r in responses)
+        return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Sync vs async handler concurrency under a slow query.")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--simulate", action="store_true",
+                        help="Replace the database round trip with a sleep of --latency-ms")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000.0
+    app, counters = build_app(latency, args.simulate)
+    threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+    total = args.concurrency * args.rounds
+    print(f"threadpool size: {threads}, concurrency: {args.concurrency}, "
+          f"query latency: {args.latency_ms:.0f} ms, {'simulated' if args.simulate else 'database'}")
+
+    for name, path in (("sync def", "/sync"), ("async def", "/async")):
+        elapsed = await run(app, path, args.concurrency, args.rounds)
+        peak = counters[path.strip("/")].peak
+        print(f"{name:>10}: {total / elapsed:8.0f} req/s  {elapsed * 1000 / args.rounds:8.1f} ms/round  "
+              f"peak in flight {peak}")
+
+    if not args.simulate:
+        from database import close_async_pool, close_pool
+        close_pool()
+        await close_async_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
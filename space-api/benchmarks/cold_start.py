@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Cold-start benchmark for main.py. Each run boots the API in a fresh Python
+# process (as a new worker would) under one MODEL_LOADING mode and reports,
+# from process spawn:
+#   import    - main.py imported (routers, drivers, ML libraries)
+#   first     - startup hooks done and the first CRUD response (GET /) served
+#   ready     - /ready answers 200 (every model loaded; not measured for lazy,
+#               where models load only when a request needs them)
+#   predict   - first /ai/predict/mission_success response
+# plus resident memory at that point and whether pandas/sklearn were imported.
+#
+#   python benchmarks/cold_start.py --runs 5
+#   python benchmarks/cold_start.py --modes background eager
+#
+# Needs the trained models in ai_model/ (python ai_model/generate_and_train_models.py).
+# No database connection is made: the pools are created on first use.
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("background", "lazy", "eager")
+PHASES = ("import", "first", "ready", "predict")
+
+CHILD = r"""
+import json, sys, time
+spawned = float(sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+import main
+imported = time.time()
+
+from fastapi.testclient import TestClient
+
+with TestClient(main.app) as client:
+    assert client.get("/").status_code == 200
+    first = time.time()
+    ready = None
+    if main.model_registry.mode != "lazy":
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        ready = time.time() - spawned
+    assert client.post("/ai/predict/mission_success", json={"payload_mass_kg": 1000}).status_code == 200
+    predict = time.time()
+    with open("/proc/self/statm") as f:
+        import os
+        rss_mb = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+print(json.dumps({
+    "import": imported - spawned,
+    "first": first - spawned,
+    "ready": ready,
+    "predict": predict - spawned,
+    "rss_mb": rss_mb,
+    "pandas": "pandas" in sys.modules,
+    "sklearn": "sklearn" in sys.modules,
+}))
+"""
+
+
+def run_once(mode):
+    env = dict(os.environ, MODEL_LOADING=mode)
+    spawned = time.time()
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", CHILD, repr(spawned), API_DIR], env=env,
+                            cwd=API_DIR, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API cold-start time per model loading mode.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode (medians are reported)")
+    args = parser.parse_args()
+
+    run_once(args.modes[0])  # warm the OS page cache and .pyc files
+    print(f"{'mode':>10}" + "".join(f"{phase + ' s':>11}" for phase in PHASES) + f"{'rss MB':>9}  imported")
+    for mode in args.modes:
+        runs = [run_once(mode) for _ in range(args.runs)]
+        medians = {
+            key: statistics.median(run[key] for run in runs) if runs[0][key] is not None else None
+            for key in PHASES + ("rss_mb",)
+        }
+        imported = [name for name in ("pandas", "sklearn") if any(run[name] for run in runs)]
+        print(f"{mode:>10}" + "".join(f"{medians[phase]:>11.3f}" if medians[phase] is not None else f"{'-':>11}"
+                                      for phase in PHASES)
+              + f"{medians['rss_mb']:>9.1f}  {', '.join(imported) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Per-call cost of turning prediction requests into model input, and of a
+# whole prediction, on the trained models in ai_model/:
+#   dataframe   pipeline.predict(pd.DataFrame(rows)) - ColumnTransformer path
+#   columns     dict of lists into CompactForest.transform (the previous serving path)
+#   vectorizer  FeatureVectorizer.transform(rows) - what main.py serves with now
+# Before timing, every path is checked to give identical input matrices and
+# predictions on random requests (including an unknown orbit type); the
+# script exits non-zero on any difference.
+#
+#   python benchmarks/feature_vectorizer.py --batch-sizes 1 100 --repeat 2000
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_model.compact_forest import COMPACT_SUFFIX, CompactForest  # noqa: E402
+from ai_model.feature_vectorizer import VectorizedPipeline  # noqa: E402
+from ai_model.model_registry import MODEL_DIR  # noqa: E402
+
+ORBIT_TYPES = ["LEO", "MEO", "GEO", "HEO"]  # HEO is not in the training data
+
+
+def satellite_request(rng):
+    return {
+        "orbit_type": rng.choice(ORBIT_TYPES),
+        "launch_year": rng.randint(2000, 2024),
+        "age_at_prediction_months": rng.randint(1, 240),
+        "maintenance_cost_usd_per_year": rng.uniform(1000, 100000),
+        "component_health_score": rng.random(),
+    }
+
+
+# model name -> (method, request generator); fields as in main.py's request models
+MODELS = {
+    "mission_success_model": ("predict_proba", lambda rng: {
+        "payload_mass_kg": rng.uniform(100, 20000),
+        "mission_duration_days": rng.uniform(30, 3000),
+        "launch_vehicle_reliability": rng.uniform(0.8, 1.0),
+        "num_stages": rng.randint(1, 4),
+    }),
+    "satellite_collision_risk_model": ("predict", satellite_request),
+    "satellite_lifespan_model": ("predict", satellite_request),
+}
+
+
+def columns_of(rows):
+    return {name: [row[name] for row in rows] for name in rows[0]}
+
+
+def check_identical(name, method, pipeline, vectorized, compact, rows):
+    expected_X = pipeline[:-1].transform(pd.DataFrame(rows)).astype(np.float32)
+    expected = getattr(pipeline, method)(pd.DataFrame(rows))
+    failures = []
+    for label, X in (("vectorizer", vectorized.vectorizer.transform(rows).copy()),
+                     ("columns", compact.transform(columns_of(rows)))):
+        if not np.array_equal(X, expected_X):
+            failures.append(f"{name}: {label} input matrix differs from the ColumnTransformer output")
+    for label, output in (
+        ("sklearn + vectorizer", getattr(vectorized, method)(vectorized.vectorizer.transform(rows))),
+        ("compact + vectorizer", getattr(compact, method)(compact.vectorizer.transform(rows))),
+    ):
+        if not np.array_equal(output, expected):
+            failures.append(f"{name}: {label} predictions differ from the DataFrame pipeline")
+    return failures
+
+
+def per_call_us(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request-to-model-input vectorization.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per measurement")
+    parser.add_argument("--check-rows", type=int, default=2000, help="Random requests for the identity check")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = []
+    print(f"{'model':>31} {'rows':>5} {'path':>11} {'transform us':>13} {'predict us':>11}")
+    for name, (method, make_row) in MODELS.items():
+        pipeline = joblib.load(os.path.join(MODEL_DIR, name + ".joblib"))
+        vectorized = VectorizedPipeline(pipeline)
+        compact = CompactForest.load(os.path.join(MODEL_DIR, name + COMPACT_SUFFIX))
+
+        check_rows = [make_row(rng) for _ in range(args.check_rows)]
+        failures += check_identical(name, method, pipeline, vectorized, compact, check_rows)
+        for row in check_rows[:200]:
+            failures += check_identical(name, method, pipeline, vectorized, compact, [row])
+
+        for size in args.batch_sizes:
+            rows = [make_row(rng) for _ in range(size)]
+            repeat = max(1, args.repeat // size)
+            paths = {
+                "dataframe": (lambda: pipeline[:-1].transform(pd.DataFrame(rows)),
+                              lambda: getattr(pipeline, method)(pd.DataFrame(rows))),
+                "columns": (lambda: compact.transform(columns_of(rows)),
+                            lambda: getattr(compact, method)(columns_of(rows))),
+                "vectorizer": (lambda: compact.vectorizer.transform(rows),
+                               lambda: getattr(compact, method)(compact.vectorizer.transform(rows))),
+            }
+            for path, (transform, predict) in paths.items():
+                print(f"{name:>31} {size:>5} {path:>11} {per_call_us(transform, repeat):>13.1f} "
+                      f"{per_call_us(predict, repeat):>11.1f}")
+
+    if failures:
+        print("\n".join(["", "NOT IDENTICAL:"] + failures))
+        sys.exit(1)
+    print("\nAll paths produced identical model inputs and predictions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Per-row cost of a large list response: the model-per-row path (build
+# pydantic models / dicts, FastAPI re-validates against response_model and
+# encodes with the stdlib json module) against the bulk path in
+# serialization.py (zip rows with column names, encode once).
+#
+#   python benchmarks/list_serialization.py --rows 100000
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes.satellite_tracking import TRACKING_COLUMNS, Tracking, _row_to_tracking  # noqa: E402
+from routes.space_debris import SpaceDebrisOut  # noqa: E402
+from serialization import JSONBytesResponse, rows_to_json  # noqa: E402
+
+DEBRIS_COLUMNS = ["debris_id", "description", "latitude", "longitude", "size_meters", "risk_level"]
+
+
+def tracking_rows(n):
+    start = datetime(2024, 1, 1)
+    return [
+        (i, i % 500, i % 12, start + timedelta(seconds=10 * i),
+         (i * 0.37) % 180 - 90, (i * 0.91) % 360 - 180, 400.0 + i % 300)
+        for i in range(n)
+    ]
+
+
+def debris_rows(n):
+    return [
+        (i, f"Fragment {i}", (i * 0.37) % 180 - 90, (i * 0.91) % 360 - 180, 0.1 + i % 50, "LOW")
+        for i in range(n)
+    ]
+
+
+def build_app(tracking, debris):
+    app = FastAPI()
+    tracking_columns = [c.strip() for c in TRACKING_COLUMNS.split(",")]
+
+    @app.get("/before/tracking", response_model=List[Tracking])
+    def tracking_before():
+        return [_row_to_tracking(row) for row in tracking]
+
+    @app.get("/after/tracking", response_model=List[Tracking])
+    def tracking_after():
+        return JSONBytesResponse(rows_to_json(tracking_columns, tracking))
+
+    @app.get("/before/debris", response_model=List[SpaceDebrisOut])
+    def debris_before():
+        return [
+            {
+                "debris_id": row[0],
+                "description": row[1],
+                "latitude": row[2],
+                "longitude": row[3],
+                "size_meters": row[4],
+                "risk_level": row[5],
+            }
+            for row in debris
+        ]
+
+    @app.get("/after/debris", response_model=List[SpaceDebrisOut])
+    def debris_after():
+        return JSONBytesResponse(rows_to_json(DEBRIS_COLUMNS, debris))
+
+    return app
+
+
+def timed(client, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path)
+        best = min(best, time.perf_counter() - start)
+        assert response.status_code == 200
+    return best, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row serialization cost of large list endpoints.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(tracking_rows(args.rows), debris_rows(args.rows)))
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name in ("tracking", "debris"):
+        before, slow = timed(client, f"/before/{name}", args.repeat)
+        after, fast = timed(client, f"/after/{name}", args.repeat)
+        assert len(slow.json()) == len(fast.json()) == args.rows
+        print(f"{name:>9}: before {before * 1e6 / args.rows:6.2f} us/row ({before:.2f}s, {len(slow.content) / 1e6:.1f} MB)"
+              f"   after {after * 1e6 / args.rows:6.2f} us/row ({after:.2f}s, {len(fast.content) / 1e6:.1f} MB)"
+              f"   x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
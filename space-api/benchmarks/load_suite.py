@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+
+# Load benchmark for the API in main.py. Boots the app in-process against the
+# SQLite stand-in database (benchmarks/standin_db.py) seeded with synthetic
+# rows, drives each request mix with --concurrency clients over the ASGI
+# transport and reports throughput, p50/p99 latency and process memory per
+# scenario. Results are written to benchmarks/results/ as JSON named after the
+# current commit, so two commits can be compared with --compare.
+#
+#   python benchmarks/load_suite.py --scale 1 --concurrency 32 --requests 2000
+#   python benchmarks/load_suite.py --scenarios list by_id --compare benchmarks/results/load_<commit>.json
+#
+# The /ai/predict/* scenarios need the trained models in ai_model/
+# (python ai_model/generate_and_train_models.py).
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, API_DIR)
+
+import standin_db  # noqa: E402
+
+ORBIT_TYPES = ["LEO", "MEO", "GEO", "HEO"]
+
+
+# -------------------- Request mixes --------------------
+# Each scenario is a list of (weight, request builder); a builder takes the
+# random generator and the seeded row counts and returns (method, url, json body).
+
+def _id(rng, counts, table):
+    return rng.randint(1, counts[table])
+
+
+def _tracking_fix(rng, counts):
+    return {
+        "satellite_id": _id(rng, counts, "Satellites"),
+        "station_id": _id(rng, counts, "Ground_Stations"),
+        "timestamp": (datetime(2024, 2, 1) + timedelta(seconds=rng.randint(0, 86400))).isoformat(),
+        "latitude": rng.uniform(-90, 90),
+        "longitude": rng.uniform(-180, 180),
+        "altitude_km": rng.uniform(300, 36000),
+    }
+
+
+def _satellite_features(rng, counts):
+    return {
+        "satellite_id": _id(rng, counts, "Satellites"),
+        "orbit_type": rng.choice(ORBIT_TYPES),
+        "launch_year": rng.randint(2000, 2024),
+        "age_at_prediction_months": rng.randint(1, 240),
+        "maintenance_cost_usd_per_year": rng.uniform(1000, 100000),
+        "component_health_score": rng.random(),
+    }
+
+
+SCENARIOS = {
+    "list": [
+        (3, lambda rng, c: ("GET", "/missions/", None)),
+        (3, lambda rng, c: ("GET", "/satellites/", None)),
+        (1, lambda rng, c: ("GET", "/space-debris/", None)),
+        (3, lambda rng, c: ("GET", "/satellite_tracking/?limit=100", None)),
+        (2, lambda rng, c: ("GET", "/logs/?limit=100&level=ERROR", None)),
+    ],
+    "by_id": [
+        (2, lambda rng, c: ("GET", f"/missions/{_id(rng, c, 'Missions')}", None)),
+        (2, lambda rng, c: ("GET", f"/satellites/{_id(rng, c, 'Satellites')}", None)),
+        (3, lambda rng, c: ("GET", f"/satellite_tracking/{_id(rng, c, 'Satellite_Tracking')}", None)),
+        (2, lambda rng, c: ("GET", f"/space-debris/{_id(rng, c, 'Space_Debris')}", None)),
+        (1, lambda rng, c: ("GET", f"/predictions/predictions/{_id(rng, c, 'Predictions')}", None)),
+    ],
+    "ingest": [
+        (8, lambda rng, c: ("POST", "/satellite_tracking/", _tracking_fix(rng, c))),
+        (2, lambda rng, c: ("POST", "/satellite_tracking/batch", [_tracking_fix(rng, c) for _ in range(100)])),
+    ],
+    "predict": [
+        (4, lambda rng, c: ("POST", "/ai/predict/mission_success", {
+            "payload_mass_kg": rng.uniform(100, 20000),
+            "mission_duration_days": rng.uniform(30, 3000),
+            "launch_vehicle_reliability": rng.uniform(0.8, 1.0),
+            "num_stages": rng.randint(1, 4),
+        })),
+        (4, lambda rng, c: ("POST", "/ai/predict/satellite_collision", _satellite_features(rng, c))),
+        (2, lambda rng, c: ("POST", "/ai/predict/satellite_collision/batch",
+                            [_satellite_features(rng, c) for _ in range(50)])),
+    ],
+}
+SCENARIOS["mixed"] = (
+    [(w * 4, b) for w, b in SCENARIOS["list"]]
+    + [(w * 3, b) for w, b in SCENARIOS["by_id"]]
+    + [(w * 2, b) for w, b in SCENARIOS["ingest"]]
+    + [(w * 1, b) for w, b in SCENARIOS["predict"]]
+)
+
+
+# -------------------- Driver --------------------
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_scenario(app, name, counts, requests, concurrency, warmup, seed):
+    mix = SCENARIOS[name]
+    weights = [w for w, _ in mix]
+    builders = [b for _, b in mix]
+    rng = random.Random(seed)
+    plan = [builders[i](rng, counts) for i in rng.choices(range(len(mix)), weights, k=warmup + requests)]
+    latencies = np.zeros(requests)
+    statuses = {}
+    position = iter(range(len(plan)))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            for i in position:
+                method, url, body = plan[i]
+                start = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                if i >= warmup:
+                    latencies[i - warmup] = time.perf_counter() - start
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        # Warm-up: first connections, caches, model pages; not measured
+        for i in range(warmup):
+            method, url, body = plan[next(position)]
+            await client.request(method, url, json=body)
+
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    errors = sum(count for status, count in statuses.items() if status >= 500)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+        "rss_mb": round(rss_mb(), 1),
+        "rss_delta_mb": round(rss_mb() - rss_before, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def git_commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=API_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return sha, dirty
+
+
+def compare(results, baseline_path, threshold):
+    """Print per-scenario changes against a stored run; returns the regressed scenario names."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline['commit']}{' (dirty)' if baseline.get('dirty') else ''} ({baseline_path}):")
+    regressed = []
+    for name, now in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        rps = (now["rps"] - before["rps"]) / before["rps"] * 100
+        p99 = (now["p99_ms"] - before["p99_ms"]) / before["p99_ms"] * 100
+        flag = rps < -threshold or p99 > threshold
+        if flag:
+            regressed.append(name)
+        print(f"{name:>8}: req/s {rps:+7.1f}%  p99 {p99:+7.1f}%  rss {now['rss_mb'] - before['rss_mb']:+7.1f} MB"
+              f"{'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for the API against a local stand-in database.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--scale", type=float, default=1.0, help="Synthetic data size multiplier")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", help="Stand-in database file (default: a temporary file)")
+    parser.add_argument("--output", help=f"Results file (default: {RESULTS_DIR}/load_<commit>.json)")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change in req/s or p99 reported as a regression")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="space-api-bench-"), "standin.db")
+    start = time.perf_counter()
+    counts = standin_db.create_database(db_path, args.scale, args.seed)
+    print(f"seeded {sum(counts.values())} rows in {time.perf_counter() - start:.1f}s ({db_path})")
+    standin_db.install(db_path)
+
+    import main as api
+
+    commit, dirty = git_commit()
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": {k: getattr(args, k) for k in ("scale", "concurrency", "requests", "warmup", "seed")},
+        "rows": counts,
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'rss MB':>8} {'peak MB':>8}")
+    for name in args.scenarios:
+        result = await run_scenario(api.app, name, counts, args.requests, args.concurrency, args.warmup, args.seed)
+        results["scenarios"][name] = result
+        print(f"{name:>8} {result['rps']:>9.0f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+              f"{result['errors']:>7} {result['rss_mb']:>8.1f} {result['peak_rss_mb']:>8.1f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
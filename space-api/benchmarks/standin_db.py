@@ -0,0 +1,113 @@
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from storage import sqlite
+
+# Local stand-in database for the benchmarks: the embedded SQLite storage
+# backend (storage/sqlite.py) on a scratch file, seeded with synthetic rows.
+# install() selects the sqlite backend and puts its pools in place of
+# database._pool/_async_pool, so the routes run unmodified whatever .env says
+# and without the Oracle client installed. Absolute numbers are not
+# Oracle numbers: SQLite answers in-process with no network round trip. The
+# load suite is for comparing the API's own overhead between commits.
+
+# Rows per table at --scale 1
+BASE_ROWS = {
+    "Missions": 50,
+    "Satellites": 500,
+    "Ground_Stations": 20,
+    "Satellite_Tracking": 100000,
+    "Space_Debris": 5000,
+    "Predictions": 10000,
+    "System_Logs": 20000,
+}
+
+
+def install(path, max_sessions=None):
+    """Point database.get_db()/get_db_async() at the stand-in database at `path`."""
+    # Before the first import of database, which resolves the backend's DatabaseError
+    os.environ["STORAGE_BACKEND"] = "sqlite"
+    import database
+
+    database._pool = sqlite.SessionPool(path, max=max_sessions or database.DB_POOL_MAX)
+    database._async_pool = sqlite.AsyncSessionPool(path, max=max_sessions or database.DB_ASYNC_POOL_MAX)
+    return database._pool, database._async_pool
+
+
+# -------------------- Synthetic data --------------------
+
+ORBIT_TYPES = np.array(["LEO", "MEO", "GEO", "HEO"])
+RISK_LEVELS = np.array(["Low", "Medium", "High"])
+LOG_LEVELS = np.array(["INFO", "INFO", "INFO", "WARNING", "ERROR", "DEBUG"])
+
+
+def _times(rng, start, count, span_seconds):
+    offsets = np.sort(rng.integers(0, span_seconds, count))
+    return [start + timedelta(seconds=int(s)) for s in offsets]
+
+
+def create_database(path, scale=1.0, seed=7):
+    """Create a fresh stand-in database at `path` with synthetic rows; returns the row counts."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    rng = np.random.default_rng(seed)
+    counts = {table: max(1, int(rows * scale)) for table, rows in BASE_ROWS.items()}
+    start = datetime(2024, 1, 1)
+    raw = sqlite.connect(path)
+    raw.executescript(sqlite.SCHEMA)
+
+    n = counts["Missions"]
+    raw.executemany(
+        "INSERT INTO Missions (mission_name, launch_date, mission_type, status) VALUES (?, ?, ?, ?)",
+        zip([f"Mission {i}" for i in range(n)], _times(rng, datetime(2015, 1, 1), n, 10 * 365 * 86400),
+            rng.choice(["Research", "Defense", "Communication", "Navigation"], n).tolist(),
+            rng.choice(["Active", "Completed", "Planned"], n).tolist()))
+
+    n = counts["Satellites"]
+    raw.executemany(
+        "INSERT INTO Satellites (satellite_name, launch_date, orbit_type, mission_id) VALUES (?, ?, ?, ?)",
+        zip([f"SAT-{i}" for i in range(n)], _times(rng, datetime(2015, 1, 1), n, 10 * 365 * 86400),
+            rng.choice(ORBIT_TYPES, n).tolist(), (rng.integers(0, counts["Missions"], n) + 1).tolist()))
+
+    n = counts["Ground_Stations"]
+    lat, lon = rng.uniform(-60, 70, n), rng.uniform(-180, 180, n)
+    raw.executemany(
+        "INSERT INTO Ground_Stations (station_name, location, contact_frequency) VALUES (?, ?, ?)",
+        zip([f"Station {i}" for i in range(n)], [f"{a:.4f},{o:.4f}" for a, o in zip(lat, lon)],
+            rng.uniform(2000, 9000, n).round(1).tolist()))
+
+    n = counts["Satellite_Tracking"]
+    raw.executemany(
+        "INSERT INTO Satellite_Tracking (satellite_id, station_id, timestamp, latitude, longitude, altitude_km) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        zip((rng.integers(0, counts["Satellites"], n) + 1).tolist(),
+            (rng.integers(0, counts["Ground_Stations"], n) + 1).tolist(),
+            _times(rng, start, n, 30 * 86400), rng.uniform(-90, 90, n).tolist(),
+            rng.uniform(-180, 180, n).tolist(), rng.uniform(300, 36000, n).tolist()))
+
+    n = counts["Space_Debris"]
+    raw.executemany(
+        "INSERT INTO Space_Debris (description, latitude, longitude, size_meters, risk_level) VALUES (?, ?, ?, ?, ?)",
+        zip([f"Fragment {i}" for i in range(n)], rng.uniform(-90, 90, n).tolist(),
+            rng.uniform(-180, 180, n).tolist(), rng.lognormal(-1, 1, n).round(3).tolist(),
+            rng.choice(RISK_LEVELS, n).tolist()))
+
+    n = counts["Predictions"]
+    risks = rng.choice(RISK_LEVELS, n).tolist()
+    raw.executemany(
+        "INSERT INTO Predictions (satellite_id, prediction_date, status_prediction, lifespan_months, collision_risk) "
+        "VALUES (?, ?, ?, ?, ?)",
+        zip((rng.integers(0, counts["Satellites"], n) + 1).tolist(), _times(rng, start, n, 30 * 86400),
+            risks, rng.integers(6, 240, n).tolist(), risks))
+
+    n = counts["System_Logs"]
+    raw.executemany(
+        "INSERT INTO System_Logs (log_message, log_level, log_time) VALUES (?, ?, ?)",
+        zip([f"event {i}" for i in range(n)], rng.choice(LOG_LEVELS, n).tolist(), _times(rng, start, n, 30 * 86400)))
+
+    raw.commit()
+    raw.close()
+    return counts
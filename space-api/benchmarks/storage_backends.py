@@ -0,0 +1,204 @@
+import argparse
+import importlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Throughput of the storage backends (storage/oracle.py, storage/sqlite.py) on
+# the query shapes the routers issue: batched tracking ingest, point reads by
+# primary key, keyset pages over Satellite_Tracking and point reads from
+# several threads sharing the session pool. Each backend is driven through its
+# own pool, the same way database.get_db() uses it.
+#
+#   python benchmarks/storage_backends.py --rows 50000 --threads 8
+#   python benchmarks/storage_backends.py --backends sqlite --scale 0.5
+#
+# The SQLite backend runs on a scratch file seeded by benchmarks/standin_db.py.
+# The Oracle backend runs on the schema configured in .env and needs data in
+# Satellite_Tracking; ingested rows are rolled back. Oracle is reported as
+# skipped when it cannot be reached.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import standin_db  # noqa: E402
+
+# Imported on use: the oracle backend needs python-oracledb, which edge installs may not have
+BACKENDS = ("oracle", "sqlite")
+
+INGEST_SQL = """
+    INSERT INTO Satellite_Tracking (satellite_id, station_id, timestamp, latitude, longitude, altitude_km)
+    VALUES (:1, :2, :3, :4, :5, :6)
+"""
+POINT_SQL = """
+    SELECT track_id, satellite_id, station_id, timestamp, latitude, longitude, altitude_km
+    FROM Satellite_Tracking WHERE track_id = :1
+"""
+FIRST_PAGE_SQL = """
+    SELECT track_id, satellite_id, timestamp, latitude, longitude, altitude_km
+    FROM Satellite_Tracking
+    ORDER BY timestamp, track_id
+    FETCH FIRST :page_size ROWS ONLY
+"""
+NEXT_PAGE_SQL = """
+    SELECT track_id, satellite_id, timestamp, latitude, longitude, altitude_km
+    FROM Satellite_Tracking
+    WHERE timestamp > :cursor_time OR (timestamp = :cursor_time AND track_id > :cursor_id)
+    ORDER BY timestamp, track_id
+    FETCH FIRST :page_size ROWS ONLY
+"""
+
+
+def _bounds(pool):
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT MIN(track_id), MAX(track_id) FROM Satellite_Tracking")
+        low, high = cursor.fetchone()
+        cursor.execute("SELECT MIN(satellite_id) FROM Satellites")
+        satellite_id = cursor.fetchone()[0]
+        cursor.execute("SELECT MIN(station_id) FROM Ground_Stations")
+        station_id = cursor.fetchone()[0]
+    finally:
+        pool.release(connection)
+    if low is None or satellite_id is None or station_id is None:
+        raise RuntimeError("Satellite_Tracking, Satellites and Ground_Stations need data")
+    return low, high, satellite_id, station_id
+
+
+def bench_ingest(pool, rows, batch_size, satellite_id, station_id):
+    fixes = [
+        (satellite_id, station_id, datetime(2035, 1, 1) + timedelta(seconds=i), 0.0, 0.0, 500.0)
+        for i in range(rows)
+    ]
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor()
+        start = time.perf_counter()
+        for i in range(0, rows, batch_size):
+            cursor.executemany(INGEST_SQL, fixes[i:i + batch_size])
+        elapsed = time.perf_counter() - start
+        connection.rollback()
+    finally:
+        pool.release(connection)
+    return rows / elapsed
+
+
+def _point_reads(pool, ids):
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor()
+        for track_id in ids:
+            cursor.execute(POINT_SQL, [track_id])
+            cursor.fetchone()
+    finally:
+        pool.release(connection)
+
+
+def bench_point_reads(pool, reads, low, high, seed):
+    rng = random.Random(seed)
+    ids = [rng.randint(low, high) for _ in range(reads)]
+    start = time.perf_counter()
+    _point_reads(pool, ids)
+    return reads / (time.perf_counter() - start)
+
+
+def bench_keyset_pages(pool, pages, page_size):
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor()
+        cursor.arraysize = page_size
+        fetched = 0
+        start = time.perf_counter()
+        cursor.execute(FIRST_PAGE_SQL, {"page_size": page_size})
+        rows = cursor.fetchall()
+        for _ in range(pages - 1):
+            if len(rows) < page_size:
+                break
+            fetched += len(rows)
+            last = rows[-1]
+            cursor.execute(NEXT_PAGE_SQL, {"cursor_time": last[2], "cursor_id": last[0], "page_size": page_size})
+            rows = cursor.fetchall()
+        fetched += len(rows)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.release(connection)
+    return fetched / elapsed
+
+
+def bench_concurrent_reads(pool, threads, reads, low, high, seed):
+    rng = random.Random(seed)
+    per_thread = reads // threads
+    workers = [
+        threading.Thread(target=_point_reads, args=(pool, [rng.randint(low, high) for _ in range(per_thread)]))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def run_backend(name, args):
+    backend = importlib.import_module(f"storage.{name}")
+    if name == "sqlite":
+        path = args.sqlite_path or os.path.join(tempfile.mkdtemp(prefix="space-api-bench-"), "storage.db")
+        standin_db.create_database(path, args.scale, args.seed)
+        pool = backend.create_pool(min=1, max=args.threads, path=path)
+    else:
+        pool = backend.create_pool(min=1, max=args.threads, increment=1, wait_timeout_ms=5000, ping_interval=60)
+    try:
+        low, high, satellite_id, station_id = _bounds(pool)
+        return {
+            "ingest rows/s": bench_ingest(pool, args.rows, args.batch_size, satellite_id, station_id),
+            "point reads/s": bench_point_reads(pool, args.reads, low, high, args.seed),
+            "keyset rows/s": bench_keyset_pages(pool, args.pages, args.page_size),
+            f"reads/s x{args.threads} threads": bench_concurrent_reads(pool, args.threads, args.reads, low, high,
+                                                                       args.seed),
+        }
+    finally:
+        pool.close(force=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare storage backend throughput on the routers' query shapes.")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=["oracle", "sqlite"])
+    parser.add_argument("--rows", type=int, default=20000, help="Tracking fixes to ingest")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=5000, help="Point reads (single thread and shared)")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=1.0, help="Synthetic data size for the SQLite file")
+    parser.add_argument("--sqlite-path", help="SQLite database file (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.backends:
+        try:
+            results[name] = run_backend(name, args)
+        except ImportError as e:
+            print(f"{name}: skipped ({e})")
+        except importlib.import_module(f"storage.{name}").DatabaseError as e:
+            print(f"{name}: skipped ({str(e).splitlines()[0]})")
+
+    if not results:
+        return
+    both = len(results) == 2
+    print(f"{'':>22}" + "".join(f"{name:>12}" for name in results) + (f"{'sqlite/oracle':>15}" if both else ""))
+    for metric in next(iter(results.values())):
+        line = f"{metric:>22}" + "".join(f"{results[name][metric]:>12,.0f}" for name in results)
+        if both:
+            line += f"{results['sqlite'][metric] / results['oracle'][metric]:>14.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,185 @@
-import cx_Oracle
+import importlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from metrics import instrument, record_acquire
 
 # Load environment variables from .env
 load_dotenv()
 
-DB_USER = os.getenv("ORACLE_USERNAME")
-DB_PASSWORD = os.getenv("ORACLE_PASSWORD")
-DB_DSN = os.getenv("ORACLE_DSN")
+# Storage backend module under storage/: oracle, or sqlite for edge deployments
+# and local performance work (see storage/sqlite.py)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "oracle")
+STORAGE_BACKENDS = ("oracle", "sqlite")
+
+# Session pool sizing (override through .env)
+DB_POOL_MIN = int(os.getenv("ORACLE_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("ORACLE_POOL_MAX", "10"))
+# The asyncio pool is not tied to worker threads, so it can be sized for more concurrent requests
+DB_ASYNC_POOL_MAX = int(os.getenv("ORACLE_ASYNC_POOL_MAX", str(DB_POOL_MAX)))
+DB_POOL_INCREMENT = int(os.getenv("ORACLE_POOL_INCREMENT", "1"))
+DB_POOL_WAIT_TIMEOUT_MS = int(os.getenv("ORACLE_POOL_WAIT_TIMEOUT_MS", "5000"))
+# Idle sessions older than this many seconds are pinged before being handed out
+DB_POOL_PING_INTERVAL = int(os.getenv("ORACLE_POOL_PING_INTERVAL", "60"))
+
+_pool = None
+_async_pool = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+def _new_stats():
+    return {
+        "acquired": 0,
+        "acquire_errors": 0,
+        "wait_time_total_ms": 0.0,
+        "wait_time_max_ms": 0.0,
+    }
+
+
+_stats = _new_stats()
+_async_stats = _new_stats()
+
+
+def get_backend():
+    """The configured storage backend module."""
+    if STORAGE_BACKEND not in STORAGE_BACKENDS:
+        raise ValueError(f"STORAGE_BACKEND must be one of {STORAGE_BACKENDS}, got {STORAGE_BACKEND!r}")
+    return importlib.import_module(f"storage.{STORAGE_BACKEND}")
+
+
+# What handlers catch for database failures: the configured backend's error
+# class(es), which cover both the sync and the asyncio drivers
+DatabaseError = get_backend().DatabaseError
+
+
+def get_pool():
+    """Return the process-wide session pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = get_backend().create_pool(
+                    min=DB_POOL_MIN,
+                    max=DB_POOL_MAX,
+                    increment=DB_POOL_INCREMENT,
+                    wait_timeout_ms=DB_POOL_WAIT_TIMEOUT_MS,
+                    ping_interval=DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+
+def close_pool():
+    """Close the session pool (called on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close(force=True)
+            _pool = None
+
+
+def _pool_stats(pool, stats, max_sessions):
+    with _stats_lock:
+        stats = dict(stats)
+    acquired = stats["acquired"]
+    stats["wait_time_avg_ms"] = stats["wait_time_total_ms"] / acquired if acquired else 0.0
+    if pool is None:
+        stats.update({"opened": 0, "busy": 0, "idle": 0, "min": DB_POOL_MIN, "max": max_sessions})
+    else:
+        opened = pool.opened
+        busy = pool.busy
+        stats.update({"opened": opened, "busy": busy, "idle": opened - busy, "min": pool.min, "max": pool.max})
+    return stats
+
+
+def get_pool_stats():
+    """Live pool statistics: busy/idle sessions and acquire wait times."""
+    return {
+        **_pool_stats(_pool, _stats, DB_POOL_MAX),
+        "async_pool": _pool_stats(_async_pool, _async_stats, DB_ASYNC_POOL_MAX),
+    }
+
+
+def _record_acquire(wait_ms, failed=False, stats=_stats):
+    with _stats_lock:
+        if failed:
+            stats["acquire_errors"] += 1
+            return
+        stats["acquired"] += 1
+        stats["wait_time_total_ms"] += wait_ms
+        if wait_ms > stats["wait_time_max_ms"]:
+            stats["wait_time_max_ms"] = wait_ms
+
 
 @contextmanager
 def get_db():
     connection = None
+    pool = None
     try:
-        connection = cx_Oracle.connect(
-            user=DB_USER,
-            password=DB_PASSWORD,
-            dsn=DB_DSN
-        )
-        yield connection
-    except cx_Oracle.DatabaseError as e:
+        pool = get_pool()
+        start = time.perf_counter()
+        try:
+            connection = pool.acquire()
+        except DatabaseError:
+            _record_acquire(0.0, failed=True)
+            raise
+        wait = time.perf_counter() - start
+        _record_acquire(wait * 1000)
+        record_acquire(wait)
+        yield instrument(connection)
+    except DatabaseError as e:
         print("❌ Database connection error:", e)
         raise
     finally:
         if connection:
-            connection.close()
+            # Uncommitted work is rolled back when the session returns to the pool
+            pool.release(connection)
+
+
+# -------------------- Async pool --------------------
+# Handlers awaiting these connections hold no worker thread while the
+# database works (python-oracledb thin mode with asyncio for Oracle).
+
+def get_async_pool():
+    """Return the process-wide asyncio pool, creating it on first use."""
+    global _async_pool
+    if _async_pool is None:
+        with _pool_lock:
+            if _async_pool is None:
+                _async_pool = get_backend().create_pool_async(
+                    min=DB_POOL_MIN,
+                    max=DB_ASYNC_POOL_MAX,
+                    increment=DB_POOL_INCREMENT,
+                    wait_timeout_ms=DB_POOL_WAIT_TIMEOUT_MS,
+                    ping_interval=DB_POOL_PING_INTERVAL,
+                )
+    return _async_pool
+
+
+async def close_async_pool():
+    global _async_pool
+    pool, _async_pool = _async_pool, None
+    if pool is not None:
+        await pool.close(force=True)
+
+
+@asynccontextmanager
+async def get_db_async():
+    pool = get_async_pool()
+    start = time.perf_counter()
+    try:
+        connection = await pool.acquire()
+    except DatabaseError as e:
+        _record_acquire(0.0, failed=True, stats=_async_stats)
+        print("❌ Database connection error:", e)
+        raise
+    wait = time.perf_counter() - start
+    _record_acquire(wait * 1000, stats=_async_stats)
+    record_acquire(wait)
+    try:
+        yield instrument(connection, is_async=True)
+    finally:
+        # Uncommitted work is rolled back when the session returns to the pool
+        await pool.release(connection)
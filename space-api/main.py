@@ -1,20 +1,32 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException, Response
 from routes import missions, satellites
 from routes import ground_stations
 from routes import satellite_tracking
 from routes import space_debris
 from routes import predictions
 from routes import system_logs
+from routes import conjunctions
+from routes import exports
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from typing import List
 # from ai_model.dummy_model import DummyMissionPredictor, DummyCollisionPredictor # Removed dummy imports
 from fastapi import APIRouter
-import joblib # Import joblib for loading models
-import pandas as pd # Import pandas for data processing
+from ai_model.model_registry import ModelRegistry, ModelUnavailable
+from ai_model.prediction_cache import make_key, prediction_cache
 import os
-from database import get_db # Import get_db
-from datetime import datetime # Import datetime for timestamp
-import httpx # Import httpx for making async HTTP requests
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from database import close_async_pool, close_pool, get_pool_stats
+from services.log_sink import log_sink
+from metrics import PROMETHEUS_MEDIA_TYPE, MetricsMiddleware, record_inference, render_metrics
+from models.predictions import (
+    WRITE_BEHIND_ENABLED, prediction_row, prediction_writer, save_prediction_async, save_predictions_async
+)
 
 app = FastAPI(
     title="Space Missions & Satellites API",
@@ -29,21 +41,63 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # Keyset pagination cursor, cache validators
 )
 
-# Define the directory where models are saved
-MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_model")
+# Per-route latency, DB time and row counts, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Trained models are loaded off the startup path (see ai_model/model_registry.py);
+# a reload drops cached predictions made by the previous versions
+model_registry = ModelRegistry(on_reload=prediction_cache.clear)
+
+def model_versions():
+    return model_registry.versions()
+
+def predict_cached(model_name, method, rows):
+    """
+    Run <model>.<method> over a list of feature dicts, serving repeated rows from
+    the prediction cache. Misses are scored together in one vectorized call.
+    """
+    model, version = model_registry.get(model_name)
+    keys = [make_key(model_name, version, method, row) for row in rows]
+    results = [None] * len(rows)
+    missing = []
+    for i, key in enumerate(keys):
+        found, value = prediction_cache.get(key)
+        if found:
+            results[i] = value
+        else:
+            missing.append(i)
+
+    if missing:
+        # Feature dicts go straight into the model's input matrix (no DataFrame)
+        outputs = getattr(model, method)(model.vectorizer.transform([rows[i] for i in missing]))
+        for i, output in zip(missing, outputs):
+            results[i] = output
+            prediction_cache.put(keys[i], output)
+    return results
+
+# Model inference is CPU-bound: run it on a dedicated executor so it neither
+# blocks the event loop nor takes slots from FastAPI's threadpool
+MODEL_EXECUTOR_WORKERS = int(os.getenv("MODEL_EXECUTOR_WORKERS", "4"))
+model_executor = ThreadPoolExecutor(max_workers=MODEL_EXECUTOR_WORKERS, thread_name_prefix="model")
 
-# Load the trained models
-try:
-    mission_success_model = joblib.load(os.path.join(MODEL_DIR, 'mission_success_model.joblib'))
-    satellite_collision_risk_model = joblib.load(os.path.join(MODEL_DIR, 'satellite_collision_risk_model.joblib'))
-    satellite_lifespan_model = joblib.load(os.path.join(MODEL_DIR, 'satellite_lifespan_model.joblib'))
-    print("AI models loaded successfully!")
-except FileNotFoundError:
-    print(f"Error: Model files not found in {MODEL_DIR}. Please run generate_and_train_models.py first.")
-    # Exit or handle gracefully if models are not found
-    exit(1) # Exit the application if models are not found
+def _timed_predict(model_name, method, rows):
+    # Timed on the executor thread, so queueing for a free worker is not counted as inference
+    start = time.perf_counter()
+    result = predict_cached(model_name, method, rows)
+    return result, time.perf_counter() - start
+
+async def predict_async(model_name, method, rows):
+    loop = asyncio.get_running_loop()
+    try:
+        result, seconds = await loop.run_in_executor(model_executor, partial(_timed_predict, model_name, method, rows))
+    except ModelUnavailable as e:
+        # Model file missing or unreadable (a request during a background load waits for it instead)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    record_inference(model_name, seconds)
+    return result
 
 # Define Pydantic models for prediction requests
 class MissionPredictionRequest(BaseModel):
@@ -63,57 +117,101 @@ class SatellitePredictionRequest(BaseModel):
 # Create a new APIRouter for AI predictions
 ai_router = APIRouter()
 
+@ai_router.get("/cache/stats")
+def prediction_cache_stats():
+    return {**prediction_cache.stats(), "model_versions": model_versions()}
+
+@ai_router.post("/models/reload")
+def reload_models():
+    # Pick up retrained model files; cached predictions are invalidated
+    try:
+        model_registry.reload()
+    except ModelUnavailable as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Models reloaded", "model_versions": model_versions()}
+
 @ai_router.post("/predict/mission_success")
 async def predict_mission_success(request: MissionPredictionRequest):
-    # Convert request data to DataFrame for model prediction
-    input_df = pd.DataFrame([request.dict()])
-    
     # Predict success probability
-    success_chance = mission_success_model.predict_proba(input_df)[:, 1][0] # Probability of the 'success' class (1)
+    proba = (await predict_async('mission_success_model', 'predict_proba', [request.dict()]))[0]
+    success_chance = proba[1] # Probability of the 'success' class (1)
     return {"mission_success_chance": round(success_chance, 2)}
 
 @ai_router.post("/predict/satellite_collision")
 async def predict_satellite_collision(request: SatellitePredictionRequest):
     input_data = request.dict()
     satellite_id = input_data.pop("satellite_id")
-    
-    input_df = pd.DataFrame([input_data])
-    
-    collision_risk_pred = satellite_collision_risk_model.predict(input_df)[0]
-    lifespan_months_pred = int(satellite_lifespan_model.predict(input_df)[0])
-
-    # Prepare data for the predictions endpoint
-    prediction_data = {
-        "satellite_id": satellite_id,
-        "status_prediction": str(collision_risk_pred), # Convert to string
-        "lifespan_months": lifespan_months_pred,
-        "collision_risk": str(collision_risk_pred) # Convert to string
-    }
 
-    # Make an internal POST request to the /predictions/predictions/ endpoint
-    async with httpx.AsyncClient() as client:
+    collision_risk_pred = (await predict_async('satellite_collision_risk_model', 'predict', [input_data]))[0]
+    lifespan_months_pred = int((await predict_async('satellite_lifespan_model', 'predict', [input_data]))[0])
+
+    # Save through the predictions data layer (no HTTP loopback)
+    row = prediction_row(
+        satellite_id,
+        str(collision_risk_pred), # status_prediction
+        lifespan_months_pred,
+        str(collision_risk_pred)
+    )
+    saved_prediction_id = None
+    save_status = "saved"
+    if WRITE_BEHIND_ENABLED and prediction_writer.submit([row]):
+        save_status = "queued"
+    else:
         try:
-            # Use the correct base URL for the internal call
-            response = await client.post(
-                "http://localhost:8000/predictions/predictions/",
-                json=prediction_data
-            )
-            response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-            saved_prediction_info = response.json()
-            saved_prediction_id = saved_prediction_info.get("prediction_id")
-        except httpx.HTTPStatusError as e:
-            print(f"Error saving prediction via internal API call: {e.response.status_code} - {e.response.text}")
-            raise HTTPException(status_code=500, detail=f"Failed to save prediction: {e.response.text}")
-        except httpx.RequestError as e:
-            print(f"Network error during internal API call: {e}")
-            raise HTTPException(status_code=500, detail=f"Failed to connect to predictions service: {e}")
+            saved_prediction_id = await save_prediction_async(row)
+        except Exception as e:
+            print(f"Error saving prediction: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to save prediction: {e}")
 
     return {
         "collision_risk": collision_risk_pred,
         "lifespan_months": lifespan_months_pred,
-        "saved_prediction_id": saved_prediction_id
+        "saved_prediction_id": saved_prediction_id,
+        "save_status": save_status
     }
 
+# Batch variants: each batch is scored with a single vectorized model call
+# (only rows missing from the prediction cache are sent to the model)
+
+def _requests_to_rows(requests, exclude=()):
+    return [{k: v for k, v in r.dict().items() if k not in exclude} for r in requests]
+
+@ai_router.post("/predict/mission_success/batch")
+async def predict_mission_success_batch(requests: List[MissionPredictionRequest]):
+    if not requests:
+        return []
+    probas = await predict_async('mission_success_model', 'predict_proba', _requests_to_rows(requests))
+    return [{"mission_success_chance": round(float(proba[1]), 2)} for proba in probas]
+
+@ai_router.post("/predict/satellite_collision/batch")
+async def predict_satellite_collision_batch(requests: List[SatellitePredictionRequest], persist: bool = False):
+    # Scores a whole fleet at once; with persist=true the results are also saved to Predictions
+    if not requests:
+        return []
+    rows = _requests_to_rows(requests, exclude=("satellite_id",))
+    collision_risks = await predict_async('satellite_collision_risk_model', 'predict', rows)
+    lifespans = await predict_async('satellite_lifespan_model', 'predict', rows)
+    results = [
+        {
+            "satellite_id": request.satellite_id,
+            "collision_risk": str(risk),
+            "lifespan_months": int(lifespan)
+        }
+        for request, risk, lifespan in zip(requests, collision_risks, lifespans)
+    ]
+
+    if persist:
+        rows = [
+            prediction_row(r["satellite_id"], r["collision_risk"], r["lifespan_months"], r["collision_risk"])
+            for r in results
+        ]
+        if not (WRITE_BEHIND_ENABLED and prediction_writer.submit(rows)):
+            try:
+                await save_predictions_async(rows)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Failed to save predictions: {e}")
+    return results
+
 # Include routers from both modules
 app.include_router(missions.router)
 app.include_router(satellites.router)
@@ -122,10 +220,55 @@ app.include_router(satellite_tracking.router)
 app.include_router(space_debris.router)
 app.include_router(predictions.router)
 app.include_router(system_logs.router)
+app.include_router(conjunctions.router)
+app.include_router(exports.router)
 app.include_router(ai_router, prefix="/ai", tags=["AI Predictions"])
 
 @app.get("/")
 def root():
     return {"message": "Space Mission & Satellite Tracking API is running 🚀"}
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics():
+    # Prometheus text exposition format
+    return Response(render_metrics(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+@app.get("/ready", tags=["Health"])
+def readiness():
+    # 200 once every model is loaded; 503 while loading or when a model failed to load
+    status = model_registry.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@app.get("/health/db", tags=["Health"])
+def db_pool_health():
+    # Live session pool statistics (busy/idle sessions, acquire wait times)
+    return get_pool_stats()
+
+@app.on_event("startup")
+def start_model_loading():
+    model_registry.start()
+
+@app.on_event("startup")
+def start_prediction_writer():
+    if WRITE_BEHIND_ENABLED:
+        prediction_writer.start()
+    log_sink.start()
+
+@app.on_event("shutdown")
+async def shutdown_db_pool():
+    # Flush queued predictions and log records before the pools go away; the
+    # flushes join their writer threads, so they run off the event loop
+    await run_in_threadpool(prediction_writer.stop)
+    await run_in_threadpool(log_sink.stop)
+    close_pool()
+    await close_async_pool()
+    model_executor.shutdown(wait=False)
+
+@app.get("/health/prediction-writer", tags=["Health"])
+def prediction_writer_health():
+    return {"enabled": WRITE_BEHIND_ENABLED, **prediction_writer.get_stats()}
 
+@app.get("/health/log-sink", tags=["Health"])
+def log_sink_health():
+    # Buffered System_Logs writer: pending records, drops/rejections when the buffer fills
+    return log_sink.get_stats()
@@ -0,0 +1,375 @@
+import bisect
+import contextvars
+import threading
+import time
+
+# Request instrumentation exposed in the Prometheus text format on /metrics.
+#
+# MetricsMiddleware gives every HTTP request a RequestMetrics accumulator in a
+# context variable. get_db()/get_db_async() add their pool acquire time to it
+# and hand out connections whose cursors time execute/fetch calls and count
+# fetched rows; predict_async() adds model inference time. When the response
+# is done the totals are observed once into per-route histograms, so the hot
+# path only adds a few perf_counter() calls and additions. Code running
+# outside a request (background writers, CLIs) gets the plain connection.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for requests that matched no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"' if bound == "+Inf" else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status.",
+                        ("method", "route", "status"))
+http_request_duration = Histogram("http_request_duration_seconds", "Total request latency.",
+                                  ("method", "route"))
+db_acquire_duration = Histogram("db_connection_acquire_seconds",
+                                "Time per request spent waiting for pooled connections.", ("route",))
+db_execute_duration = Histogram("db_query_execute_seconds",
+                                "Time per request spent in cursor execute/executemany.", ("route",))
+db_fetch_duration = Histogram("db_query_fetch_seconds",
+                              "Time per request spent fetching result rows.", ("route",))
+db_rows = Histogram("db_rows_returned", "Rows fetched per request.", ("route",), ROW_BUCKETS)
+model_inference_duration = Histogram("model_inference_seconds",
+                                     "Model scoring time per call.", ("route", "model"))
+
+REGISTRY = [
+    http_requests, http_request_duration, db_acquire_duration, db_execute_duration,
+    db_fetch_duration, db_rows, model_inference_duration,
+]
+
+
+class RequestMetrics:
+    __slots__ = ("acquire", "execute", "fetch", "rows", "db_used", "inference")
+
+    def __init__(self):
+        self.acquire = 0.0
+        self.execute = 0.0
+        self.fetch = 0.0
+        self.rows = 0
+        self.db_used = False
+        self.inference = []
+
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+def record_acquire(seconds):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.acquire += seconds
+        metrics.db_used = True
+
+
+def record_inference(model_name, seconds):
+    metrics = _current.get()
+    if metrics is None:
+        model_inference_duration.observe((UNMATCHED_ROUTE, model_name), seconds)
+    else:
+        metrics.inference.append((model_name, seconds))
+
+
+# -------------------- Cursor wrappers --------------------
+
+def _count(rows):
+    return len(rows) if rows else 0
+
+
+class TimedCursor:
+    """Delegates to a DB-API cursor, timing execute/fetch calls into the request's metrics."""
+    __slots__ = ("_cursor", "_metrics")
+
+    def __init__(self, cursor, metrics):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_metrics", metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        finally:
+            self._metrics.execute += time.perf_counter() - start
+
+    def executemany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(*args, **kwargs)
+        finally:
+            self._metrics.execute += time.perf_counter() - start
+
+    def _fetched(self, start, rows):
+        self._metrics.fetch += time.perf_counter() - start
+        self._metrics.rows += rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(start, _count(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, _count(rows))
+        return rows
+
+    def __iter__(self):
+        iterator = iter(self._cursor)
+        while True:
+            start = time.perf_counter()
+            try:
+                row = next(iterator)
+            except StopIteration:
+                self._fetched(start, 0)
+                return
+            self._fetched(start, 1)
+            yield row
+
+
+class AsyncTimedCursor(TimedCursor):
+    """TimedCursor for python-oracledb asyncio cursors."""
+    __slots__ = ()
+
+    async def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.execute(*args, **kwargs)
+        finally:
+            self._metrics.execute += time.perf_counter() - start
+
+    async def executemany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.executemany(*args, **kwargs)
+        finally:
+            self._metrics.execute += time.perf_counter() - start
+
+    async def fetchone(self):
+        start = time.perf_counter()
+        row = await self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    async def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(start, _count(rows))
+        return rows
+
+    async def fetchall(self):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        self._fetched(start, _count(rows))
+        return rows
+
+    def __iter__(self):
+        raise TypeError("asyncio cursors are iterated with 'async for'")
+
+    async def __aiter__(self):
+        iterator = self._cursor.__aiter__()
+        while True:
+            start = time.perf_counter()
+            try:
+                row = await iterator.__anext__()
+            except StopAsyncIteration:
+                self._fetched(start, 0)
+                return
+            self._fetched(start, 1)
+            yield row
+
+
+class TimedConnection:
+    """Delegates to a connection; its cursors are timed."""
+    __slots__ = ("_connection", "_metrics", "_cursor_type")
+
+    def __init__(self, connection, metrics, cursor_type):
+        object.__setattr__(self, "_connection", connection)
+        object.__setattr__(self, "_metrics", metrics)
+        object.__setattr__(self, "_cursor_type", cursor_type)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection, name, value)
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor_type(self._connection.cursor(*args, **kwargs), self._metrics)
+
+
+def instrument(connection, is_async=False):
+    """The connection to hand to request code: timed inside a request, unchanged outside one."""
+    metrics = _current.get()
+    if metrics is None:
+        return connection
+    return TimedConnection(connection, metrics, AsyncTimedCursor if is_async else TimedCursor)
+
+
+# -------------------- Middleware --------------------
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no extra task per request, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._paths = None
+
+    def _route(self, scope):
+        # The path template (e.g. /missions/{mission_id}) of the route that handled the request,
+        # looked up by endpoint in the app's route table, which carries the router prefixes
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._paths is None:
+            self._paths = {
+                r.endpoint: r.path for r in scope["app"].routes
+                if getattr(r, "endpoint", None) is not None and getattr(r, "path", None) is not None
+            }
+        path = self._paths.get(endpoint)
+        if path is None:
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = self._route(scope)
+            http_requests.inc((scope["method"], route, str(status[0])))
+            http_request_duration.observe((scope["method"], route), elapsed)
+            if metrics.db_used:
+                labels = (route,)
+                db_acquire_duration.observe(labels, metrics.acquire)
+                db_execute_duration.observe(labels, metrics.execute)
+                db_fetch_duration.observe(labels, metrics.fetch)
+                db_rows.observe(labels, metrics.rows)
+            for model_name, seconds in metrics.inference:
+                model_inference_duration.observe((route, model_name), seconds)
+
+
+# -------------------- Exposition --------------------
+
+def _pool_lines():
+    from database import get_pool_stats
+
+    stats = get_pool_stats()
+    pools = {"sync": stats, "async": stats["async_pool"]}
+    lines = ["# HELP db_pool_sessions Pooled database sessions by state.", "# TYPE db_pool_sessions gauge"]
+    for pool, values in pools.items():
+        for state in ("busy", "idle", "opened", "max"):
+            lines.append(f'db_pool_sessions{{pool="{pool}",state="{state}"}} {values[state]}')
+    lines += ["# HELP db_pool_acquire_errors_total Failed session acquires.",
+              "# TYPE db_pool_acquire_errors_total counter"]
+    for pool, values in pools.items():
+        lines.append(f'db_pool_acquire_errors_total{{pool="{pool}"}} {values["acquire_errors"]}')
+    return lines
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(_pool_lines())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,163 @@
+import os
+import queue
+import threading
+import time
+from database import get_db, get_db_async
+
+# Data layer for the Predictions table, shared by the /predictions router and
+# the AI endpoints so inference results are saved in-process (no HTTP loopback).
+
+INSERT_PREDICTION_SQL = """
+    INSERT INTO Predictions (satellite_id, status_prediction, lifespan_months, collision_risk)
+    VALUES (:1, :2, :3, :4)
+"""
+
+# Write-behind settings (override through .env)
+WRITE_BEHIND_ENABLED = os.getenv("PREDICTION_WRITE_BEHIND", "0") == "1"
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("PREDICTION_WRITE_BEHIND_BATCH_SIZE", "500"))
+WRITE_BEHIND_FLUSH_SECONDS = float(os.getenv("PREDICTION_WRITE_BEHIND_FLUSH_SECONDS", "1.0"))
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("PREDICTION_WRITE_BEHIND_QUEUE_SIZE", "100000"))
+
+
+def prediction_row(satellite_id, status_prediction, lifespan_months, collision_risk):
+    return (satellite_id, status_prediction, lifespan_months, collision_risk)
+
+
+def insert_prediction(connection, row):
+    """Insert one prediction row and return its prediction_id. The caller commits."""
+    cursor = connection.cursor()
+    pred_id = cursor.var(int)
+    cursor.execute(
+        INSERT_PREDICTION_SQL.rstrip() + " RETURNING prediction_id INTO :5",
+        [*row, pred_id]
+    )
+    return pred_id.getvalue()[0]
+
+
+async def insert_prediction_async(connection, row):
+    """insert_prediction on an asyncio connection."""
+    cursor = connection.cursor()
+    pred_id = cursor.var(int)
+    await cursor.execute(
+        INSERT_PREDICTION_SQL.rstrip() + " RETURNING prediction_id INTO :5",
+        [*row, pred_id]
+    )
+    return pred_id.getvalue()[0]
+
+
+def insert_predictions(connection, rows):
+    """Array-insert many prediction rows in one round trip. The caller commits."""
+    if rows:
+        connection.cursor().executemany(INSERT_PREDICTION_SQL, rows)
+
+
+def save_prediction(row):
+    with get_db() as conn:
+        prediction_id = insert_prediction(conn, row)
+        conn.commit()
+        return prediction_id
+
+
+def save_predictions(rows):
+    with get_db() as conn:
+        insert_predictions(conn, rows)
+        conn.commit()
+
+
+async def save_prediction_async(row):
+    async with get_db_async() as conn:
+        prediction_id = await insert_prediction_async(conn, row)
+        await conn.commit()
+        return prediction_id
+
+
+async def save_predictions_async(rows):
+    if not rows:
+        return
+    async with get_db_async() as conn:
+        await conn.cursor().executemany(INSERT_PREDICTION_SQL, rows)
+        await conn.commit()
+
+
+class PredictionWriter:
+    """
+    Asynchronous write-behind queue for prediction rows.
+    A background thread drains the queue and flushes to Predictions in
+    batches, either when batch_size rows are waiting or every flush_seconds.
+    """
+
+    def __init__(self, batch_size=WRITE_BEHIND_BATCH_SIZE, flush_seconds=WRITE_BEHIND_FLUSH_SECONDS,
+                 max_queue=WRITE_BEHIND_QUEUE_SIZE):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "written": 0, "failed": 0, "rejected": 0, "batches": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the worker after flushing everything already queued."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, rows):
+        """Queue rows for writing. Returns False if the queue is full (nothing queued)."""
+        with self._lock:
+            if self._queue.maxsize and self._queue.qsize() + len(rows) > self._queue.maxsize:
+                self.stats["rejected"] += len(rows)
+                return False
+            for row in rows:
+                self._queue.put_nowait(row)
+            self.stats["queued"] += len(rows)
+        return True
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, "pending": self._queue.qsize()}
+
+    def _drain(self, timeout):
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        try:
+            save_predictions(batch)
+        except Exception as e:
+            print(f"⚠️ Failed to flush {len(batch)} predictions: {e}")
+            with self._lock:
+                self.stats["failed"] += len(batch)
+            return
+        with self._lock:
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(self.flush_seconds)
+            if batch:
+                self._flush(batch)
+        # Final flush on shutdown
+        while True:
+            batch = self._drain(0)
+            if not batch:
+                break
+            self._flush(batch)
+
+
+prediction_writer = PredictionWriter()
@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+
+# Keyset (cursor) pagination helpers shared by the list endpoints.
+# A cursor is an opaque, URL-safe token holding the sort key of the last row
+# returned, e.g. (timestamp, track_id). The next page continues strictly after it.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_time: datetime, row_id: int) -> str:
+    raw = json.dumps([sort_time.isoformat(), int(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_time, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_time), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from database import DatabaseError, get_db
+from routes.space_debris import debris_index, load_debris_records
+from services.conjunction import METRICS, load_latest_fixes, screen
+import time
+
+router = APIRouter(prefix="/conjunctions", tags=["Conjunctions"])
+
+# -------------------- Models --------------------
+
+class Conjunction(BaseModel):
+    satellite_id: int
+    debris_id: int
+    distance_km: float
+    fix_time: datetime
+
+class ConjunctionReport(BaseModel):
+    threshold_km: float
+    metric: str
+    satellites_screened: int
+    debris_screened: int
+    total_conjunctions: int
+    elapsed_ms: float
+    conjunctions: List[Conjunction]
+
+# -------------------- Screen --------------------
+
+@router.get("/", response_model=ConjunctionReport)
+def screen_conjunctions(
+    threshold_km: float = Query(10.0, gt=0, le=5000),
+    metric: str = Query("great_circle", enum=list(METRICS)),
+    debris_altitude_km: float = Query(0.0, ge=0, description="Assumed debris altitude for the 3d metric"),
+    satellite_id: Optional[int] = None,
+    limit: int = Query(1000, ge=1, le=100000),
+):
+    """
+    Screen the latest tracked position of every satellite against the debris
+    catalog and return the closest pairs under threshold_km.
+    """
+    try:
+        with get_db() as connection:
+            sat_ids, fix_times, sat_lat, sat_lon, sat_alt = load_latest_fixes(connection)
+        debris_index.ensure_loaded(load_debris_records)
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    fix_time_of = dict(zip(sat_ids.tolist(), fix_times))
+    if satellite_id is not None:
+        keep = sat_ids == satellite_id
+        sat_ids, sat_lat, sat_lon, sat_alt = sat_ids[keep], sat_lat[keep], sat_lon[keep], sat_alt[keep]
+    debris_ids, debris_lat, debris_lon = debris_index.coordinates()
+
+    start = time.perf_counter()
+    sats, debris, dist = screen(sat_ids, sat_lat, sat_lon, sat_alt, debris_ids, debris_lat, debris_lon,
+                                threshold_km, metric, debris_altitude_km)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "threshold_km": threshold_km,
+        "metric": metric,
+        "satellites_screened": len(sat_ids),
+        "debris_screened": len(debris_ids),
+        "total_conjunctions": len(dist),
+        "elapsed_ms": round(elapsed_ms, 3),
+        "conjunctions": [
+            {"satellite_id": s, "debris_id": d, "distance_km": round(km, 3), "fix_time": fix_time_of[s]}
+            for s, d, km in zip(sats[:limit].tolist(), debris[:limit].tolist(), dist[:limit].tolist())
+        ]
+    }
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Optional
+from datetime import datetime
+from database import DatabaseError, get_db
+from services.arrow_export import (
+    ARROW_STREAM_MEDIA_TYPE, FORMATS, PARQUET_MEDIA_TYPE,
+    ipc_stream, pa, record_batches, schema, write_parquet
+)
+import os
+import tempfile
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+# -------------------- Columnar exports --------------------
+# format=arrow streams an Arrow IPC stream batch by batch; format=parquet
+# writes a temporary Parquet file and sends it. Either way only one record
+# batch is in memory at a time.
+
+
+def _export(source, fmt, filters):
+    if pa is None:
+        raise HTTPException(status_code=501, detail="Columnar exports need pyarrow installed on the server")
+    arrow_schema = schema(source)
+    filename = f"{source}.{'arrow' if fmt == 'arrow' else 'parquet'}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if fmt == "arrow":
+        def generate():
+            with get_db() as connection:
+                yield from ipc_stream(record_batches(connection, source, **filters), arrow_schema)
+
+        return StreamingResponse(generate(), media_type=ARROW_STREAM_MEDIA_TYPE, headers=headers)
+
+    fd, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+    try:
+        with get_db() as connection:
+            write_parquet(path, record_batches(connection, source, **filters), arrow_schema)
+    except DatabaseError as e:
+        os.remove(path)
+        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(path, media_type=PARQUET_MEDIA_TYPE, filename=filename,
+                        background=BackgroundTask(os.remove, path))
+
+
+@router.get("/tracking")
+def export_tracking(
+    format: str = Query("arrow", enum=list(FORMATS)),
+    satellite_id: Optional[int] = None,
+    station_id: Optional[int] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+):
+    return _export("tracking", format, {
+        "satellite_id": satellite_id,
+        "station_id": station_id,
+        "start_time": start_time,
+        "end_time": end_time,
+    })
+
+
+@router.get("/predictions")
+def export_predictions(
+    format: str = Query("arrow", enum=list(FORMATS)),
+    satellite_id: Optional[int] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+):
+    return _export("predictions", format, {
+        "satellite_id": satellite_id,
+        "start_time": start_time,
+        "end_time": end_time,
+    })
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional
-from database import get_db
+from datetime import datetime
+from database import DatabaseError, get_db, get_db_async
+from routes.satellite_tracking import load_track_fixes
+from services.passes import load_stations, pass_cache
+from services.reference_cache import ReferenceCache, cached_list_response, not_modified
+from services.propagation import track_store
 
 router = APIRouter(prefix="/ground-stations", tags=["Ground Stations"])
 
@@ -15,14 +20,21 @@ class GroundStationCreate(BaseModel):
 class GroundStation(GroundStationCreate):
     station_id: int
 
+class PassWindow(BaseModel):
+    satellite_id: int
+    start_time: datetime
+    end_time: datetime
+    duration_seconds: float
+    max_elevation_deg: float
+
 # ------------------- CREATE -------------------
 
 @router.post("/", response_model=GroundStation, status_code=201)
-def create_ground_station(ground_station: GroundStationCreate):
+async def create_ground_station(ground_station: GroundStationCreate):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 INSERT INTO Ground_Stations (station_name, location, contact_frequency)
                 VALUES (:1, :2, :3)
             """, (
@@ -30,62 +42,64 @@ def create_ground_station(ground_station: GroundStationCreate):
                 ground_station.location,
                 ground_station.contact_frequency
             ))
-            conn.commit()
+            await conn.commit()
 
-            cursor.execute("SELECT MAX(station_id) FROM Ground_Stations")
-            station_id = cursor.fetchone()[0]
+            await cursor.execute("SELECT MAX(station_id) FROM Ground_Stations")
+            station_id = (await cursor.fetchone())[0]
+            station_cache.invalidate()
+            pass_cache.invalidate()
             return {**ground_station.dict(), "station_id": station_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # ------------------- READ ALL -------------------
+# Stations rarely change: reads are served from an in-process cache that the
+# write handlers invalidate, with ETags for If-None-Match revalidation.
+
+station_cache = ReferenceCache("ground-stations", "station_id")
+
+async def _load_ground_stations():
+    async with get_db_async() as conn:
+        cursor = conn.cursor()
+        await cursor.execute("SELECT * FROM Ground_Stations")
+        rows = await cursor.fetchall()
+        return [
+            {
+                "station_id": row[0],
+                "station_name": row[1],
+                "location": row[2],
+                "contact_frequency": row[3]
+            } for row in rows
+        ]
 
 @router.get("/", response_model=List[GroundStation])
-def get_all_ground_stations():
+async def get_all_ground_stations(request: Request, response: Response):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM Ground_Stations")
-            rows = cursor.fetchall()
-            return [
-                GroundStation(
-                    station_id=row[0],
-                    station_name=row[1],
-                    location=row[2],
-                    contact_frequency=row[3]
-                ) for row in rows
-            ]
+        stations = await station_cache.rows(_load_ground_stations)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_list_response(request, response, station_cache, stations)
 
 # ------------------- READ BY ID -------------------
 
 @router.get("/{station_id}", response_model=GroundStation)
-def get_ground_station_by_id(station_id: int):
+async def get_ground_station_by_id(station_id: int, request: Request, response: Response):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM Ground_Stations WHERE station_id = :1", [station_id])
-            row = cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Ground station not found")
-            return GroundStation(
-                station_id=row[0],
-                station_name=row[1],
-                location=row[2],
-                contact_frequency=row[3]
-            )
+        station = await station_cache.get(station_id, _load_ground_stations)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not station:
+        raise HTTPException(status_code=404, detail="Ground station not found")
+    return not_modified(request, response, station_cache.etag) or station
 
 # ------------------- UPDATE -------------------
 
 @router.put("/{station_id}", response_model=GroundStation)
-def update_ground_station(station_id: int, updated: GroundStationCreate):
+async def update_ground_station(station_id: int, updated: GroundStationCreate):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 UPDATE Ground_Stations
                 SET station_name = :1, location = :2, contact_frequency = :3
                 WHERE station_id = :4
@@ -97,7 +111,9 @@ def update_ground_station(station_id: int, updated: GroundStationCreate):
             ))
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Ground station not found")
-            conn.commit()
+            await conn.commit()
+            station_cache.invalidate()
+            pass_cache.invalidate()
             return {**updated.dict(), "station_id": station_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -105,14 +121,58 @@ def update_ground_station(station_id: int, updated: GroundStationCreate):
 # ------------------- DELETE -------------------
 
 @router.delete("/{station_id}")
-def delete_ground_station(station_id: int):
+async def delete_ground_station(station_id: int):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM Ground_Stations WHERE station_id = :1", [station_id])
+            await cursor.execute("DELETE FROM Ground_Stations WHERE station_id = :1", [station_id])
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Ground station not found")
-            conn.commit()
+            await conn.commit()
+            station_cache.invalidate()
+            pass_cache.invalidate()
             return {"message": f"Ground station {station_id} deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+# ------------------- PASSES -------------------
+
+def _load_stations():
+    with get_db() as conn:
+        return load_stations(conn)
+
+def _refresh_passes():
+    # Windows are recomputed at most every PASS_REFRESH_SECONDS (or after a station changes)
+    try:
+        track_store.ensure_loaded(load_track_fixes)
+        pass_cache.ensure_fresh(_load_stations)
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/passes/stats")
+def get_pass_cache_stats():
+    _refresh_passes()
+    return pass_cache.stats()
+
+@router.get("/{station_id}/passes", response_model=List[PassWindow])
+def get_station_passes(
+    station_id: int,
+    after: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=1000),
+    satellite_id: Optional[int] = None,
+    min_elevation: Optional[float] = Query(None, ge=-90, le=90),
+):
+    """
+    Visibility windows of a station that are in progress at, or start after,
+    `after` (default now, UTC), earliest first. Windows are precomputed over a
+    rolling horizon from interpolated tracking positions; `min_elevation`
+    keeps only passes peaking at least that high above the horizon.
+    """
+    _refresh_passes()
+    try:
+        coordinates = pass_cache.station(station_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Ground station not found")
+    if coordinates is None:
+        raise HTTPException(status_code=422, detail="Ground station location has no parseable coordinates")
+    return pass_cache.next_passes(station_id, after or datetime.utcnow(), limit, satellite_id, min_elevation)
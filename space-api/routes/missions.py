@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import Optional, List
-from database import get_db
+from database import get_db_async
+from services.reference_cache import ReferenceCache, cached_list_response, not_modified
 
 router = APIRouter(prefix="/missions", tags=["missions"])
 
@@ -19,69 +20,67 @@ class Mission(MissionCreate):
 # --------------------- CRUD Endpoints ---------------------
 
 @router.post("/", response_model=Mission)
-def create_mission(mission: MissionCreate):
+async def create_mission(mission: MissionCreate):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 INSERT INTO Missions (mission_name, launch_date, mission_type, status)
                 VALUES (:1, TO_DATE(:2, 'YYYY-MM-DD'), :3, :4)
             """, (mission.mission_name, mission.launch_date, mission.mission_type, mission.status))
-            conn.commit()
+            await conn.commit()
+            mission_cache.invalidate()
 
-            cursor.execute("SELECT MAX(mission_id) FROM Missions")
-            mission_id = cursor.fetchone()[0]
+            await cursor.execute("SELECT MAX(mission_id) FROM Missions")
+            mission_id = (await cursor.fetchone())[0]
             return {**mission.dict(), "mission_id": mission_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Missions rarely change: reads are served from an in-process cache that the
+# write handlers invalidate, with ETags for If-None-Match revalidation.
+mission_cache = ReferenceCache("missions", "mission_id")
+
+async def _load_missions():
+    async with get_db_async() as conn:
+        cursor = conn.cursor()
+        await cursor.execute("SELECT * FROM Missions")
+        rows = await cursor.fetchall()
+        missions = []
+        for row in rows:
+            missions.append({
+                "mission_id": row[0],
+                "mission_name": row[1],
+                "launch_date": row[2].strftime("%Y-%m-%d") if row[2] else None,
+                "mission_type": row[3],
+                "status": row[4]
+            })
+        return missions
+
 @router.get("/", response_model=List[Mission])
-def get_all_missions():
+async def get_all_missions(request: Request, response: Response):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM Missions")
-            rows = cursor.fetchall()
-            missions = []
-            for row in rows:
-                missions.append({
-                    "mission_id": row[0],
-                    "mission_name": row[1],
-                    "launch_date": row[2].strftime("%Y-%m-%d") if row[2] else None,
-                    "mission_type": row[3],
-                    "status": row[4]
-                })
-            return missions
+        missions = await mission_cache.rows(_load_missions)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_list_response(request, response, mission_cache, missions)
 
 @router.get("/{mission_id}", response_model=Mission)
-def get_mission_by_id(mission_id: int):
+async def get_mission_by_id(mission_id: int, request: Request, response: Response):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM Missions WHERE mission_id = :1", [mission_id])
-            row = cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Mission not found")
-            return {
-                "mission_id": row[0],
-                "mission_name": row[1],
-                "launch_date": row[2].strftime("%Y-%m-%d") if row[2] else None,
-                "mission_type": row[3],
-                "status": row[4]
-            }
-    except HTTPException:
-        raise
+        mission = await mission_cache.get(mission_id, _load_missions)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not mission:
+        raise HTTPException(status_code=404, detail="Mission not found")
+    return not_modified(request, response, mission_cache.etag) or mission
 
 @router.put("/{mission_id}", response_model=Mission)
-def update_mission(mission_id: int, mission: MissionCreate):
+async def update_mission(mission_id: int, mission: MissionCreate):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 UPDATE Missions
                 SET mission_name = :1,
                     launch_date = TO_DATE(:2, 'YYYY-MM-DD'),
@@ -91,7 +90,8 @@ def update_mission(mission_id: int, mission: MissionCreate):
             """, (mission.mission_name, mission.launch_date, mission.mission_type, mission.status, mission_id))
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Mission not found")
-            conn.commit()
+            await conn.commit()
+            mission_cache.invalidate()
             return {**mission.dict(), "mission_id": mission_id}
     except HTTPException:
         raise
@@ -99,14 +99,15 @@ def update_mission(mission_id: int, mission: MissionCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{mission_id}")
-def delete_mission(mission_id: int):
+async def delete_mission(mission_id: int):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM Missions WHERE mission_id = :1", [mission_id])
+            await cursor.execute("DELETE FROM Missions WHERE mission_id = :1", [mission_id])
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Mission not found")
-            conn.commit()
+            await conn.commit()
+            mission_cache.invalidate()
             return {"message": f"Mission {mission_id} deleted successfully."}
     except HTTPException:
         raise
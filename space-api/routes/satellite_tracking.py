@@ -1,9 +1,17 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from typing import Optional, List
 from datetime import datetime
-from database import get_db
-import cx_Oracle
+from database import DatabaseError, get_db, get_db_async
+from pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from serialization import column_names, dumps, json_rows_response, rows_to_dicts
+from services.downsampling import METHODS as DOWNSAMPLING_METHODS, downsample
+from services.propagation import MODE_NAMES, UNAVAILABLE, from_seconds, load_fixes, to_seconds, track_store
+import csv
+import io
+import json
+import numpy as np
 
 router = APIRouter(prefix="/satellite_tracking", tags=["Satellite_tracking"])
 
@@ -23,13 +31,13 @@ class Tracking(TrackingCreate):
 # -------------------- Create --------------------
 
 @router.post("/", response_model=Tracking)
-def create_tracking(tracking: TrackingCreate):
+async def create_tracking(tracking: TrackingCreate):
     try:
-        with get_db() as connection:
+        async with get_db_async() as connection:
             cursor = connection.cursor()
             track_id = cursor.var(int)
 
-            cursor.execute("""
+            await cursor.execute("""
                 INSERT INTO Satellite_Tracking (
                     satellite_id, station_id, timestamp,
                     latitude, longitude, altitude_km
@@ -47,80 +55,431 @@ def create_tracking(tracking: TrackingCreate):
                 "track_id": track_id
             })
 
-            connection.commit()
+            await connection.commit()
+            track_store.add([tracking])
 
             return Tracking(
                 track_id=track_id.getvalue()[0],
                 **tracking.dict()
             )
 
-    except cx_Oracle.DatabaseError as e:
+    except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# -------------------- Batch Ingest --------------------
+
+INSERT_TRACKING_SQL = """
+    INSERT INTO Satellite_Tracking (
+        satellite_id, station_id, timestamp,
+        latitude, longitude, altitude_km
+    )
+    VALUES (:1, :2, :3, :4, :5, :6)
+"""
+
+
+def _parse_tracking_body(body: bytes, content_type: str):
+    """Decode a batch body (JSON array or CSV with a header row) into raw records."""
+    try:
+        if "csv" in content_type:
+            return list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+        records = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Malformed batch body: {e}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array of tracking records")
+    return records
+
+
+@router.post("/batch", response_model=dict)
+async def create_tracking_batch(request: Request, batch_size: int = Query(1000, ge=1, le=50000)):
+    """
+    Bulk-insert tracking fixes sent as a JSON array of TrackingCreate objects
+    or as CSV (Content-Type: text/csv) with the same column names.
+    Each batch is written with one array-bound executemany and one commit;
+    rows rejected by validation or by the database are reported per batch.
+    """
+    records = _parse_tracking_body(await request.body(), request.headers.get("content-type", ""))
+    return await _insert_tracking_batches(records, batch_size)
+
+
+async def _insert_tracking_batches(records, batch_size):
+    batches = []
+    try:
+        async with get_db_async() as connection:
+            cursor = connection.cursor()
+            for batch_no, start in enumerate(range(0, len(records), batch_size)):
+                chunk = records[start:start + batch_size]
+                rows, row_numbers, trackings, errors = [], [], [], []
+                for offset, record in enumerate(chunk):
+                    try:
+                        tracking = TrackingCreate(**record)
+                    except (ValidationError, TypeError) as e:
+                        errors.append({"row": start + offset, "error": str(e)})
+                        continue
+                    rows.append((
+                        tracking.satellite_id,
+                        tracking.station_id,
+                        tracking.timestamp,
+                        tracking.latitude,
+                        tracking.longitude,
+                        tracking.altitude_km
+                    ))
+                    row_numbers.append(start + offset)
+                    trackings.append(tracking)
+
+                if rows:
+                    await cursor.executemany(INSERT_TRACKING_SQL, rows, batcherrors=True)
+                    rejected = set()
+                    for error in cursor.getbatcherrors():
+                        rejected.add(error.offset)
+                        errors.append({"row": row_numbers[error.offset], "error": error.message})
+                    await connection.commit()
+                    track_store.add([t for i, t in enumerate(trackings) if i not in rejected])
+
+                errors.sort(key=lambda e: e["row"])
+                batches.append({
+                    "batch": batch_no,
+                    "accepted": len(chunk) - len(errors),
+                    "rejected": len(errors),
+                    "errors": errors
+                })
+
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "accepted": sum(b["accepted"] for b in batches),
+        "rejected": sum(b["rejected"] for b in batches),
+        "batches": batches
+    }
+
+
 # -------------------- Read All --------------------
 
+TRACKING_COLUMNS = "track_id, satellite_id, station_id, timestamp, latitude, longitude, altitude_km"
+STREAM_CHUNK_SIZE = 5000
+
+
+def _tracking_filters(satellite_id, station_id, start_time, end_time):
+    """Build the WHERE clause and binds for the tracking list/stream queries."""
+    clauses = []
+    binds = {}
+    if satellite_id is not None:
+        clauses.append("satellite_id = :satellite_id")
+        binds["satellite_id"] = satellite_id
+    if station_id is not None:
+        clauses.append("station_id = :station_id")
+        binds["station_id"] = station_id
+    if start_time is not None:
+        clauses.append("timestamp >= :start_time")
+        binds["start_time"] = start_time
+    if end_time is not None:
+        clauses.append("timestamp < :end_time")
+        binds["end_time"] = end_time
+    return clauses, binds
+
+
+def _row_to_tracking(row):
+    return Tracking(
+        track_id=row[0],
+        satellite_id=row[1],
+        station_id=row[2],
+        timestamp=row[3].isoformat(),
+        latitude=row[4],
+        longitude=row[5],
+        altitude_km=row[6]
+    )
+
+
 @router.get("/", response_model=List[Tracking])
-def get_all_tracking():
+async def get_all_tracking(
+    satellite_id: Optional[int] = None,
+    station_id: Optional[int] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """
+    One page of tracking fixes ordered by (timestamp, track_id).
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    """
+    clauses, binds = _tracking_filters(satellite_id, station_id, start_time, end_time)
+    if cursor:
+        cursor_time, cursor_id = decode_cursor(cursor)
+        clauses.append("(timestamp > :cursor_time OR (timestamp = :cursor_time AND track_id > :cursor_id))")
+        binds["cursor_time"] = cursor_time
+        binds["cursor_id"] = cursor_id
+    binds["page_size"] = limit
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     try:
-        with get_db() as connection:
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM Satellite_Tracking")
-            rows = cursor.fetchall()
-
-            tracking_list = []
-            for row in rows:
-                tracking_list.append(Tracking(
-                    track_id=row[0],
-                    satellite_id=row[1],
-                    station_id=row[2],
-                    timestamp=row[3].isoformat(),
-                    latitude=row[4],
-                    longitude=row[5],
-                    altitude_km=row[6]
-                ))
-            return tracking_list
-
-    except cx_Oracle.DatabaseError as e:
+        async with get_db_async() as connection:
+            db_cursor = connection.cursor()
+            db_cursor.arraysize = limit
+            await db_cursor.execute(f"""
+                SELECT {TRACKING_COLUMNS}
+                FROM Satellite_Tracking
+                {where}
+                ORDER BY timestamp, track_id
+                FETCH FIRST :page_size ROWS ONLY
+            """, binds)
+            rows = await db_cursor.fetchall()
+
+            headers = {}
+            if len(rows) == limit:
+                last = rows[-1]
+                headers[NEXT_CURSOR_HEADER] = encode_cursor(last[3], last[0])
+            return json_rows_response(db_cursor, rows, headers)
+
+    except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# -------------------- Stream (NDJSON) --------------------
+
+@router.get("/stream")
+async def stream_tracking(
+    satellite_id: Optional[int] = None,
+    station_id: Optional[int] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+):
+    """
+    Export every matching fix as newline-delimited JSON.
+    Rows are read with fetchmany in fixed-size chunks, so memory use stays
+    constant no matter how many rows match.
+    """
+    clauses, binds = _tracking_filters(satellite_id, station_id, start_time, end_time)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    async def generate():
+        async with get_db_async() as connection:
+            db_cursor = connection.cursor()
+            db_cursor.arraysize = STREAM_CHUNK_SIZE
+            await db_cursor.execute(f"""
+                SELECT {TRACKING_COLUMNS}
+                FROM Satellite_Tracking
+                {where}
+                ORDER BY timestamp, track_id
+            """, binds)
+            columns = column_names(db_cursor)
+            while True:
+                rows = await db_cursor.fetchmany(STREAM_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield b"".join(dumps(row) + b"\n" for row in rows_to_dicts(columns, rows))
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# -------------------- Downsampled History --------------------
+# The NumPy-heavy handlers below stay sync so FastAPI runs them on its
+# threadpool instead of blocking the event loop.
+
+HISTORY_METRICS = ("latitude", "longitude", "altitude_km")
+
+class HistoryPoint(BaseModel):
+    track_id: int
+    timestamp: datetime
+    latitude: float
+    longitude: float
+    altitude_km: float
+
+class TrackHistory(BaseModel):
+    satellite_id: int
+    method: str
+    metric: str
+    total_points: int
+    returned_points: int
+    points: List[HistoryPoint]
+
+
+def _load_track_columns(satellite_id, start_time, end_time):
+    """Read one satellite's fixes into column arrays, chunk by chunk (no per-row objects)."""
+    clauses, binds = _tracking_filters(satellite_id, None, start_time, end_time)
+    columns = {"track_id": [], "timestamp": [], "latitude": [], "longitude": [], "altitude_km": []}
+    with get_db() as connection:
+        db_cursor = connection.cursor()
+        db_cursor.arraysize = STREAM_CHUNK_SIZE
+        db_cursor.execute(f"""
+            SELECT track_id, timestamp, latitude, longitude, altitude_km
+            FROM Satellite_Tracking
+            WHERE {' AND '.join(clauses)}
+            ORDER BY timestamp, track_id
+        """, binds)
+        while True:
+            rows = db_cursor.fetchmany(STREAM_CHUNK_SIZE)
+            if not rows:
+                break
+            track_ids, times, lats, lons, alts = zip(*rows)
+            columns["track_id"].append(np.array(track_ids, dtype=np.int64))
+            columns["timestamp"].append(np.array(times, dtype="datetime64[us]"))
+            columns["latitude"].append(np.array(lats, dtype=np.float64))
+            columns["longitude"].append(np.array(lons, dtype=np.float64))
+            columns["altitude_km"].append(np.array(alts, dtype=np.float64))
+    return {
+        name: np.concatenate(chunks) if chunks else np.empty(0, dtype="datetime64[us]" if name == "timestamp" else np.float64)
+        for name, chunks in columns.items()
+    }
+
+
+@router.get("/satellite/{satellite_id}/history", response_model=TrackHistory)
+def get_satellite_history(
+    satellite_id: int,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    points: int = Query(2000, ge=3, le=20000),
+    method: str = Query("lttb", enum=list(DOWNSAMPLING_METHODS)),
+    metric: str = Query("latitude", enum=list(HISTORY_METRICS)),
+):
+    """
+    A satellite's track over a time range, downsampled to at most `points` fixes.
+    method=lttb keeps the visual shape of `metric`; method=minmax keeps each
+    time bucket's extremes of `metric`.
+    """
+    try:
+        columns = _load_track_columns(satellite_id, start_time, end_time)
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    total = len(columns["track_id"])
+    if total:
+        seconds = columns["timestamp"].astype("int64") / 1e6
+        keep = downsample(seconds, columns[metric], points, method)
+    else:
+        keep = np.empty(0, dtype=np.intp)
+
+    selected = {name: values[keep].tolist() for name, values in columns.items()}
+    return {
+        "satellite_id": satellite_id,
+        "method": method,
+        "metric": metric,
+        "total_points": total,
+        "returned_points": len(keep),
+        "points": [
+            {"track_id": t, "timestamp": ts, "latitude": lat, "longitude": lon, "altitude_km": alt}
+            for t, ts, lat, lon, alt in zip(
+                selected["track_id"], selected["timestamp"], selected["latitude"],
+                selected["longitude"], selected["altitude_km"]
+            )
+        ]
+    }
+
+
+# -------------------- Positions --------------------
+
+MAX_TRAJECTORY_STEPS = 10000
+
+class Position(BaseModel):
+    satellite_id: int
+    timestamp: datetime
+    latitude: float
+    longitude: float
+    altitude_km: float
+    mode: str
+
+
+def load_track_fixes():
+    with get_db() as connection:
+        return load_fixes(connection, STREAM_CHUNK_SIZE)
+
+
+def _load_track_store():
+    """Load every fix into the in-memory track store on first use."""
+    try:
+        track_store.ensure_loaded(load_track_fixes)
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _positions(satellite_ids, timestamps, lat, lon, alt, mode):
+    available = mode != UNAVAILABLE
+    return [
+        {"satellite_id": s, "timestamp": ts, "latitude": la, "longitude": lo, "altitude_km": al, "mode": MODE_NAMES[m]}
+        for s, ts, la, lo, al, m, ok in zip(
+            satellite_ids, timestamps, lat.tolist(), lon.tolist(), alt.tolist(), mode.tolist(), available.tolist()
+        )
+        if ok
+    ]
+
+
+@router.get("/positions", response_model=List[Position])
+def get_fleet_positions(
+    at: Optional[datetime] = None,
+    satellite_ids: Optional[List[int]] = Query(None),
+):
+    """
+    Position of every satellite (or only `satellite_ids`) at one instant,
+    interpolated between fixes or extrapolated a short way past the last fix.
+    Satellites without a usable fix around `at` are left out. Defaults to now (UTC).
+    """
+    _load_track_store()
+    at = at or datetime.utcnow()
+    ids, lat, lon, alt, mode = track_store.fleet_at(at, satellite_ids)
+    return _positions(ids.tolist(), [at] * len(ids), lat, lon, alt, mode)
+
+
+@router.get("/satellite/{satellite_id}/position", response_model=Position)
+def get_satellite_position(satellite_id: int, at: Optional[datetime] = None):
+    _load_track_store()
+    at = at or datetime.utcnow()
+    lat, lon, alt, mode = track_store.track_at(satellite_id, [at])
+    positions = _positions([satellite_id], [at], lat, lon, alt, mode)
+    if not positions:
+        raise HTTPException(status_code=404, detail="No tracking data around the requested time")
+    return positions[0]
+
+
+@router.get("/satellite/{satellite_id}/trajectory", response_model=List[Position])
+def get_satellite_trajectory(
+    satellite_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    step_seconds: float = Query(60, gt=0),
+):
+    """A satellite's positions sampled every `step_seconds` over [start_time, end_time]."""
+    start, end = to_seconds([start_time, end_time])
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_time must not be before start_time")
+    if (end - start) / step_seconds >= MAX_TRAJECTORY_STEPS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TRAJECTORY_STEPS} steps per trajectory")
+
+    _load_track_store()
+    seconds = start + np.arange(int((end - start) // step_seconds) + 1) * step_seconds
+    lat, lon, alt, mode = track_store.track_at(satellite_id, seconds)
+    return _positions([satellite_id] * len(seconds), from_seconds(seconds), lat, lon, alt, mode)
+
+
 # -------------------- Read by ID --------------------
 
 @router.get("/{track_id}", response_model=Tracking)
-def get_tracking_by_id(track_id: int):
+async def get_tracking_by_id(track_id: int):
     try:
-        with get_db() as connection:
+        async with get_db_async() as connection:
             cursor = connection.cursor()
-            cursor.execute("SELECT * FROM Satellite_Tracking WHERE track_id = :track_id", {"track_id": track_id})
-            row = cursor.fetchone()
+            await cursor.execute(f"SELECT {TRACKING_COLUMNS} FROM Satellite_Tracking WHERE track_id = :track_id", {"track_id": track_id})
+            row = await cursor.fetchone()
 
             if row is None:
                 raise HTTPException(status_code=404, detail="Tracking not found")
 
-            return Tracking(
-                track_id=row[0],
-                satellite_id=row[1],
-                station_id=row[2],
-                timestamp=row[3].isoformat(),
-                latitude=row[4],
-                longitude=row[5],
-                altitude_km=row[6]
-            )
+            return _row_to_tracking(row)
 
-    except cx_Oracle.DatabaseError as e:
+    except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # -------------------- Update --------------------
 
 @router.put("/{track_id}", response_model=Tracking)
-def update_tracking(track_id: int, tracking: TrackingCreate):
+async def update_tracking(track_id: int, tracking: TrackingCreate):
     try:
-        with get_db() as connection:
+        async with get_db_async() as connection:
             cursor = connection.cursor()
 
-            cursor.execute("""
+            await cursor.execute("""
                 UPDATE Satellite_Tracking SET
                     satellite_id = :satellite_id,
                     station_id = :station_id,
@@ -142,32 +501,34 @@ def update_tracking(track_id: int, tracking: TrackingCreate):
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Tracking not found")
 
-            connection.commit()
+            await connection.commit()
+            track_store.invalidate()
 
             return Tracking(
                 track_id=track_id,
                 **tracking.dict()
             )
 
-    except cx_Oracle.DatabaseError as e:
+    except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # -------------------- Delete --------------------
 
 @router.delete("/{track_id}")
-def delete_tracking(track_id: int):
+async def delete_tracking(track_id: int):
     try:
-        with get_db() as connection:
+        async with get_db_async() as connection:
             cursor = connection.cursor()
-            cursor.execute("DELETE FROM Satellite_Tracking WHERE track_id = :track_id", {"track_id": track_id})
+            await cursor.execute("DELETE FROM Satellite_Tracking WHERE track_id = :track_id", {"track_id": track_id})
 
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Tracking not found")
 
-            connection.commit()
+            await connection.commit()
+            track_store.invalidate()
 
             return {"message": "Tracking deleted successfully."}
 
-    except cx_Oracle.DatabaseError as e:
+    except DatabaseError as e:
         raise HTTPException(status_code=500, detail=str(e))
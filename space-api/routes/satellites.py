@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional
-from database import get_db
+from database import get_db_async
+from services.reference_cache import ReferenceCache, cached_list_response, not_modified
 
 router = APIRouter(prefix="/satellites", tags=["Satellites"])
 
@@ -17,11 +18,11 @@ class Satellite(SatelliteBase):
 
 # JOIN ROUTE: /with-mission (must come BEFORE /{satellite_id})
 @router.get("/with-mission", tags=["Satellites + Missions"])
-def get_satellites_with_mission():
+async def get_satellites_with_mission():
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 SELECT s.satellite_id, s.satellite_name, s.orbit_type, s.launch_date,
                        m.mission_id, m.mission_name, m.launch_date AS mission_launch_date,
                        m.mission_type, m.status
@@ -29,80 +30,75 @@ def get_satellites_with_mission():
                 JOIN Missions m ON s.mission_id = m.mission_id
             """)
             columns = [col[0].lower() for col in cursor.description]
-            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            results = [dict(zip(columns, row)) for row in await cursor.fetchall()]
             return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # CREATE
 @router.post("/", response_model=Satellite)
-def create_satellite(satellite: SatelliteBase):
+async def create_satellite(satellite: SatelliteBase):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 INSERT INTO Satellites (satellite_name, mission_id, orbit_type, launch_date)
                 VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'))
             """, [satellite.satellite_name, satellite.mission_id, satellite.orbit_type, satellite.launch_date])
-            conn.commit()
-            cursor.execute("SELECT satellite_seq.CURRVAL FROM dual")  # Oracle sequence
-            satellite_id = cursor.fetchone()[0]
+            await conn.commit()
+            satellite_cache.invalidate()
+            await cursor.execute("SELECT satellite_seq.CURRVAL FROM dual")  # Oracle sequence
+            satellite_id = (await cursor.fetchone())[0]
             return {**satellite.dict(), "satellite_id": satellite_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Satellites rarely change: reads are served from an in-process cache that the
+# write handlers invalidate, with ETags for If-None-Match revalidation.
+satellite_cache = ReferenceCache("satellites", "satellite_id")
+
+async def _load_satellites():
+    async with get_db_async() as conn:
+        cursor = conn.cursor()
+        await cursor.execute("""
+            SELECT satellite_id, satellite_name, mission_id, orbit_type, TO_CHAR(launch_date, 'YYYY-MM-DD')
+            FROM Satellites
+        """)
+        return [{
+            "satellite_id": row[0],
+            "satellite_name": row[1],
+            "mission_id": row[2],
+            "orbit_type": row[3],
+            "launch_date": row[4]
+        } for row in await cursor.fetchall()]
+
 # READ ALL
 @router.get("/", response_model=List[Satellite])
-def get_all_satellites():
+async def get_all_satellites(request: Request, response: Response):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT satellite_id, satellite_name, mission_id, orbit_type, TO_CHAR(launch_date, 'YYYY-MM-DD')
-                FROM Satellites
-            """)
-            results = [Satellite(
-                satellite_id=row[0],
-                satellite_name=row[1],
-                mission_id=row[2],
-                orbit_type=row[3],
-                launch_date=row[4]
-            ) for row in cursor.fetchall()]
-            return results
+        satellites = await satellite_cache.rows(_load_satellites)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_list_response(request, response, satellite_cache, satellites)
 
 # READ BY ID
 @router.get("/{satellite_id}", response_model=Satellite)
-def get_satellite_by_id(satellite_id: int):
+async def get_satellite_by_id(satellite_id: int, request: Request, response: Response):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT satellite_id, satellite_name, mission_id, orbit_type, TO_CHAR(launch_date, 'YYYY-MM-DD')
-                FROM Satellites
-                WHERE satellite_id = :1
-            """, [satellite_id])
-            row = cursor.fetchone()
-            if row:
-                return Satellite(
-                    satellite_id=row[0],
-                    satellite_name=row[1],
-                    mission_id=row[2],
-                    orbit_type=row[3],
-                    launch_date=row[4]
-                )
-            raise HTTPException(status_code=404, detail="Satellite not found")
+        satellite = await satellite_cache.get(satellite_id, _load_satellites)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not satellite:
+        raise HTTPException(status_code=404, detail="Satellite not found")
+    return not_modified(request, response, satellite_cache.etag) or satellite
 
 # UPDATE
 @router.put("/{satellite_id}", response_model=Satellite)
-def update_satellite(satellite_id: int, satellite: SatelliteBase):
+async def update_satellite(satellite_id: int, satellite: SatelliteBase):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 UPDATE Satellites
                 SET satellite_name = :1,
                     mission_id = :2,
@@ -112,21 +108,23 @@ def update_satellite(satellite_id: int, satellite: SatelliteBase):
             """, [satellite.satellite_name, satellite.mission_id, satellite.orbit_type, satellite.launch_date, satellite_id])
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Satellite not found")
-            conn.commit()
+            await conn.commit()
+            satellite_cache.invalidate()
             return {**satellite.dict(), "satellite_id": satellite_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # DELETE
 @router.delete("/{satellite_id}")
-def delete_satellite(satellite_id: int):
+async def delete_satellite(satellite_id: int):
     try:
-        with get_db() as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM Satellites WHERE satellite_id = :1", [satellite_id])
+            await cursor.execute("DELETE FROM Satellites WHERE satellite_id = :1", [satellite_id])
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Satellite not found")
-            conn.commit()
+            await conn.commit()
+            satellite_cache.invalidate()
             return {"message": f"Satellite {satellite_id} deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
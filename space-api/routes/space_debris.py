@@ -1,10 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
 from typing import List, Optional
-from database import get_db
-from fastapi import APIRouter, HTTPException
-from database import get_db
-import cx_Oracle
+from database import DatabaseError, get_db, get_db_async
+from serialization import json_rows_response
+from services.spatial_index import GeoGridIndex
 
 
 router = APIRouter(
@@ -23,43 +22,104 @@ class SpaceDebrisIn(BaseModel):
 class SpaceDebrisOut(SpaceDebrisIn):
     debris_id: int
 
+class SpaceDebrisNear(SpaceDebrisOut):
+    distance_km: float
+
+# ------------------- Spatial index -------------------
+# Kept in sync by the create/update/delete handlers below; loaded from the
+# table on the first proximity query.
+
+debris_index = GeoGridIndex(cell_degrees=1.0)
+
+def _index_record(debris_id, debris):
+    return {"id": debris_id, "debris_id": debris_id, **debris}
+
+def load_debris_records():
+    with get_db() as connection:
+        cursor = connection.cursor()
+        cursor.arraysize = 5000
+        cursor.execute("""
+            SELECT debris_id, description, latitude, longitude, size_meters, risk_level
+            FROM Space_Debris
+        """)
+        return [
+            _index_record(row[0], {
+                "description": row[1],
+                "latitude": row[2],
+                "longitude": row[3],
+                "size_meters": row[4],
+                "risk_level": row[5],
+            })
+            for row in cursor
+        ]
+
+def _near_results(matches):
+    return [{**record, "distance_km": round(distance, 3)} for record, distance in matches]
+
+# GET debris within a radius of a point (must come BEFORE /{debris_id})
+@router.get("/near", response_model=List[SpaceDebrisNear])
+def get_debris_near(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0),
+    min_size: Optional[float] = None,
+    max_size: Optional[float] = None,
+    risk_level: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+):
+    try:
+        debris_index.ensure_loaded(load_debris_records)
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return _near_results(debris_index.within_radius(
+        latitude, longitude, radius_km, min_size, max_size, risk_level, limit
+    ))
+
+# GET the k debris objects nearest to a point
+@router.get("/nearest", response_model=List[SpaceDebrisNear])
+def get_nearest_debris(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=1000),
+    min_size: Optional[float] = None,
+    max_size: Optional[float] = None,
+    risk_level: Optional[str] = None,
+):
+    try:
+        debris_index.ensure_loaded(load_debris_records)
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return _near_results(debris_index.nearest(
+        latitude, longitude, k, min_size, max_size, risk_level
+    ))
+
 # GET all debris
 @router.get("/", response_model=List[SpaceDebrisOut])
-def get_all_debris():
-    with get_db() as connection:
+async def get_all_debris():
+    async with get_db_async() as connection:
         cursor = connection.cursor()
         try:
-            cursor.execute("""
+            await cursor.execute("""
                 SELECT debris_id, description, latitude, longitude, size_meters, risk_level
                 FROM Space_Debris
             """)
-            rows = cursor.fetchall()
-            return [
-                {
-                    "debris_id": row[0],
-                    "description": row[1],
-                    "latitude": row[2],
-                    "longitude": row[3],
-                    "size_meters": row[4],
-                    "risk_level": row[5],
-                }
-                for row in rows
-            ]
+            rows = await cursor.fetchall()
+            return json_rows_response(cursor, rows)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 # GET debris by ID
 @router.get("/{debris_id}", response_model=SpaceDebrisOut)
-def get_debris_by_id(debris_id: int):
-    with get_db() as connection:
+async def get_debris_by_id(debris_id: int):
+    async with get_db_async() as connection:
         cursor = connection.cursor()
         try:
-            cursor.execute("""
+            await cursor.execute("""
                 SELECT debris_id, description, latitude, longitude, size_meters, risk_level
                 FROM Space_Debris
                 WHERE debris_id = :id
             """, {"id": debris_id})
-            row = cursor.fetchone()
+            row = await cursor.fetchone()
             if row:
                 return {
                     "debris_id": row[0],
@@ -76,13 +136,13 @@ def get_debris_by_id(debris_id: int):
 
 # POST create new debris
 @router.post("/", response_model=SpaceDebrisOut)
-def create_space_debris(debris: SpaceDebrisIn):
+async def create_space_debris(debris: SpaceDebrisIn):
 
-    with get_db() as connection:
+    async with get_db_async() as connection:
         cursor = connection.cursor()
         try:
-            debris_id_var = cursor.var(cx_Oracle.NUMBER)
-            cursor.execute("""
+            debris_id_var = cursor.var(int)
+            await cursor.execute("""
                 INSERT INTO Space_Debris (description, latitude, longitude, size_meters, risk_level)
                 VALUES (:description, :latitude, :longitude, :size_meters, :risk_level)
                 RETURNING debris_id INTO :debris_id
@@ -94,20 +154,21 @@ def create_space_debris(debris: SpaceDebrisIn):
                 "risk_level": debris.risk_level,
                 "debris_id": debris_id_var
             })
-            connection.commit()
+            await connection.commit()
             debris_id = int(debris_id_var.getvalue()[0])
+            debris_index.upsert(_index_record(debris_id, debris.dict()))
             return {**debris.dict(), "debris_id": debris_id}
-        except cx_Oracle.DatabaseError as e:
+        except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
 # PUT update debris
 @router.put("/{debris_id}", response_model=SpaceDebrisOut)
-def update_debris(debris_id: int, debris: SpaceDebrisIn):
-    with get_db() as connection:
+async def update_debris(debris_id: int, debris: SpaceDebrisIn):
+    async with get_db_async() as connection:
         cursor = connection.cursor()
         try:
-            cursor.execute("""
+            await cursor.execute("""
                 UPDATE Space_Debris
                 SET description = :1,
                     latitude = :2,
@@ -125,7 +186,8 @@ def update_debris(debris_id: int, debris: SpaceDebrisIn):
             ))
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Debris not found")
-            connection.commit()
+            await connection.commit()
+            debris_index.upsert(_index_record(debris_id, debris.dict()))
             return {
                 "debris_id": debris_id,
                 **debris.dict()
@@ -135,13 +197,14 @@ def update_debris(debris_id: int, debris: SpaceDebrisIn):
 
 # DELETE debris
 @router.delete("/{debris_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_debris(debris_id: int):
-    with get_db() as connection:
+async def delete_debris(debris_id: int):
+    async with get_db_async() as connection:
         cursor = connection.cursor()
         try:
-            cursor.execute("DELETE FROM Space_Debris WHERE debris_id = :id", {"id": debris_id})
+            await cursor.execute("DELETE FROM Space_Debris WHERE debris_id = :id", {"id": debris_id})
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Debris not found")
-            connection.commit()
+            await connection.commit()
+            debris_index.remove(debris_id)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
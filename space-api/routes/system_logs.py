@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import List
-from database import get_db
+from typing import List, Optional
+from datetime import datetime
+from database import get_db_async
+from pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from serialization import JSONBytesResponse, column_names, rows_to_json
+from services.log_sink import log_record, log_sink
 
 router = APIRouter(prefix="/logs", tags=["System Logs"])
 
@@ -19,57 +23,126 @@ class LogOut(LogCreate):
 
 # CREATE
 @router.post("/", response_model=dict)
-def create_log(log: LogCreate, db=Depends(get_db)):
+async def create_log(log: LogCreate):
     try:
-        with db as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
             log_id = cursor.var(int)
 
-            cursor.execute("""
+            await cursor.execute("""
                 INSERT INTO System_Logs (log_message, log_level)
                 VALUES (:1, :2)
                 RETURNING log_id INTO :3
             """, [log.log_message, log.log_level, log_id])
 
-            conn.commit()
+            await conn.commit()
             return {"message": "Log created successfully", "log_id": log_id.getvalue()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# CREATE (batch, buffered)
+@router.post("/batch", response_model=dict, status_code=202)
+async def create_logs_batch(logs: List[LogCreate]):
+    """
+    Hand many log lines to the in-process log sink; they are written to
+    System_Logs in array inserts shortly after. Log ids are not returned.
+    503 when the sink's buffer is full and its overflow policy is reject.
+    """
+    records = [log_record(log.log_message, log.log_level) for log in logs]
+    accepted, dropped = log_sink.submit(records)
+    if records and not accepted:
+        raise HTTPException(status_code=503, detail="Log buffer is full, retry later",
+                            headers={"Retry-After": "1"})
+    return {"message": "Logs queued", "accepted": accepted, "dropped": dropped}
+
+
 # READ ALL
+LOG_COLUMNS = "log_id, log_message, log_level, log_time"
+
+
+def _log_filters(level, start_time, end_time, q):
+    clauses, binds = [], {}
+    if level:
+        # Levels are stored in mixed case ('ERROR', 'Error'); idx_logs_level_time is on UPPER(log_level)
+        names = [f"level_{i}" for i in range(len(level))]
+        clauses.append(f"UPPER(log_level) IN ({', '.join(':' + name for name in names)})")
+        binds.update({name: value.upper() for name, value in zip(names, level)})
+    if start_time is not None:
+        clauses.append("log_time >= :start_time")
+        binds["start_time"] = start_time
+    if end_time is not None:
+        clauses.append("log_time < :end_time")
+        binds["end_time"] = end_time
+    if q:
+        # Not indexable; applied to rows as they come off the (log_time, log_id) index
+        clauses.append("INSTR(LOWER(log_message), :q) > 0")
+        binds["q"] = q.lower()
+    return clauses, binds
+
+
 @router.get("/", response_model=List[LogOut])
-def get_all_logs(db=Depends(get_db)):
+async def get_all_logs(
+    level: Optional[List[str]] = Query(None),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """
+    One page of logs, newest first, ordered by (log_time, log_id) descending.
+    `level` may be repeated and is matched case-insensitively; `q` is a
+    case-insensitive substring of the message. Pass the X-Next-Cursor response
+    header back as `cursor` to get the next (older) page.
+    """
+    clauses, binds = _log_filters(level, start_time, end_time, q)
+    if cursor:
+        cursor_time, cursor_id = decode_cursor(cursor)
+        clauses.append("(log_time < :cursor_time OR (log_time = :cursor_time AND log_id < :cursor_id))")
+        binds["cursor_time"] = cursor_time
+        binds["cursor_id"] = cursor_id
+    binds["page_size"] = limit
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     try:
-        with db as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT log_id, log_message, log_level, log_time FROM System_Logs ORDER BY log_time DESC")
-            rows = cursor.fetchall()
-
-            result = []
-            for row in rows:
-                result.append({
-                    "log_id": row[0],
-                    "log_message": row[1],
-                    "log_level": row[2],
-                    "log_time": row[3].strftime("%Y-%m-%d %H:%M:%S")
-                })
-            return result
+        async with get_db_async() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.arraysize = limit
+            await db_cursor.execute(f"""
+                SELECT {LOG_COLUMNS}
+                FROM System_Logs
+                {where}
+                ORDER BY log_time DESC, log_id DESC
+                FETCH FIRST :page_size ROWS ONLY
+            """, binds)
+            rows = await db_cursor.fetchall()
+
+            headers = {}
+            if len(rows) == limit:
+                last = rows[-1]
+                headers[NEXT_CURSOR_HEADER] = encode_cursor(last[3], last[0])
+            # The cursor needs the full-precision time; the response keeps the existing format
+            rows = [(log_id, message, log_level, log_time.strftime("%Y-%m-%d %H:%M:%S"))
+                    for log_id, message, log_level, log_time in rows]
+            return JSONBytesResponse(rows_to_json(column_names(db_cursor), rows), headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # READ ONE
 @router.get("/{log_id}", response_model=LogOut)
-def get_log(log_id: int, db=Depends(get_db)):
+async def get_log(log_id: int):
     try:
-        with db as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 SELECT log_id, log_message, log_level, log_time
                 FROM System_Logs WHERE log_id = :1
             """, [log_id])
-            row = cursor.fetchone()
+            row = await cursor.fetchone()
             if row:
                 return {
                     "log_id": row[0],
@@ -85,11 +158,11 @@ def get_log(log_id: int, db=Depends(get_db)):
 
 # UPDATE
 @router.put("/{log_id}", response_model=dict)
-def update_log(log_id: int, log: LogCreate, db=Depends(get_db)):
+async def update_log(log_id: int, log: LogCreate):
     try:
-        with db as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            await cursor.execute("""
                 UPDATE System_Logs
                 SET log_message = :1, log_level = :2
                 WHERE log_id = :3
@@ -98,7 +171,7 @@ def update_log(log_id: int, log: LogCreate, db=Depends(get_db)):
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Log not found")
 
-            conn.commit()
+            await conn.commit()
             return {"message": "Log updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -106,16 +179,16 @@ def update_log(log_id: int, log: LogCreate, db=Depends(get_db)):
 
 # DELETE
 @router.delete("/{log_id}", response_model=dict)
-def delete_log(log_id: int, db=Depends(get_db)):
+async def delete_log(log_id: int):
     try:
-        with db as conn:
+        async with get_db_async() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM System_Logs WHERE log_id = :1", [log_id])
+            await cursor.execute("DELETE FROM System_Logs WHERE log_id = :1", [log_id])
 
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Log not found")
 
-            conn.commit()
+            await conn.commit()
             return {"message": "Log deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,218 @@
+import argparse
+import csv
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from database import DB_POOL_MAX, close_pool, get_db
+
+# Bulk seed loader. Each CSV is streamed in chunks and every chunk is written
+# with one array-bound executemany (batcherrors on, so a bad row is reported
+# instead of aborting the chunk) and one commit. Tables are loaded level by
+# level in foreign-key order; tables on the same level run in parallel, each
+# on its own pooled session.
+#
+#   python seed_database.py
+#   python seed_database.py --chunk-size 20000 --workers 4 --seed-dir /data/seed
+
+BASE_DIR = os.path.dirname(__file__)
+SEED_DIR = os.path.join(BASE_DIR, "seed_data")
+
+SEED_CHUNK_SIZE = int(os.getenv("SEED_CHUNK_SIZE", "10000"))
+# Row errors beyond this many per table are counted but not logged one by one
+MAX_LOGGED_ROW_ERRORS = 100
+
+# (table, columns, file, tables it references). The generated primary key is
+# left out of the column lists: it is loaded as well when the CSV has a column
+# for it (see PRIMARY_KEYS), so rows that other files reference by ID keep it.
+# SQLite moves its AUTOINCREMENT counter past explicit keys; on Oracle, restart
+# the key sequences above the seeded IDs before the API creates rows.
+TABLES = [
+    ("Missions", ["mission_name", "launch_date", "mission_type", "status"], "missions.csv", ()),
+    ("Satellites", ["satellite_name", "launch_date", "orbit_type", "mission_id"], "satellites.csv", ("Missions",)),
+    ("Ground_Stations", ["station_name", "location", "contact_frequency"], "ground_stations.csv", ()),
+    ("Satellite_Tracking", ["satellite_id", "station_id", "timestamp", "latitude", "longitude", "altitude_km"],
+     "satellite_tracking.csv", ("Satellites", "Ground_Stations")),
+    ("Space_Debris", ["description", "latitude", "longitude", "size_meters", "risk_level"], "space_debris.csv", ()),
+    ("Predictions", ["satellite_id", "prediction_date", "status_prediction", "lifespan_months", "collision_risk"],
+     "predictions.csv", ("Satellites",)),
+    ("System_Logs", ["log_message", "log_level", "log_time"], "system_logs.csv", ()),
+]
+
+PRIMARY_KEYS = {
+    "Missions": "mission_id",
+    "Satellites": "satellite_id",
+    "Ground_Stations": "station_id",
+    "Satellite_Tracking": "track_id",
+    "Space_Debris": "debris_id",
+    "Predictions": "prediction_id",
+    "System_Logs": "log_id",
+}
+
+LOG_SQL = "INSERT INTO System_Logs (log_message, log_level, log_time) VALUES (:1, :2, :3)"
+
+
+def log_system_events(connection, events):
+    """
+    Write (message, level) events to the System_Logs table in one round trip
+    """
+    if not events:
+        return
+    try:
+        now = datetime.now()
+        connection.cursor().executemany(LOG_SQL, [(message, level, now) for message, level in events])
+        connection.commit()
+    except Exception as e:
+        print(f"⚠️ Failed to write to System_Logs: {e}")
+
+
+def load_levels(tables):
+    """Group tables into levels; every table's references are in an earlier level."""
+    remaining = {table[0]: table for table in tables}
+    loaded, levels = set(), []
+    while remaining:
+        level = [table for table in remaining.values() if set(table[3]) <= loaded]
+        if not level:
+            raise ValueError(f"Circular or missing table references among: {', '.join(remaining)}")
+        levels.append(level)
+        for table in level:
+            loaded.add(table[0])
+            del remaining[table[0]]
+    return levels
+
+
+def read_header(file_path):
+    """Column names from the CSV's header row; empty for an empty file."""
+    with open(file_path, mode='r', encoding='utf-8', newline='') as f:
+        return [name.strip() for name in next(csv.reader(f), [])]
+
+
+def insert_columns(table_name, columns, header):
+    """The columns to load: the table's primary key first when the CSV provides it."""
+    key = PRIMARY_KEYS.get(table_name)
+    if key in header and key not in columns:
+        return [key, *columns]
+    return list(columns)
+
+
+def read_chunks(file_path, columns, chunk_size):
+    """Yield lists of at most chunk_size row tuples; empty fields become None."""
+    with open(file_path, mode='r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {name.strip(): i for i, name in enumerate(header)}
+        indexes = [positions.get(col) for col in columns]
+        chunk = []
+        for record in reader:
+            if not record:
+                continue
+            chunk.append(tuple(
+                record[i] if i is not None and i < len(record) and record[i] != '' else None
+                for i in indexes
+            ))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def insert_data_from_csv(table_name, columns, file_name, seed_dir=SEED_DIR, chunk_size=SEED_CHUNK_SIZE):
+    """Load one CSV into its table on a pooled session; returns the table's report."""
+    file_path = os.path.join(seed_dir, file_name)
+    report = {"table": table_name, "rows": 0, "errors": 0, "seconds": 0.0, "failed": False}
+    events = []
+    start = time.perf_counter()
+
+    with get_db() as conn:
+        try:
+            columns = insert_columns(table_name, columns, read_header(file_path))
+            placeholders = ", ".join([f":{i+1}" for i in range(len(columns))])
+            sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            cursor = conn.cursor()
+            for chunk in read_chunks(file_path, columns, chunk_size):
+                cursor.executemany(sql, chunk, batcherrors=True)
+                errors = cursor.getbatcherrors()
+                for error in errors:
+                    report["errors"] += 1
+                    if report["errors"] <= MAX_LOGGED_ROW_ERRORS:
+                        error_msg = f"❌ Row insert failed in {table_name}: {chunk[error.offset]} — {error.message}"
+                        print(error_msg)
+                        events.append((error_msg, "ERROR"))
+                conn.commit()
+                report["rows"] += len(chunk) - len(errors)
+        except FileNotFoundError:
+            error_msg = f"🚫 File not found: {file_path}"
+            print(error_msg)
+            events.append((error_msg, "ERROR"))
+            report["failed"] = True
+        except Exception as e:
+            tb = traceback.format_exc()
+            error_msg = f"❌ Unexpected error while seeding {table_name}: {e}\n{tb}"
+            print(error_msg)
+            events.append((error_msg, "ERROR"))
+            report["failed"] = True
+            conn.rollback()
+
+        report["seconds"] = time.perf_counter() - start
+        if report["errors"] > MAX_LOGGED_ROW_ERRORS:
+            events.append((f"{report['errors'] - MAX_LOGGED_ROW_ERRORS} more row errors in {table_name} not logged",
+                           "ERROR"))
+        log_system_events(conn, events)
+    return report
+
+
+def seed_all(seed_dir=SEED_DIR, chunk_size=SEED_CHUNK_SIZE, workers=None):
+    """Seed every table; returns the per-table reports in load order."""
+    levels = load_levels(TABLES)
+    # Each parallel table holds one pooled session for its whole load
+    workers = max(1, min(workers or DB_POOL_MAX, DB_POOL_MAX))
+    reports = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seed") as executor:
+        for level in levels:
+            print(f"📥 Seeding {', '.join(table[0] for table in level)}...")
+            futures = [
+                executor.submit(insert_data_from_csv, table_name, cols, filename, seed_dir, chunk_size)
+                for table_name, cols, filename, _ in level
+            ]
+            reports.extend(future.result() for future in futures)
+    return reports
+
+
+def print_report(reports, elapsed):
+    print(f"{'table':<20}{'rows':>12}{'errors':>9}{'seconds':>10}{'rows/s':>12}")
+    for report in reports:
+        rate = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+        status = "  (failed)" if report["failed"] else ""
+        print(f"{report['table']:<20}{report['rows']:>12}{report['errors']:>9}"
+              f"{report['seconds']:>10.2f}{rate:>12.0f}{status}")
+    total = sum(report["rows"] for report in reports)
+    print(f"{'total':<20}{total:>12}{sum(r['errors'] for r in reports):>9}"
+          f"{elapsed:>10.2f}{total / elapsed if elapsed else 0.0:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load the seed CSVs into the database.")
+    parser.add_argument("--seed-dir", default=SEED_DIR)
+    parser.add_argument("--chunk-size", type=int, default=SEED_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Tables loaded in parallel per level (at most ORACLE_POOL_MAX={DB_POOL_MAX})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        reports = seed_all(args.seed_dir, args.chunk_size, args.workers)
+    finally:
+        close_pool()
+    print_report(reports, time.perf_counter() - start)
+    print("✅ Database seeding complete.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print("❗ A critical error occurred:", e)
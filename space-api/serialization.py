@@ -0,0 +1,51 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # falls back to the (slower) stdlib encoder
+    orjson = None
+
+# Bulk JSON encoding for list endpoints. Cursor rows are zipped with the
+# column names and encoded in one call, skipping the per-row pydantic models
+# and the response_model re-validation FastAPI would otherwise do.
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    """Encode to JSON bytes (orjson when available; datetimes as ISO 8601, Decimals as floats)."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+def column_names(cursor):
+    """Lower-cased result column names, to be used as JSON keys."""
+    return [column[0].lower() for column in cursor.description]
+
+
+def rows_to_dicts(columns, rows):
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def rows_to_json(columns, rows):
+    return dumps(rows_to_dicts(columns, rows))
+
+
+class JSONBytesResponse(Response):
+    """A response whose body is already-encoded JSON."""
+    media_type = "application/json"
+
+
+def json_rows_response(cursor, rows, headers=None):
+    """Encode fetched rows as a JSON array of objects keyed by the cursor's column names."""
+    return JSONBytesResponse(rows_to_json(column_names(cursor), rows), headers=headers)
@@ -0,0 +1,158 @@
+import argparse
+import time
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # exports are optional; the rest of the API runs without pyarrow
+    pa = pq = None
+
+# Columnar exports of tracking fixes and predictions. Query results are read
+# with fetchmany and turned straight into Arrow record batches column by column
+# (no per-row dicts or models), then either streamed as Arrow IPC or written
+# to Parquet. Memory stays bounded by one batch whatever the export size.
+
+EXPORT_BATCH_SIZE = 50000
+FORMATS = ("arrow", "parquet")
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Arrow IPC end-of-stream marker: continuation token followed by a zero length
+_END_OF_STREAM = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+# name -> (table, time column, columns with their Arrow types)
+SOURCES = {
+    "tracking": ("Satellite_Tracking", "timestamp", [
+        ("track_id", "int64"),
+        ("satellite_id", "int64"),
+        ("station_id", "int64"),
+        ("timestamp", "timestamp"),
+        ("latitude", "float64"),
+        ("longitude", "float64"),
+        ("altitude_km", "float64"),
+    ]),
+    "predictions": ("Predictions", "prediction_date", [
+        ("prediction_id", "int64"),
+        ("satellite_id", "int64"),
+        ("prediction_date", "timestamp"),
+        ("status_prediction", "string"),
+        ("lifespan_months", "int64"),
+        ("collision_risk", "string"),
+    ]),
+}
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("pyarrow is not installed; columnar exports are unavailable")
+
+
+def schema(source):
+    require_pyarrow()
+    types = {"int64": pa.int64(), "float64": pa.float64(), "string": pa.string(), "timestamp": pa.timestamp("us")}
+    return pa.schema([(name, types[kind]) for name, kind in SOURCES[source][2]])
+
+
+def export_query(source, satellite_id=None, start_time=None, end_time=None, station_id=None):
+    """SELECT statement and binds for one export, ordered by time then id."""
+    table, time_column, columns = SOURCES[source]
+    clauses, binds = [], {}
+    if satellite_id is not None:
+        clauses.append("satellite_id = :satellite_id")
+        binds["satellite_id"] = satellite_id
+    if station_id is not None:
+        if source != "tracking":
+            raise ValueError("station_id only applies to tracking exports")
+        clauses.append("station_id = :station_id")
+        binds["station_id"] = station_id
+    if start_time is not None:
+        clauses.append(f"{time_column} >= :start_time")
+        binds["start_time"] = start_time
+    if end_time is not None:
+        clauses.append(f"{time_column} < :end_time")
+        binds["end_time"] = end_time
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"""
+        SELECT {', '.join(name for name, _ in columns)}
+        FROM {table}
+        {where}
+        ORDER BY {time_column}, {columns[0][0]}
+    """
+    return sql, binds
+
+
+def record_batches(connection, source, batch_size=EXPORT_BATCH_SIZE, **filters):
+    """Yield Arrow record batches of at most batch_size rows for one export."""
+    arrow_schema = schema(source)
+    sql, binds = export_query(source, **filters)
+    cursor = connection.cursor()
+    cursor.arraysize = batch_size
+    cursor.execute(sql, binds)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*rows), arrow_schema)],
+            schema=arrow_schema
+        )
+
+
+def ipc_stream(batches, arrow_schema):
+    """Encode record batches as an Arrow IPC stream, one chunk of bytes per batch."""
+    yield arrow_schema.serialize().to_pybytes()
+    for batch in batches:
+        yield batch.serialize().to_pybytes()
+    yield _END_OF_STREAM
+
+
+def write_parquet(path, batches, arrow_schema, compression="zstd"):
+    """Write record batches to a Parquet file (one row group per batch); returns the row count."""
+    require_pyarrow()
+    rows = 0
+    with pq.ParquetWriter(path, arrow_schema, compression=compression) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+# ------------------- CLI -------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Export tracking fixes or predictions as Arrow IPC or Parquet.")
+    parser.add_argument("source", choices=sorted(SOURCES))
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--satellite-id", type=int)
+    parser.add_argument("--station-id", type=int)
+    parser.add_argument("--start-time", type=datetime.fromisoformat)
+    parser.add_argument("--end-time", type=datetime.fromisoformat)
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+    require_pyarrow()
+
+    from database import get_db
+
+    filters = {"satellite_id": args.satellite_id, "start_time": args.start_time, "end_time": args.end_time}
+    if args.station_id is not None:
+        filters["station_id"] = args.station_id
+    arrow_schema = schema(args.source)
+
+    start = time.perf_counter()
+    with get_db() as connection:
+        batches = record_batches(connection, args.source, args.batch_size, **filters)
+        if args.format == "parquet":
+            rows = write_parquet(args.output, batches, arrow_schema)
+        else:
+            rows = 0
+            with pa.OSFile(args.output, "wb") as sink, pa.ipc.new_stream(sink, arrow_schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+    print(f"Exported {rows} {args.source} rows to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import csv
+import time
+import numpy as np
+from services.spatial_index import EARTH_RADIUS_KM, haversine_km
+
+# Conjunction screening between the latest tracked satellite positions and the
+# debris catalog. Debris is sorted by latitude once; each satellite only
+# compares against the latitude band that can lie within the threshold
+# (sweep-and-prune), and the surviving pairs are measured with vectorized
+# NumPy in bounded-size chunks.
+
+LATEST_FIXES_SQL = """
+    SELECT satellite_id, timestamp, latitude, longitude, altitude_km
+    FROM (
+        SELECT t.satellite_id, t.timestamp, t.latitude, t.longitude, t.altitude_km,
+               ROW_NUMBER() OVER (PARTITION BY t.satellite_id ORDER BY t.timestamp DESC, t.track_id DESC) AS rn
+        FROM Satellite_Tracking t
+    )
+    WHERE rn = 1
+"""
+
+DEBRIS_POSITIONS_SQL = "SELECT debris_id, latitude, longitude FROM Space_Debris"
+
+METRICS = ("great_circle", "3d")
+MAX_PAIRS_PER_CHUNK = 2_000_000
+
+
+def _ecef_km(lat, lon, alt_km):
+    lat, lon = np.radians(lat), np.radians(lon)
+    r = EARTH_RADIUS_KM + alt_km
+    return np.stack([r * np.cos(lat) * np.cos(lon), r * np.cos(lat) * np.sin(lon), r * np.sin(lat)], axis=-1)
+
+
+def _max_angle_deg(threshold_km, metric, sat_alt, debris_alt):
+    """Largest central angle at which a pair can still be within threshold_km."""
+    if metric == "great_circle":
+        return np.full(sat_alt.shape, np.degrees(threshold_km / EARTH_RADIUS_KM))
+    # |p1 - p2| >= 2 * sqrt(r1 * r2) * sin(angle / 2) for points at radii r1, r2
+    ratio = threshold_km / (2 * np.sqrt((EARTH_RADIUS_KM + sat_alt) * (EARTH_RADIUS_KM + debris_alt)))
+    return np.degrees(2 * np.arcsin(np.clip(ratio, 0.0, 1.0)))
+
+
+def screen(sat_ids, sat_lat, sat_lon, sat_alt, debris_ids, debris_lat, debris_lon,
+           threshold_km, metric="great_circle", debris_altitude_km=0.0, max_pairs=MAX_PAIRS_PER_CHUNK):
+    """
+    Return (satellite_ids, debris_ids, distances_km) for every pair closer than
+    threshold_km, sorted by distance.
+
+    metric="great_circle" compares sub-satellite points on the Earth's surface.
+    metric="3d" measures straight-line distance, placing debris at debris_altitude_km
+    (the catalog stores no debris altitude).
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}")
+    sat_ids, sat_lat, sat_lon, sat_alt = (np.asarray(a) for a in (sat_ids, sat_lat, sat_lon, sat_alt))
+    debris_ids, debris_lat, debris_lon = (np.asarray(a) for a in (debris_ids, debris_lat, debris_lon))
+    sat_lat, sat_lon, sat_alt = (a.astype(np.float64) for a in (sat_lat, sat_lon, sat_alt))
+    empty = (sat_ids[:0], debris_ids[:0], np.empty(0))
+    if len(sat_ids) == 0 or len(debris_ids) == 0:
+        return empty
+
+    order = np.argsort(debris_lat, kind="stable")
+    d_ids, d_lat, d_lon = debris_ids[order], debris_lat[order].astype(np.float64), debris_lon[order].astype(np.float64)
+    d_xyz = _ecef_km(d_lat, d_lon, debris_altitude_km) if metric == "3d" else None
+
+    # Sweep: the latitude band [lat - angle, lat + angle] bounds every possible match
+    band = _max_angle_deg(threshold_km, metric, sat_alt, debris_altitude_km)
+    lo = np.searchsorted(d_lat, sat_lat - band, side="left")
+    hi = np.searchsorted(d_lat, sat_lat + band, side="right")
+    counts = hi - lo
+    # Longitude half-width of the search circle, asin(sin(angle) / cos(lat));
+    # unbounded when the circle contains a pole. Padded slightly against rounding.
+    sin_ratio = np.sin(np.radians(band)) / np.maximum(np.cos(np.radians(sat_lat)), 1e-12)
+    lon_band = np.where(sin_ratio < 1.0, np.degrees(np.arcsin(np.minimum(sin_ratio, 1.0))) * (1 + 1e-9) + 1e-9, 180.0)
+    cumulative = np.cumsum(counts)
+
+    found_sat, found_debris, found_dist = [], [], []
+    start = 0
+    while start < len(sat_ids):
+        # Take as many satellites as fit in max_pairs candidate pairs (at least one)
+        base = cumulative[start - 1] if start else 0
+        stop = max(int(np.searchsorted(cumulative, base + max_pairs, side="right")), start + 1)
+        chunk_counts = counts[start:stop]
+        total = int(chunk_counts.sum())
+        if total:
+            sat_idx = np.repeat(np.arange(start, stop), chunk_counts)
+            offsets = np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+            deb_idx = np.repeat(lo[start:stop], chunk_counts) + (np.arange(total) - offsets)
+
+            # Prune: cheap longitude test before any trigonometry on the pair
+            dlon = np.abs((sat_lon[sat_idx] - d_lon[deb_idx] + 180.0) % 360.0 - 180.0)
+            keep = dlon <= lon_band[sat_idx]
+            sat_idx, deb_idx = sat_idx[keep], deb_idx[keep]
+
+            if metric == "great_circle":
+                dist = haversine_km(sat_lat[sat_idx], sat_lon[sat_idx], d_lat[deb_idx], d_lon[deb_idx])
+            else:
+                s_xyz = _ecef_km(sat_lat[sat_idx], sat_lon[sat_idx], sat_alt[sat_idx])
+                dist = np.linalg.norm(s_xyz - d_xyz[deb_idx], axis=1)
+            hit = dist <= threshold_km
+            found_sat.append(sat_ids[sat_idx[hit]])
+            found_debris.append(d_ids[deb_idx[hit]])
+            found_dist.append(dist[hit])
+        start = stop
+
+    if not found_dist:
+        return empty
+    sats, debris, dist = np.concatenate(found_sat), np.concatenate(found_debris), np.concatenate(found_dist)
+    by_distance = np.argsort(dist, kind="stable")
+    return sats[by_distance], debris[by_distance], dist[by_distance]
+
+
+# ------------------- Loading -------------------
+
+def load_latest_fixes(connection):
+    """Latest fix per satellite as arrays: ids, times, lat, lon, altitude_km."""
+    cursor = connection.cursor()
+    cursor.arraysize = 10000
+    cursor.execute(LATEST_FIXES_SQL)
+    rows = cursor.fetchall()
+    ids, times, lat, lon, alt = zip(*rows) if rows else ((), (), (), (), ())
+    return (np.array(ids, dtype=np.int64), list(times),
+            np.array(lat, dtype=np.float64), np.array(lon, dtype=np.float64), np.array(alt, dtype=np.float64))
+
+
+def load_debris_positions(connection):
+    cursor = connection.cursor()
+    cursor.arraysize = 10000
+    cursor.execute(DEBRIS_POSITIONS_SQL)
+    rows = cursor.fetchall()
+    ids, lat, lon = zip(*rows) if rows else ((), (), ())
+    return np.array(ids, dtype=np.int64), np.array(lat, dtype=np.float64), np.array(lon, dtype=np.float64)
+
+
+# ------------------- Batch job -------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen tracked satellites against the debris catalog.")
+    parser.add_argument("--threshold-km", type=float, default=10.0)
+    parser.add_argument("--metric", choices=METRICS, default="great_circle")
+    parser.add_argument("--debris-altitude-km", type=float, default=0.0,
+                        help="Assumed debris altitude for the 3d metric")
+    parser.add_argument("--output", default="conjunctions.csv")
+    args = parser.parse_args()
+
+    from database import get_db
+
+    start = time.perf_counter()
+    with get_db() as connection:
+        sat_ids, fix_times, sat_lat, sat_lon, sat_alt = load_latest_fixes(connection)
+        debris_ids, debris_lat, debris_lon = load_debris_positions(connection)
+    loaded = time.perf_counter()
+
+    sats, debris, dist = screen(sat_ids, sat_lat, sat_lon, sat_alt, debris_ids, debris_lat, debris_lon,
+                                args.threshold_km, args.metric, args.debris_altitude_km)
+    screened = time.perf_counter()
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["satellite_id", "debris_id", "distance_km"])
+        writer.writerows(zip(sats.tolist(), debris.tolist(), np.round(dist, 3).tolist()))
+
+    print(f"Loaded {len(sat_ids)} satellites and {len(debris_ids)} debris objects in {loaded - start:.2f}s")
+    print(f"Found {len(dist)} conjunctions under {args.threshold_km} km in {screened - loaded:.2f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+
+# Downsampling of time series to a target point count for plotting.
+# Both functions take sample times x (ascending) and values y, and return the
+# indices of the samples to keep, so callers can slice every column at once.
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: keeps the first and last samples and, from
+    each of n_out - 2 equal-count buckets, the sample forming the largest
+    triangle with the previously kept sample and the next bucket's average.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.intp)
+
+    # Shift times to start at zero so the prefix sums below stay precise
+    x = x - x[0]
+
+    # Bucket edges over the interior samples 1 .. n-2
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    # Per-bucket averages via prefix sums (the "third point" of each triangle)
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    next_lo = np.append(edges[1:-1], n - 1)
+    next_hi = np.append(edges[2:], n)
+    avg_x = (cx[next_hi] - cx[next_lo]) / (next_hi - next_lo)
+    avg_y = (cy[next_hi] - cy[next_lo]) / (next_hi - next_lo)
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if hi <= lo:
+            hi = lo + 1
+        bx, by = x[lo:hi], y[lo:hi]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[prev] - avg_x[bucket]) * (by - y[prev]) - (x[prev] - bx) * (avg_y[bucket] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        selected[bucket + 1] = prev
+    return selected
+
+
+def minmax(x, y, n_out):
+    """
+    Time-bucket min/max: splits [x[0], x[-1]] into n_out // 2 equal-width
+    buckets and keeps the minimum and maximum sample of each (in time order).
+    Fully vectorized.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+
+    span = x[-1] - x[0]
+    if span > 0:
+        bucket = np.minimum(((x - x[0]) / span * n_buckets).astype(np.intp), n_buckets - 1)
+    else:
+        bucket = np.minimum(np.arange(n) * n_buckets // n, n_buckets - 1)
+
+    # x is ascending, so every bucket is a contiguous run of samples
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    keep = [_first_match(y, np.repeat(reduce.reduceat(y, starts), counts), bucket)
+            for reduce in (np.minimum, np.maximum)]
+    return np.unique(np.concatenate(keep))
+
+
+def _first_match(y, target, bucket):
+    """Index of the first sample in each bucket whose value equals that bucket's target."""
+    hits = np.flatnonzero(y == target)
+    _, first = np.unique(bucket[hits], return_index=True)
+    return hits[first]
+
+
+def downsample(x, y, n_out, method="lttb"):
+    if method == "lttb":
+        return lttb(x, y, n_out)
+    if method == "minmax":
+        return minmax(x, y, n_out)
+    raise ValueError(f"method must be one of {METHODS}")
@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from database import get_db
+
+# Buffered writer for System_Logs. Records go into a bounded in-memory ring
+# buffer; a background thread flushes them with one array insert per batch,
+# as soon as batch_size records are waiting or every flush_seconds. Each
+# record keeps the time it was logged, not the time it was flushed.
+#
+# When the buffer is full the overflow policy decides what gives:
+#   drop_oldest - the oldest buffered records are overwritten (counted as dropped)
+#   reject      - new records are refused (counted as rejected) so callers can back off
+
+LOG_SINK_BUFFER_SIZE = int(os.getenv("LOG_SINK_BUFFER_SIZE", "50000"))
+LOG_SINK_BATCH_SIZE = int(os.getenv("LOG_SINK_BATCH_SIZE", "1000"))
+LOG_SINK_FLUSH_SECONDS = float(os.getenv("LOG_SINK_FLUSH_SECONDS", "1.0"))
+LOG_SINK_OVERFLOW = os.getenv("LOG_SINK_OVERFLOW", "drop_oldest")
+
+OVERFLOW_POLICIES = ("drop_oldest", "reject")
+
+INSERT_LOG_SQL = "INSERT INTO System_Logs (log_message, log_level, log_time) VALUES (:1, :2, :3)"
+
+
+def log_record(message, level="INFO", log_time=None):
+    return (message, level, log_time or datetime.now())
+
+
+class LogSink:
+    def __init__(self, buffer_size=LOG_SINK_BUFFER_SIZE, batch_size=LOG_SINK_BATCH_SIZE,
+                 flush_seconds=LOG_SINK_FLUSH_SECONDS, overflow=LOG_SINK_OVERFLOW):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.overflow = overflow
+        self._buffer = deque(maxlen=buffer_size)
+        self._ready = threading.Condition()
+        self._stop = False
+        self._thread = None
+        self.stats = {"accepted": 0, "written": 0, "failed": 0, "dropped": 0, "rejected": 0, "batches": 0,
+                      "high_water": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the worker after flushing everything already buffered."""
+        if self._thread is not None:
+            with self._ready:
+                self._stop = True
+                self._ready.notify()
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, records):
+        """
+        Buffer (message, level, log_time) records. Returns (accepted, dropped):
+        under drop_oldest every record is accepted and `dropped` older ones
+        are overwritten; under reject nothing is accepted when they do not fit.
+        """
+        with self._ready:
+            free = self.buffer_size - len(self._buffer)
+            dropped = 0
+            if len(records) > free:
+                if self.overflow == "reject":
+                    self.stats["rejected"] += len(records)
+                    return 0, 0
+                # A batch larger than the whole buffer also loses its own first records
+                dropped = len(records) - free
+                self.stats["dropped"] += dropped
+            self._buffer.extend(records)
+            self.stats["accepted"] += len(records)
+            self.stats["high_water"] = max(self.stats["high_water"], len(self._buffer))
+            if len(self._buffer) >= self.batch_size:
+                self._ready.notify()
+        return len(records), dropped
+
+    def log(self, message, level="INFO"):
+        return self.submit([log_record(message, level)])[0] == 1
+
+    def get_stats(self):
+        with self._ready:
+            return {
+                **self.stats,
+                "pending": len(self._buffer),
+                "buffer_size": self.buffer_size,
+                "overflow": self.overflow,
+                "running": self._thread is not None,
+            }
+
+    def _take(self):
+        batch = []
+        while self._buffer and len(batch) < self.batch_size:
+            batch.append(self._buffer.popleft())
+        return batch
+
+    def _flush(self, batch):
+        try:
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(INSERT_LOG_SQL, batch, batcherrors=True)
+                failed = len(cursor.getbatcherrors())
+                conn.commit()
+        except Exception as e:
+            print(f"⚠️ Failed to flush {len(batch)} log records: {e}")
+            failed = len(batch)
+        with self._ready:
+            self.stats["written"] += len(batch) - failed
+            self.stats["failed"] += failed
+            self.stats["batches"] += 1
+
+    def _run(self):
+        while True:
+            with self._ready:
+                deadline = time.monotonic() + self.flush_seconds
+                while not self._stop and len(self._buffer) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+                stopping = self._stop
+                batch = self._take()
+            if batch:
+                self._flush(batch)
+            if stopping:
+                # Final flush on shutdown
+                while True:
+                    with self._ready:
+                        batch = self._take()
+                    if not batch:
+                        return
+                    self._flush(batch)
+
+
+log_sink = LogSink()
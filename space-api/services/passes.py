@@ -0,0 +1,245 @@
+import math
+import os
+import re
+import threading
+import time
+import numpy as np
+from services.conjunction import _ecef_km
+from services.propagation import from_seconds, to_seconds, track_store
+
+# Ground station pass prediction. Station locations are parsed once, the
+# fleet's positions (interpolated from tracking fixes) are sampled on a fixed
+# time grid over a rolling horizon, and every interval in which a satellite
+# stays above a station's elevation mask is stored as a pass window. Windows
+# are kept per station sorted by start time, so "next passes for station N"
+# is a binary search instead of a recomputation.
+
+MIN_ELEVATION_DEG = float(os.getenv("PASS_MIN_ELEVATION_DEG", "10"))
+STEP_SECONDS = float(os.getenv("PASS_STEP_SECONDS", "30"))
+LOOKBACK_HOURS = float(os.getenv("PASS_LOOKBACK_HOURS", "24"))
+HORIZON_HOURS = float(os.getenv("PASS_HORIZON_HOURS", "24"))
+REFRESH_SECONDS = float(os.getenv("PASS_REFRESH_SECONDS", "600"))
+MAX_PAIRS_PER_CHUNK = 500_000
+
+STATIONS_SQL = "SELECT station_id, location FROM Ground_Stations"
+
+_COORDINATE = re.compile(r"([-+]?\d+(?:\.\d+)?)\s*°?\s*([NSEW])?", re.IGNORECASE)
+
+
+def parse_location(location):
+    """
+    Station coordinates from a location string, or None when it holds none.
+    Accepts "lat, lon" in signed decimal degrees or with hemisphere letters
+    ("28.57N 80.65W"), optionally followed by an elevation in metres.
+    """
+    if not location:
+        return None
+    values = []
+    for number, hemisphere in _COORDINATE.findall(location):
+        value = float(number)
+        if hemisphere and hemisphere.upper() in "SW":
+            value = -abs(value)
+        values.append(value)
+    if len(values) < 2:
+        return None
+    lat, lon = values[0], values[1]
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    elevation_m = values[2] if len(values) > 2 else 0.0
+    return lat, lon, elevation_m / 1000.0
+
+
+def elevation_deg(station, sat_xyz):
+    """Elevation of points sat_xyz (..., 3) above the horizon of a station (lat, lon, alt_km)."""
+    station_xyz = _ecef_km(*station)
+    up = station_xyz / np.linalg.norm(station_xyz)
+    rel = sat_xyz - station_xyz
+    with np.errstate(invalid="ignore"):
+        return np.degrees(np.arcsin(np.clip((rel @ up) / np.linalg.norm(rel, axis=-1), -1.0, 1.0)))
+
+
+def find_windows(seconds, elevation, min_elevation_deg):
+    """
+    Visibility windows in an (n_satellites, n_times) elevation grid.
+    Returns (row, start_seconds, end_seconds, max_elevation) arrays, with edges
+    interpolated to where the elevation crosses the mask between two samples.
+    """
+    above = elevation >= min_elevation_deg  # NaN (no position) counts as not visible
+    padded = np.zeros((above.shape[0], above.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = above
+    edges = np.diff(padded, axis=1)
+    rows, first = np.nonzero(edges == 1)    # first visible sample
+    _, stop = np.nonzero(edges == -1)       # one past the last visible sample
+    if not len(rows):
+        empty = np.empty(0)
+        return rows, empty, empty, empty
+
+    n_times = len(seconds)
+    flat = np.where(above, elevation, -np.inf).ravel()
+    bounds = np.column_stack([rows * n_times + first, rows * n_times + stop]).ravel()
+    peak = np.maximum.reduceat(np.append(flat, -np.inf), bounds)[::2]
+
+    def crossing(inside, outside):
+        # Linear interpolation of the mask crossing between a visible and a hidden sample
+        e_in, e_out = elevation[rows, inside], elevation[rows, outside]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = (e_in - min_elevation_deg) / (e_in - e_out)
+        frac = np.where(np.isfinite(frac), np.clip(frac, 0.0, 1.0), 0.0)
+        return seconds[inside] + frac * (seconds[outside] - seconds[inside])
+
+    has_before = first > 0
+    has_after = stop < n_times
+    start = seconds[first].copy()
+    end = seconds[stop - 1].copy()
+    start[has_before] = crossing(first, np.maximum(first - 1, 0))[has_before]
+    end[has_after] = crossing(stop - 1, np.minimum(stop, n_times - 1))[has_after]
+    return rows, start, end, peak
+
+
+class StationPasses:
+    """One station's windows, sorted by start time."""
+
+    def __init__(self, satellite_ids, start, end, max_elevation):
+        order = np.argsort(start, kind="stable")
+        self.satellite_ids = satellite_ids[order]
+        self.start = start[order]
+        self.end = end[order]
+        self.max_elevation = max_elevation[order]
+        self.max_duration = float((self.end - self.start).max()) if len(order) else 0.0
+
+    def __len__(self):
+        return len(self.start)
+
+    def after(self, t, limit, satellite_id=None, min_elevation_deg=None):
+        """Windows still open at or starting after t (epoch seconds), earliest start first."""
+        # A window ending after t starts no earlier than t - max_duration
+        i = int(np.searchsorted(self.start, t - self.max_duration, side="left"))
+        keep = self.end[i:] >= t
+        if satellite_id is not None:
+            keep &= self.satellite_ids[i:] == satellite_id
+        if min_elevation_deg is not None:
+            keep &= self.max_elevation[i:] >= min_elevation_deg
+        idx = i + np.flatnonzero(keep)[:limit]
+        return self.satellite_ids[idx], self.start[idx], self.end[idx], self.max_elevation[idx]
+
+
+class PassCache:
+    def __init__(self, min_elevation_deg=MIN_ELEVATION_DEG, step_seconds=STEP_SECONDS,
+                 lookback_hours=LOOKBACK_HOURS, horizon_hours=HORIZON_HOURS, refresh_seconds=REFRESH_SECONDS):
+        self.min_elevation_deg = min_elevation_deg
+        self.step_seconds = step_seconds
+        self.lookback_hours = lookback_hours
+        self.horizon_hours = horizon_hours
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._locations = {}   # station_id -> (location string, parsed coordinates or None)
+        self._passes = {}      # station_id -> StationPasses
+        self.computed_at = None
+        self.horizon = None
+        self.compute_seconds = None
+
+    def invalidate(self):
+        with self._lock:
+            self.computed_at = None
+
+    def is_stale(self):
+        return self.computed_at is None or time.time() - self.computed_at >= self.refresh_seconds
+
+    def station(self, station_id):
+        """Parsed coordinates of a known station (None if its location holds none), or KeyError."""
+        return self._locations[station_id][1]
+
+    def set_stations(self, rows):
+        """(station_id, location) rows; a location is only re-parsed when it changed."""
+        with self._lock:
+            locations = {}
+            for station_id, location in rows:
+                previous = self._locations.get(station_id)
+                if previous is not None and previous[0] == location:
+                    locations[station_id] = previous
+                else:
+                    locations[station_id] = (location, parse_location(location))
+            self._locations = locations
+
+    def refresh(self, now=None):
+        """Recompute every station's windows over [now - lookback, now + horizon]."""
+        with self._lock:
+            started = time.perf_counter()
+            now = time.time() if now is None else now
+            begin = math.floor((now - self.lookback_hours * 3600) / self.step_seconds) * self.step_seconds
+            seconds = begin + np.arange(
+                int((self.lookback_hours + self.horizon_hours) * 3600 // self.step_seconds) + 1
+            ) * self.step_seconds
+
+            stations = {sid: coords for sid, (_, coords) in self._locations.items() if coords is not None}
+            found = {sid: ([], [], [], []) for sid in stations}
+            # Chunks are taken by id from one snapshot: fixes arriving mid-refresh
+            # can add satellites and shift ranks, but not reattribute a chunk
+            satellite_ids = track_store.snapshot_ids()
+            chunk = max(MAX_PAIRS_PER_CHUNK // len(seconds), 1)
+            for first in range(0, len(satellite_ids), chunk):
+                chunk_ids = satellite_ids[first:first + chunk]
+                lat, lon, alt, _ = track_store.grid_at(seconds, chunk_ids)
+                sat_xyz = _ecef_km(lat, lon, alt)
+                for sid, coords in stations.items():
+                    rows, start, end, peak = find_windows(seconds, elevation_deg(coords, sat_xyz), self.min_elevation_deg)
+                    for bucket, values in zip(found[sid], (chunk_ids[rows], start, end, peak)):
+                        bucket.append(values)
+
+            self._passes = {
+                sid: StationPasses(*(np.concatenate(values) if values else np.empty(0) for values in columns))
+                for sid, columns in found.items()
+            }
+            self.horizon = (float(seconds[0]), float(seconds[-1]))
+            self.computed_at = now
+            self.compute_seconds = time.perf_counter() - started
+
+    def ensure_fresh(self, load_stations, now=None):
+        """Reload stations and recompute windows if the cache is older than refresh_seconds."""
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.set_stations(load_stations())
+                    self.refresh(now)
+
+    def next_passes(self, station_id, after, limit=20, satellite_id=None, min_elevation_deg=None):
+        """Upcoming (or in-progress) windows for one station as dicts."""
+        with self._lock:
+            passes = self._passes.get(station_id)
+        if passes is None:
+            return []
+        ids, start, end, peak = passes.after(to_seconds(after)[0], limit, satellite_id, min_elevation_deg)
+        return [
+            {
+                "satellite_id": sat,
+                "start_time": s,
+                "end_time": e,
+                "duration_seconds": round(d, 1),
+                "max_elevation_deg": round(p, 2),
+            }
+            for sat, s, e, d, p in zip(
+                ids.tolist(), from_seconds(start), from_seconds(end), (end - start).tolist(), peak.tolist()
+            )
+        ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "stations": len(self._locations),
+                "unresolved_stations": sorted(sid for sid, (_, coords) in self._locations.items() if coords is None),
+                "windows": sum(len(p) for p in self._passes.values()),
+                "computed_at": from_seconds(self.computed_at) if self.computed_at is not None else None,
+                "horizon": [from_seconds(t) for t in self.horizon] if self.horizon else None,
+                "compute_seconds": self.compute_seconds,
+                "min_elevation_deg": self.min_elevation_deg,
+                "step_seconds": self.step_seconds,
+            }
+
+
+def load_stations(connection):
+    cursor = connection.cursor()
+    cursor.execute(STATIONS_SQL)
+    return cursor.fetchall()
+
+
+pass_cache = PassCache()
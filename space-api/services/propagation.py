@@ -0,0 +1,359 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+# In-memory store of every satellite's tracking fixes, held as flat sorted
+# arrays, answering "where is satellite X at time t" by vectorized linear
+# interpolation between fixes, plus short-horizon linear extrapolation past
+# the last fix. One call can evaluate the whole fleet at an instant, or one
+# satellite at many instants.
+
+MAX_EXTRAPOLATION_SECONDS = float(os.getenv("TRACK_MAX_EXTRAPOLATION_SECONDS", "600"))
+# Reload from the database once the store is this old, picking up fixes other workers wrote
+REFRESH_SECONDS = float(os.getenv("TRACK_REFRESH_SECONDS", "300"))
+# Room left past the newest fix in the composite key, and free slots kept after
+# each satellite's fixes (at least TAIL_SLOTS, or an eighth of its fixes), so
+# live ingest is appended in place instead of rebuilding the columns
+KEY_HEADROOM_SECONDS = 86400.0
+TAIL_SLOTS = 16
+
+UNAVAILABLE, INTERPOLATED, EXTRAPOLATED = 0, 1, 2
+MODE_NAMES = {INTERPOLATED: "interpolated", EXTRAPOLATED: "extrapolated"}
+
+_EPOCH = np.datetime64("1970-01-01T00:00:00", "us")
+
+
+def _naive_utc(t):
+    return t.astimezone(timezone.utc).replace(tzinfo=None) if isinstance(t, datetime) and t.tzinfo else t
+
+
+def to_seconds(times):
+    """
+    Datetimes (naive ones are taken as UTC) or datetime64 values to float epoch
+    seconds; numeric arrays are taken to be epoch seconds already.
+    """
+    if isinstance(times, np.ndarray) and times.dtype.kind in "iuf":
+        return times.astype(np.float64)
+    if isinstance(times, datetime):
+        times = [times]
+    if not isinstance(times, np.ndarray):
+        times = [_naive_utc(t) for t in times]
+    return (np.asarray(times, dtype="datetime64[us]") - _EPOCH).astype(np.int64) / 1e6
+
+
+def from_seconds(seconds):
+    return (_EPOCH + (np.asarray(seconds) * 1e6).astype(np.int64).astype("timedelta64[us]")).tolist()
+
+
+def _wrap_longitude(lon):
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+class TrackStore:
+    def __init__(self, max_extrapolation_seconds=MAX_EXTRAPOLATION_SECONDS, refresh_seconds=REFRESH_SECONDS):
+        self.max_extrapolation_seconds = max_extrapolation_seconds
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        # Held for the whole of a load, so concurrent first requests load once
+        self._load_lock = threading.Lock()
+        self._pending = []
+        self._added_while_loading = None
+        self._generation = 0
+        self.loaded = False
+        self.loaded_at = None
+        self._set_columns(np.empty(0, np.int64), np.empty(0), np.empty(0), np.empty(0), np.empty(0))
+
+    # ------------------- Building -------------------
+
+    def _set_columns(self, sat_ids, seconds, lat, lon, alt):
+        order = np.lexsort((seconds, sat_ids))
+        self.satellite_ids, counts = np.unique(sat_ids[order], return_counts=True)
+        self._lay_out(counts, seconds[order], lat[order], lon[order], alt[order])
+
+    def _lay_out(self, counts, seconds, lat, lon, alt):
+        """
+        Store fixes sorted by (satellite, time), `counts` of them per satellite,
+        each satellite's fixes followed by free slots that new fixes are appended to.
+        """
+        capacity = counts + np.maximum(TAIL_SLOTS, counts // 8)
+        self._offsets = np.concatenate(([0], np.cumsum(capacity))).astype(np.intp)
+        self._counts = counts.astype(np.intp)
+        slots = self._slots()
+        n_slots = int(self._offsets[-1])
+        self._seconds, self._lat, self._lon, self._alt = (np.zeros(n_slots) for _ in range(4))
+        self._seconds[slots], self._lat[slots], self._lon[slots], self._alt[slots] = seconds, lat, lon, alt
+
+        # Composite key (satellite rank, time) lets one searchsorted serve every
+        # satellite. Free slots key just past the satellite's last possible query
+        # key, and the span leaves room past the newest fix, so appended fixes
+        # keep every key valid.
+        self._t0 = float(seconds.min()) if len(seconds) else 0.0
+        used = (float(seconds.max()) - self._t0) if len(seconds) else 0.0
+        self._span = used + 2.0 + max(KEY_HEADROOM_SECONDS, used / 4)
+        rank_base = np.arange(len(counts)) * self._span
+        self._keys = np.repeat(rank_base + (self._span - 1.25), capacity)
+        self._keys[slots] = np.repeat(rank_base, counts) + (seconds - self._t0)
+
+    def _slots(self):
+        """Slot of every stored fix, in (satellite, time) order."""
+        group_starts = np.cumsum(self._counts) - self._counts
+        return np.repeat(self._offsets[:-1], self._counts) + \
+            (np.arange(int(self._counts.sum())) - np.repeat(group_starts, self._counts))
+
+    def load_columns(self, sat_ids, times, lat, lon, alt):
+        """Replace the store with column arrays (times as datetimes or datetime64)."""
+        with self._lock:
+            self._pending = []
+            self._set_columns(
+                np.asarray(sat_ids, dtype=np.int64), to_seconds(times),
+                np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64), np.asarray(alt, dtype=np.float64)
+            )
+            self.loaded = True
+            self.loaded_at = time.time()
+
+    def is_stale(self):
+        return self.loaded and time.time() - self.loaded_at >= self.refresh_seconds
+
+    def ensure_loaded(self, loader):
+        """
+        Populate from loader() -> (sat_ids, times, lat, lon, alt) on first use,
+        and again once the data is refresh_seconds old, picking up fixes other
+        workers wrote. The loader runs outside the store lock, so add() and
+        invalidate() from async handlers never wait on it: fixes added
+        meanwhile are merged on top, and an invalidate() meanwhile discards the
+        load and it is redone. While a stale store reloads, other callers keep
+        answering from it.
+        """
+        if self.loaded and not self.is_stale():
+            return
+        if not self._load_lock.acquire(blocking=not self.loaded):
+            return
+        try:
+            while not self.loaded or self.is_stale():
+                with self._lock:
+                    generation = self._generation
+                    self._added_while_loading = []
+                started = time.time()
+                try:
+                    columns = loader()
+                except BaseException:
+                    with self._lock:
+                        self._added_while_loading = None
+                    raise
+                with self._lock:
+                    added, self._added_while_loading = self._added_while_loading, None
+                    if generation == self._generation:
+                        self.load_columns(*columns)
+                        self.loaded_at = started
+                        # May repeat fixes the loader already read; a repeated fix interpolates the same
+                        self._pending = added
+                if self.loaded:
+                    break
+        finally:
+            self._load_lock.release()
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded = False
+            self._pending = []
+            self._generation += 1
+
+    def add(self, fixes):
+        """Queue new fixes (Tracking / TrackingCreate objects); merged on the next query."""
+        with self._lock:
+            if self._added_while_loading is not None:
+                self._added_while_loading.extend(fixes)
+            if self.loaded:
+                self._pending.extend(fixes)
+
+    def _merge_pending(self):
+        """
+        Add the queued fixes to the columns. Fixes later than their satellite's
+        last one go into its free slots; anything else (a backfilled fix, a new
+        satellite, no free slots left, a time outside the key span) splices the
+        sorted new fixes into the stored ones and lays the columns out afresh.
+        Neither path re-sorts the stored fixes.
+        """
+        if not self._pending:
+            return
+        fixes, self._pending = self._pending, []
+        sat_ids = np.array([f.satellite_id for f in fixes], dtype=np.int64)
+        seconds = to_seconds([f.timestamp for f in fixes])
+        lat = np.array([f.latitude for f in fixes], dtype=np.float64)
+        lon = np.array([f.longitude for f in fixes], dtype=np.float64)
+        alt = np.array([f.altitude_km for f in fixes], dtype=np.float64)
+        order = np.lexsort((seconds, sat_ids))
+        sat_ids, seconds, lat, lon, alt = sat_ids[order], seconds[order], lat[order], lon[order], alt[order]
+
+        ranks = np.searchsorted(self.satellite_ids, sat_ids)
+        known = ranks < len(self.satellite_ids)
+        known[known] = self.satellite_ids[ranks[known]] == sat_ids[known]
+        if known.all() and seconds.min() >= self._t0 and seconds.max() - self._t0 + 2.0 <= self._span:
+            group_ranks, first, added = np.unique(ranks, return_index=True, return_counts=True)
+            tails = self._offsets[group_ranks] + self._counts[group_ranks]
+            if ((seconds[first] >= self._seconds[tails - 1]) & (tails + added <= self._offsets[group_ranks + 1])).all():
+                slots = np.repeat(tails, added) + (np.arange(len(ranks)) - np.repeat(first, added))
+                self._seconds[slots], self._lat[slots], self._lon[slots], self._alt[slots] = seconds, lat, lon, alt
+                self._keys[slots] = ranks * self._span + (seconds - self._t0)
+                self._counts[group_ranks] += added
+                return
+
+        slots = self._slots()
+        stored_seconds = self._seconds[slots]
+        satellite_ids = np.union1d(self.satellite_ids, sat_ids)
+        counts = np.zeros(len(satellite_ids), dtype=np.intp)
+        counts[np.searchsorted(satellite_ids, self.satellite_ids)] = self._counts
+        stored_ranks = np.repeat(np.arange(len(satellite_ids)), counts)
+        ranks = np.searchsorted(satellite_ids, sat_ids)
+        # A one-off key over the merged time range places the new fixes
+        t0 = min(self._t0, seconds.min()) if len(slots) else seconds.min()
+        span = max(stored_seconds.max(initial=t0), seconds.max()) - t0 + 2.0
+        at = np.searchsorted(stored_ranks * span + (stored_seconds - t0), ranks * span + (seconds - t0), side="right")
+        counts += np.bincount(ranks, minlength=len(satellite_ids))
+        self.satellite_ids = satellite_ids
+        self._lay_out(
+            counts,
+            np.insert(stored_seconds, at, seconds),
+            np.insert(self._lat[slots], at, lat),
+            np.insert(self._lon[slots], at, lon),
+            np.insert(self._alt[slots], at, alt),
+        )
+
+    # ------------------- Queries -------------------
+
+    def _evaluate(self, ranks, seconds):
+        """
+        Positions for (satellite rank, epoch seconds) pairs.
+        Returns lat, lon, alt arrays (NaN where unavailable) and a mode array.
+        """
+        starts = self._offsets[ranks]
+        ends = starts + self._counts[ranks]
+        local = np.clip(seconds - self._t0, -0.5, self._span - 1.5)
+        count_le = np.searchsorted(self._keys, ranks * self._span + local, side="right") - starts
+
+        n = len(ranks)
+        lat, lon, alt = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+        mode = np.full(n, UNAVAILABLE, dtype=np.int8)
+        sizes = ends - starts
+
+        # Between two fixes (or exactly on the last one): interpolate
+        last_time = self._seconds[ends - 1]
+        inside = (count_le > 0) & ((count_le < sizes) | (seconds == last_time))
+        # Past the last fix within the horizon: extrapolate from the last two fixes
+        beyond = (count_le == sizes) & (seconds > last_time) & (sizes >= 2) & \
+            (seconds - last_time <= self.max_extrapolation_seconds)
+
+        hi = np.where(inside, np.minimum(starts + count_le, ends - 1), ends - 1)
+        lo = np.maximum(hi - 1, starts)
+        use = inside | beyond
+        hi, lo, t = hi[use], lo[use], seconds[use]
+
+        dt = self._seconds[hi] - self._seconds[lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(dt > 0, (t - self._seconds[lo]) / dt, 1.0)
+        dlon = _wrap_longitude(self._lon[hi] - self._lon[lo])
+        lat[use] = np.clip(self._lat[lo] + frac * (self._lat[hi] - self._lat[lo]), -90.0, 90.0)
+        lon[use] = _wrap_longitude(self._lon[lo] + frac * dlon)
+        alt[use] = self._alt[lo] + frac * (self._alt[hi] - self._alt[lo])
+        mode[inside] = INTERPOLATED
+        mode[beyond] = EXTRAPOLATED
+        return lat, lon, alt, mode
+
+    def fleet_at(self, at, satellite_ids=None):
+        """Every (or the given) satellite's position at one instant."""
+        with self._lock:
+            self._merge_pending()
+            if satellite_ids is None or not len(self.satellite_ids):
+                ranks = np.arange(len(self.satellite_ids) if satellite_ids is None else 0)
+            else:
+                wanted = np.asarray(satellite_ids, dtype=np.int64)
+                ranks = np.searchsorted(self.satellite_ids, wanted)
+                ranks = ranks[(ranks < len(self.satellite_ids)) &
+                              (self.satellite_ids[np.minimum(ranks, len(self.satellite_ids) - 1)] == wanted)]
+            seconds = np.full(len(ranks), to_seconds(at)[0])
+            ids = self.satellite_ids[ranks]
+            if not len(ranks):
+                return ids, np.empty(0), np.empty(0), np.empty(0), np.empty(0, dtype=np.int8)
+            return (ids, *self._evaluate(ranks, seconds))
+
+    def track_at(self, satellite_id, times):
+        """One satellite's positions at many instants; returns lat, lon, alt, mode arrays."""
+        with self._lock:
+            self._merge_pending()
+            seconds = to_seconds(times)
+            rank = np.searchsorted(self.satellite_ids, satellite_id)
+            if rank >= len(self.satellite_ids) or self.satellite_ids[rank] != satellite_id:
+                n = len(seconds)
+                return np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan), np.zeros(n, dtype=np.int8)
+            return self._evaluate(np.full(len(seconds), rank, dtype=np.intp), seconds)
+
+    def snapshot_ids(self):
+        """
+        satellite_ids with pending fixes merged. The array is replaced, never
+        modified, when fixes arrive, so it can be iterated across several queries.
+        """
+        with self._lock:
+            self._merge_pending()
+            return self.satellite_ids
+
+    def grid_at(self, seconds, satellite_ids):
+        """
+        Positions of the given satellites at every instant in seconds, as
+        (n_satellites, n_times) lat, lon, alt and mode arrays. Satellites no
+        longer in the store come back unavailable.
+        """
+        with self._lock:
+            self._merge_pending()
+            seconds = np.asarray(seconds, dtype=np.float64)
+            wanted = np.asarray(satellite_ids, dtype=np.int64)
+            shape = (len(wanted), len(seconds))
+            lat, lon, alt = np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+            mode = np.full(shape, UNAVAILABLE, dtype=np.int8)
+            ranks = np.searchsorted(self.satellite_ids, wanted)
+            known = (ranks < len(self.satellite_ids)) & \
+                (self.satellite_ids[np.minimum(ranks, len(self.satellite_ids) - 1)] == wanted) \
+                if len(self.satellite_ids) else np.zeros(len(wanted), dtype=bool)
+            n_known = int(known.sum())
+            if n_known:
+                values = self._evaluate(np.repeat(ranks[known], len(seconds)), np.tile(seconds, n_known))
+                for out, a in zip((lat, lon, alt, mode), values):
+                    out[known] = a.reshape(n_known, len(seconds))
+            return lat, lon, alt, mode
+
+    def last_fix_seconds(self):
+        """Time of each satellite's most recent fix (aligned with satellite_ids)."""
+        with self._lock:
+            self._merge_pending()
+            return self._seconds[self._offsets[:-1] + self._counts - 1] if len(self.satellite_ids) else np.empty(0)
+
+
+# ------------------- Loading -------------------
+
+FIXES_SQL = """
+    SELECT satellite_id, timestamp, latitude, longitude, altitude_km
+    FROM Satellite_Tracking
+"""
+
+
+def load_fixes(connection, chunk_size=10000):
+    """Every tracking fix as column arrays: satellite ids, times, lat, lon, altitude_km."""
+    cursor = connection.cursor()
+    cursor.arraysize = chunk_size
+    cursor.execute(FIXES_SQL)
+    columns = ([], [], [], [], [])
+    dtypes = (np.int64, "datetime64[us]", np.float64, np.float64, np.float64)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for column, values, dtype in zip(columns, zip(*rows), dtypes):
+            column.append(np.array(values, dtype=dtype))
+    return tuple(
+        np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+        for chunks, dtype in zip(columns, dtypes)
+    )
+
+
+track_store = TrackStore()
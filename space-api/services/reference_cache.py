@@ -0,0 +1,112 @@
+import asyncio
+import os
+import time
+import uuid
+from fastapi import Request, Response
+from serialization import JSONBytesResponse, dumps
+
+# In-process read-through cache for small, rarely changing reference tables
+# (missions, satellites, ground stations). Each table is held as one
+# collection snapshot plus an id index; the write handlers invalidate it.
+# Every snapshot carries a version, exposed as an ETag so clients can
+# revalidate with If-None-Match and get a 304 without any database work.
+
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+# Versions restart with the process; the boot id keeps an ETag from one
+# process (or worker) from ever matching another's.
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+class ReferenceCache:
+    def __init__(self, name, id_field, ttl_seconds=REFERENCE_CACHE_TTL_SECONDS):
+        self.name = name
+        self.id_field = id_field
+        self.ttl_seconds = ttl_seconds
+        self._lock = asyncio.Lock()
+        self._rows = None
+        self._by_id = {}
+        self._body = None
+        self._expires_at = 0.0
+        self._version = 0
+        self._generation = 0  # bumped by invalidate(); a load started before it is not cached
+        self.stats = {"hits": 0, "loads": 0, "invalidations": 0}
+
+    @property
+    def etag(self):
+        return f'W/"{self.name}-{_BOOT_ID}-{self._version}"'
+
+    def invalidate(self):
+        self._generation += 1
+        # An ETag handed out while a write lands (with rows a concurrent load
+        # returned uncached) must never match again, so it gets a version of its own
+        self._version += 1
+        self._rows = None
+        self._by_id = {}
+        self._body = None
+        self.stats["invalidations"] += 1
+
+    def _fresh(self):
+        return self._rows is not None and time.monotonic() < self._expires_at
+
+    async def rows(self, loader):
+        """The cached collection, loaded with `await loader()` when missing or expired."""
+        if self._fresh():
+            self.stats["hits"] += 1
+            return self._rows
+        async with self._lock:
+            # Another request may have loaded it while this one waited
+            if self._fresh():
+                self.stats["hits"] += 1
+                return self._rows
+            generation = self._generation
+            rows = await loader()
+            self.stats["loads"] += 1
+            if generation != self._generation:
+                return rows
+            # A TTL reload that finds the same rows keeps the version, so client ETags stay valid
+            if rows != self._rows:
+                self._version += 1
+            self._rows = rows
+            self._by_id = {row[self.id_field]: row for row in rows}
+            self._body = None
+            self._expires_at = time.monotonic() + self.ttl_seconds
+            return rows
+
+    def body(self, rows):
+        """`rows` (as returned by rows()) encoded as JSON; encoded once per cached snapshot."""
+        if rows is not self._rows:
+            return dumps(rows)
+        if self._body is None:
+            self._body = dumps(rows)
+        return self._body
+
+    async def get(self, item_id, loader):
+        """One row by id from the cached collection, or None."""
+        rows = await self.rows(loader)
+        if rows is self._rows:
+            return self._by_id.get(item_id)
+        return next((row for row in rows if row[self.id_field] == item_id), None)
+
+
+def not_modified(request: Request, response: Response, etag):
+    """
+    Set the ETag on `response`; return a 304 response instead when the
+    request's If-None-Match already names this version.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: W/"x" and "x" name the same version
+        if "*" in tags or etag in tags or etag[2:] in tags:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
+def cached_list_response(request: Request, response: Response, cache, rows):
+    """304 when the client has this version, else the cached JSON encoding of rows."""
+    return not_modified(request, response, cache.etag) or JSONBytesResponse(
+        cache.body(rows), headers={"ETag": cache.etag, "Cache-Control": "no-cache"}
+    )
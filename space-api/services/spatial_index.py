@@ -0,0 +1,200 @@
+import math
+import threading
+import numpy as np
+
+# In-memory latitude/longitude grid index for point objects such as space debris.
+# Points are bucketed into fixed-size degree cells, so a radius query only
+# touches the cells overlapping the search circle instead of the whole catalog.
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km (scalars or NumPy arrays, degrees in)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GeoGridIndex:
+    def __init__(self, cell_degrees=1.0):
+        self.cell_degrees = cell_degrees
+        self.n_rows = math.ceil(180 / cell_degrees)
+        self.n_cols = math.ceil(360 / cell_degrees)
+        self._records = {}
+        self._cells = {}
+        self._cell_of = {}
+        self._lock = threading.RLock()
+        # Held for the whole of a load, so concurrent first requests load once
+        self._load_lock = threading.Lock()
+        self._changes = None   # upserts/removals made while a load is running
+        self._generation = 0
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._records)
+
+    def _cell(self, lat, lon):
+        row = min(int((lat + 90) / self.cell_degrees), self.n_rows - 1)
+        col = int(((lon + 180) % 360) / self.cell_degrees) % self.n_cols
+        return row, col
+
+    # ------------------- Maintenance -------------------
+
+    def _build(self, records):
+        built = GeoGridIndex(self.cell_degrees)
+        for record in records:
+            built._insert(record)
+        return built
+
+    def _swap(self, built):
+        # Called with the lock held
+        self._records, self._cells, self._cell_of = built._records, built._cells, built._cell_of
+        self.loaded = True
+
+    def load(self, records):
+        """Replace the whole index. Each record is a dict with an 'id', 'latitude' and 'longitude'."""
+        built = self._build(records)
+        with self._lock:
+            self._swap(built)
+
+    def ensure_loaded(self, loader):
+        """
+        Populate the index from loader() on first use. The loader runs and the
+        grid is built outside the index lock, so upsert() and remove() from
+        async handlers never wait on it: changes made meanwhile are replayed on
+        the new grid, and an invalidate() meanwhile discards the load and it is redone.
+        """
+        with self._load_lock:
+            while not self.loaded:
+                with self._lock:
+                    generation = self._generation
+                    self._changes = []
+                try:
+                    built = self._build(loader())
+                except BaseException:
+                    with self._lock:
+                        self._changes = None
+                    raise
+                with self._lock:
+                    changes, self._changes = self._changes, None
+                    if generation == self._generation:
+                        for point_id, record in changes:
+                            built._remove(point_id)
+                            if record is not None:
+                                built._insert(record)
+                        self._swap(built)
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded = False
+            self._generation += 1
+
+    def upsert(self, record):
+        with self._lock:
+            self._remove(record["id"])
+            self._insert(record)
+            if self._changes is not None:
+                self._changes.append((record["id"], record))
+
+    def remove(self, point_id):
+        with self._lock:
+            self._remove(point_id)
+            if self._changes is not None:
+                self._changes.append((point_id, None))
+
+    def _insert(self, record):
+        cell = self._cell(record["latitude"], record["longitude"])
+        self._records[record["id"]] = record
+        self._cell_of[record["id"]] = cell
+        self._cells.setdefault(cell, set()).add(record["id"])
+
+    def _remove(self, point_id):
+        cell = self._cell_of.pop(point_id, None)
+        if cell is None:
+            return
+        del self._records[point_id]
+        members = self._cells[cell]
+        members.discard(point_id)
+        if not members:
+            del self._cells[cell]
+
+    # ------------------- Queries -------------------
+
+    def coordinates(self):
+        """Snapshot of every point as NumPy arrays: ids, latitudes, longitudes."""
+        with self._lock:
+            records = list(self._records.values())
+        return (
+            np.fromiter((r["id"] for r in records), dtype=np.int64, count=len(records)),
+            np.fromiter((r["latitude"] for r in records), dtype=np.float64, count=len(records)),
+            np.fromiter((r["longitude"] for r in records), dtype=np.float64, count=len(records)),
+        )
+
+    def _candidate_ids(self, lat, lon, radius_km):
+        dlat = radius_km / KM_PER_DEGREE
+        lat_lo, lat_hi = lat - dlat, lat + dlat
+        row_lo = max(int((lat_lo + 90) / self.cell_degrees), 0)
+        row_hi = min(int((lat_hi + 90) / self.cell_degrees), self.n_rows - 1)
+
+        # Longitude span widens towards the poles; a circle over a pole covers every column
+        max_abs_lat = max(abs(lat_lo), abs(lat_hi))
+        if lat_lo <= -90 or lat_hi >= 90 or radius_km >= HALF_CIRCUMFERENCE_KM / 2:
+            cols = range(self.n_cols)
+        else:
+            dlon = min(dlat / math.cos(math.radians(max_abs_lat)), 180.0)
+            col_lo = int(math.floor((lon - dlon + 180) / self.cell_degrees))
+            col_hi = int(math.floor((lon + dlon + 180) / self.cell_degrees))
+            if col_hi - col_lo + 1 >= self.n_cols:
+                cols = range(self.n_cols)
+            else:
+                cols = [c % self.n_cols for c in range(col_lo, col_hi + 1)]
+
+        ids = []
+        for row in range(row_lo, row_hi + 1):
+            for col in cols:
+                members = self._cells.get((row, col))
+                if members:
+                    ids.extend(members)
+        return ids
+
+    def _matches(self, record, min_size, max_size, risk_level):
+        size = record.get("size_meters")
+        if min_size is not None and (size is None or size < min_size):
+            return False
+        if max_size is not None and (size is None or size > max_size):
+            return False
+        if risk_level is not None and str(record.get("risk_level", "")).lower() != risk_level.lower():
+            return False
+        return True
+
+    def within_radius(self, lat, lon, radius_km, min_size=None, max_size=None, risk_level=None, limit=None):
+        """Records within radius_km of (lat, lon), nearest first, as (record, distance_km) pairs."""
+        with self._lock:
+            records = [
+                self._records[point_id] for point_id in self._candidate_ids(lat, lon, radius_km)
+                if self._matches(self._records[point_id], min_size, max_size, risk_level)
+            ]
+        if not records:
+            return []
+        distances = haversine_km(
+            lat, lon,
+            np.fromiter((r["latitude"] for r in records), dtype=np.float64, count=len(records)),
+            np.fromiter((r["longitude"] for r in records), dtype=np.float64, count=len(records)),
+        )
+        order = np.argsort(distances, kind="stable")
+        order = order[distances[order] <= radius_km]
+        if limit is not None:
+            order = order[:limit]
+        return [(records[i], float(distances[i])) for i in order]
+
+    def nearest(self, lat, lon, k, min_size=None, max_size=None, risk_level=None):
+        """The k nearest matching records, found by widening the search radius until k are inside it."""
+        radius_km = self.cell_degrees * KM_PER_DEGREE
+        while True:
+            found = self.within_radius(lat, lon, radius_km, min_size, max_size, risk_level, limit=k)
+            if len(found) >= k or radius_km >= HALF_CIRCUMFERENCE_KM:
+                return found
+            radius_km = min(radius_km * 2, HALF_CIRCUMFERENCE_KM)
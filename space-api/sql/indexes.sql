@@ -0,0 +1,16 @@
+-- Supporting indexes for the API's filtered and keyset-paginated queries.
+-- Run once against the application schema (safe to skip indexes that already exist).
+
+-- GET /satellite_tracking/ and /satellite_tracking/stream: ORDER BY timestamp, track_id
+CREATE INDEX idx_tracking_time_id ON Satellite_Tracking (timestamp, track_id);
+
+-- Same queries filtered by satellite or station
+CREATE INDEX idx_tracking_sat_time ON Satellite_Tracking (satellite_id, timestamp, track_id);
+CREATE INDEX idx_tracking_station_time ON Satellite_Tracking (station_id, timestamp, track_id);
+
+-- GET /logs/: ORDER BY log_time DESC, log_id DESC (scanned in descending order)
+CREATE INDEX idx_logs_time_id ON System_Logs (log_time, log_id);
+
+-- Same query filtered by level; the route compares UPPER(log_level), so tailing
+-- recent ERROR logs is one bounded range scan of this function-based index
+CREATE INDEX idx_logs_level_time ON System_Logs (UPPER(log_level), log_time, log_id);
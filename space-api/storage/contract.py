@@ -0,0 +1,429 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import traceback
+from datetime import datetime
+
+# Storage backend contract: the database behaviour the routers rely on,
+# checked through database.get_db()/get_db_async() against the configured
+# backend. Every backend must pass all checks.
+#
+#   python -m storage.contract --backend sqlite
+#   python -m storage.contract --backend oracle      # needs the Oracle settings in .env
+#
+# Checks run on the application tables inside one transaction that is rolled
+# back at the end, so they can be pointed at a shared development schema.
+
+CHECKS = []
+ASYNC_CHECKS = []
+
+
+def check(fn):
+    (ASYNC_CHECKS if asyncio.iscoroutinefunction(fn) else CHECKS).append(fn)
+    return fn
+
+
+class ContractError(AssertionError):
+    pass
+
+
+def expect(condition, message):
+    if not condition:
+        raise ContractError(message)
+
+
+def _seed_parents(cursor):
+    """A mission, satellite and ground station inserted the way the routers do; returns their ids."""
+    cursor.execute("""
+        INSERT INTO Missions (mission_name, launch_date, mission_type, status)
+        VALUES (:1, TO_DATE(:2, 'YYYY-MM-DD'), :3, :4)
+    """, ("Contract mission", "2024-03-01", "Research", "Active"))
+    cursor.execute("SELECT MAX(mission_id) FROM Missions")
+    mission_id = cursor.fetchone()[0]
+    cursor.execute("""
+        INSERT INTO Satellites (satellite_name, mission_id, orbit_type, launch_date)
+        VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'))
+    """, ["Contract sat", mission_id, "LEO", "2024-03-02"])
+    cursor.execute("SELECT satellite_seq.CURRVAL FROM dual")
+    satellite_id = cursor.fetchone()[0]
+    cursor.execute("""
+        INSERT INTO Ground_Stations (station_name, location, contact_frequency)
+        VALUES (:1, :2, :3)
+    """, ("Contract station", "51.5,-0.12", 2200.5))
+    cursor.execute("SELECT MAX(station_id) FROM Ground_Stations")
+    station_id = cursor.fetchone()[0]
+    return mission_id, satellite_id, station_id
+
+
+TRACKING_INSERT_SQL = """
+    INSERT INTO Satellite_Tracking (satellite_id, station_id, timestamp, latitude, longitude, altitude_km)
+    VALUES (:1, :2, :3, :4, :5, :6)
+"""
+
+
+# -------------------- Sync checks --------------------
+
+@check
+def sequence_ids_and_dates(connection):
+    cursor = connection.cursor()
+    mission_id, satellite_id, station_id = _seed_parents(cursor)
+    cursor.execute("SELECT mission_id, launch_date FROM Missions WHERE mission_id = :1", [mission_id])
+    row = cursor.fetchone()
+    expect(row[0] == mission_id, f"mission {mission_id} not found by id")
+    expect(isinstance(row[1], datetime) and row[1] == datetime(2024, 3, 1), f"TO_DATE round trip gave {row[1]!r}")
+    cursor.execute("SELECT mission_id FROM Satellites WHERE satellite_id = :1", [satellite_id])
+    expect(cursor.fetchone() == (mission_id,), "sequence CURRVAL did not return the new satellite id")
+    cursor.execute("SELECT TO_CHAR(launch_date, 'YYYY-MM-DD') FROM Satellites WHERE satellite_id = :1",
+                   [satellite_id])
+    expect(cursor.fetchone()[0] == "2024-03-02", "TO_CHAR(date, 'YYYY-MM-DD') format")
+
+
+@check
+def returning_into_named_binds(connection):
+    cursor = connection.cursor()
+    debris_id = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO Space_Debris (description, latitude, longitude, size_meters, risk_level)
+        VALUES (:description, :latitude, :longitude, :size_meters, :risk_level)
+        RETURNING debris_id INTO :debris_id
+    """, {"description": "Contract fragment", "latitude": 12.5, "longitude": -45.25, "size_meters": 0.75,
+          "risk_level": "Low", "debris_id": debris_id})
+    value = debris_id.getvalue()
+    expect(isinstance(value, list) and len(value) == 1, f"DML returning value should be a one-item list, got {value!r}")
+    cursor.execute("""
+        SELECT debris_id, description, latitude, longitude, size_meters, risk_level
+        FROM Space_Debris WHERE debris_id = :id
+    """, {"id": value[0]})
+    row = cursor.fetchone()
+    expect(row is not None and tuple(row[1:]) == ("Contract fragment", 12.5, -45.25, 0.75, "Low"),
+           f"row read back as {row!r}")
+    expect([d[0].lower() for d in cursor.description][:2] == ["debris_id", "description"],
+           "cursor.description column names")
+
+
+@check
+def returning_into_positional_binds(connection):
+    cursor = connection.cursor()
+    log_id = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO System_Logs (log_message, log_level, log_time)
+        VALUES (:1, :2, :3)
+        RETURNING log_id INTO :4
+    """, ["contract positional", "INFO", datetime(2024, 3, 1, 12, 30, 15), log_id])
+    cursor.execute("""
+        SELECT log_time, TO_CHAR(log_time, 'YYYY-MM-DD HH24:MI:SS') FROM System_Logs WHERE log_id = :1
+    """, [log_id.getvalue()[0]])
+    log_time, formatted = cursor.fetchone()
+    expect(log_time == datetime(2024, 3, 1, 12, 30, 15), f"datetime round trip gave {log_time!r}")
+    expect(formatted == "2024-03-01 12:30:15", f"TO_CHAR(date, 'YYYY-MM-DD HH24:MI:SS') gave {formatted!r}")
+
+
+@check
+def executemany_batch_errors(connection):
+    cursor = connection.cursor()
+    _, satellite_id, station_id = _seed_parents(cursor)
+    cursor.execute("SELECT COUNT(*) FROM Satellite_Tracking WHERE satellite_id = :1", [satellite_id])
+    before = cursor.fetchone()[0]
+    rows = [
+        (satellite_id, station_id, datetime(2024, 3, 1, 0, 0, i), 1.0 * i, 2.0 * i, 500.0 + i)
+        for i in range(5)
+    ]
+    rows[2] = (-1, station_id, datetime(2024, 3, 1, 0, 0, 2), 0.0, 0.0, 500.0)  # unknown satellite
+    cursor.executemany(TRACKING_INSERT_SQL, rows, batcherrors=True)
+    offsets = [error.offset for error in cursor.getbatcherrors()]
+    expect(offsets == [2], f"batch errors at offsets {offsets}, expected [2]")
+    cursor.execute("SELECT COUNT(*) FROM Satellite_Tracking WHERE satellite_id = :1", [satellite_id])
+    expect(cursor.fetchone()[0] - before == 4, "the other rows of the batch were not inserted")
+
+
+@check
+def keyset_pagination(connection):
+    cursor = connection.cursor()
+    _, satellite_id, station_id = _seed_parents(cursor)
+    cursor.executemany(TRACKING_INSERT_SQL, [
+        (satellite_id, station_id, datetime(2024, 3, 1, 0, i // 2), 0.0, 0.0, 500.0) for i in range(25)
+    ])
+    seen, last = [], None
+    while True:
+        binds = {"satellite_id": satellite_id, "page_size": 10}
+        keyset = ""
+        if last:
+            keyset = "AND (timestamp > :cursor_time OR (timestamp = :cursor_time AND track_id > :cursor_id))"
+            binds.update(cursor_time=last[1], cursor_id=last[0])
+        cursor.execute(f"""
+            SELECT track_id, timestamp FROM Satellite_Tracking
+            WHERE satellite_id = :satellite_id {keyset}
+            ORDER BY timestamp, track_id
+            FETCH FIRST :page_size ROWS ONLY
+        """, binds)
+        page = cursor.fetchall()
+        seen.extend(page)
+        if len(page) < 10:
+            break
+        last = page[-1]
+    expect(len(seen) == 25 and len({row[0] for row in seen}) == 25, f"paged {len(seen)} rows, expected 25 distinct")
+    expect(seen == sorted(seen, key=lambda row: (row[1], row[0])), "pages out of (timestamp, track_id) order")
+
+
+@check
+def fetchmany_and_iteration(connection):
+    cursor = connection.cursor()
+    _, satellite_id, station_id = _seed_parents(cursor)
+    cursor.executemany(TRACKING_INSERT_SQL, [
+        (satellite_id, station_id, datetime(2024, 3, 2, 0, 0, i), 0.0, 0.0, 500.0) for i in range(7)
+    ])
+    cursor.arraysize = 3
+    cursor.execute("SELECT track_id FROM Satellite_Tracking WHERE satellite_id = :1", [satellite_id])
+    sizes = []
+    while True:
+        rows = cursor.fetchmany(3)
+        if not rows:
+            break
+        sizes.append(len(rows))
+    expect(sizes == [3, 3, 1], f"fetchmany chunk sizes {sizes}")
+    cursor.execute("SELECT track_id FROM Satellite_Tracking WHERE satellite_id = :1", [satellite_id])
+    expect(sum(1 for _ in cursor) == 7, "iterating the cursor did not yield every row")
+
+
+@check
+def latest_fix_window_query(connection):
+    cursor = connection.cursor()
+    _, satellite_id, station_id = _seed_parents(cursor)
+    cursor.executemany(TRACKING_INSERT_SQL, [
+        (satellite_id, station_id, datetime(2030, 1, 1, 0, i), float(i), 0.0, 500.0) for i in range(3)
+    ])
+    cursor.execute("""
+        SELECT satellite_id, timestamp, latitude
+        FROM (
+            SELECT t.satellite_id, t.timestamp, t.latitude,
+                   ROW_NUMBER() OVER (PARTITION BY t.satellite_id ORDER BY t.timestamp DESC, t.track_id DESC) AS rn
+            FROM Satellite_Tracking t
+            WHERE t.satellite_id = :1
+        )
+        WHERE rn = 1
+    """, [satellite_id])
+    row = cursor.fetchone()
+    expect(row is not None and row[2] == 2.0, f"latest fix was {row!r}")
+    expect(isinstance(row[1], datetime), f"timestamps through a subquery should stay datetimes, got {row[1]!r}")
+
+
+@check
+def log_filters(connection):
+    cursor = connection.cursor()
+    cursor.executemany("INSERT INTO System_Logs (log_message, log_level, log_time) VALUES (:1, :2, :3)", [
+        ("Contract Needle one", "Error", datetime(2031, 1, 1, 0, 0, 1)),
+        ("contract needle two", "ERROR", datetime(2031, 1, 1, 0, 0, 2)),
+        ("contract needle three", "INFO", datetime(2031, 1, 1, 0, 0, 3)),
+    ])
+    cursor.execute("""
+        SELECT log_message FROM System_Logs
+        WHERE UPPER(log_level) IN (:level_0) AND INSTR(LOWER(log_message), :q) > 0 AND log_time >= :start_time
+        ORDER BY log_time DESC, log_id DESC
+    """, {"level_0": "ERROR", "q": "contract needle", "start_time": datetime(2031, 1, 1)})
+    messages = [row[0] for row in cursor.fetchall()]
+    expect(messages == ["contract needle two", "Contract Needle one"], f"filtered logs {messages}")
+
+
+@check
+def rowcount_and_rollback(connection):
+    cursor = connection.cursor()
+    cursor.execute("UPDATE Missions SET status = :1 WHERE mission_id = :2", ["Completed", -1])
+    expect(cursor.rowcount == 0, f"rowcount for an update matching nothing was {cursor.rowcount}")
+    mission_id, _, _ = _seed_parents(cursor)
+    cursor.execute("UPDATE Missions SET status = :1 WHERE mission_id = :2", ["Completed", mission_id])
+    expect(cursor.rowcount == 1, f"rowcount for a one-row update was {cursor.rowcount}")
+    connection.rollback()
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM Missions WHERE mission_id = :1", [mission_id])
+    expect(cursor.fetchone()[0] == 0, "rollback did not discard the uncommitted insert")
+
+
+RELEASE_MARKER = "contract released uncommitted"
+
+
+@check
+def release_discards_uncommitted_work(connection):
+    from database import get_db
+
+    with get_db() as session:
+        session.cursor().execute("INSERT INTO System_Logs (log_message, log_level) VALUES (:1, :2)",
+                                 [RELEASE_MARKER, "INFO"])
+    # The pool hands the released session out again; it must not carry the insert
+    with get_db() as session:
+        cursor = session.cursor()
+        cursor.execute("SELECT COUNT(*) FROM System_Logs WHERE log_message = :1", [RELEASE_MARKER])
+        expect(cursor.fetchone()[0] == 0, "releasing a session did not roll back its uncommitted insert")
+
+
+@check
+def database_errors(connection):
+    from database import DatabaseError
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT no_such_column FROM Missions")
+    except DatabaseError:
+        return
+    raise ContractError("a bad statement did not raise the backend's DatabaseError")
+
+
+# -------------------- Async checks --------------------
+
+@check
+async def async_returning_and_fetch(connection):
+    cursor = connection.cursor()
+    log_id = cursor.var(int)
+    await cursor.execute("""
+        INSERT INTO System_Logs (log_message, log_level)
+        VALUES (:1, :2)
+        RETURNING log_id INTO :3
+    """, ["contract async", "INFO", log_id])
+    await cursor.execute("SELECT log_message, log_time FROM System_Logs WHERE log_id = :1", [log_id.getvalue()[0]])
+    row = await cursor.fetchone()
+    expect(row is not None and row[0] == "contract async", f"async row read back as {row!r}")
+    expect(isinstance(row[1], datetime), f"defaulted log_time should be a datetime, got {row[1]!r}")
+
+
+@check
+async def async_batch_errors_and_fetchmany(connection):
+    from database import DatabaseError
+
+    cursor = connection.cursor()
+    await cursor.execute("""
+        INSERT INTO Missions (mission_name, launch_date, mission_type, status)
+        VALUES (:1, TO_DATE(:2, 'YYYY-MM-DD'), :3, :4)
+    """, ("Contract async mission", "2024-03-01", "Research", "Active"))
+    await cursor.execute("SELECT MAX(mission_id) FROM Missions")
+    mission_id = (await cursor.fetchone())[0]
+    await cursor.execute("""
+        INSERT INTO Satellites (satellite_name, mission_id, orbit_type, launch_date)
+        VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'))
+    """, ["Contract async sat", mission_id, "LEO", "2024-03-02"])
+    await cursor.execute("SELECT satellite_seq.CURRVAL FROM dual")
+    satellite_id = (await cursor.fetchone())[0]
+    await cursor.execute("SELECT MIN(station_id) FROM Ground_Stations")
+    station_id = (await cursor.fetchone())[0]
+    if station_id is None:
+        await cursor.execute("INSERT INTO Ground_Stations (station_name, location, contact_frequency) "
+                             "VALUES (:1, :2, :3)", ("Contract async station", "0,0", 100.0))
+        await cursor.execute("SELECT MAX(station_id) FROM Ground_Stations")
+        station_id = (await cursor.fetchone())[0]
+
+    rows = [(satellite_id, station_id, datetime(2024, 3, 3, 0, 0, i), 0.0, 0.0, 500.0) for i in range(6)]
+    rows[4] = (-1,) + rows[4][1:]
+    await cursor.executemany(TRACKING_INSERT_SQL, rows, batcherrors=True)
+    offsets = [error.offset for error in cursor.getbatcherrors()]
+    expect(offsets == [4], f"async batch errors at offsets {offsets}, expected [4]")
+
+    await cursor.execute("SELECT track_id FROM Satellite_Tracking WHERE satellite_id = :1 ORDER BY track_id",
+                         [satellite_id])
+    chunks = []
+    while True:
+        chunk = await cursor.fetchmany(2)
+        if not chunk:
+            break
+        chunks.append(len(chunk))
+    expect(chunks == [2, 2, 1], f"async fetchmany chunk sizes {chunks}")
+
+    try:
+        await cursor.execute("SELECT no_such_column FROM Missions")
+    except DatabaseError:
+        return
+    raise ContractError("a bad statement did not raise the backend's DatabaseError")
+
+
+@check
+async def async_release_discards_uncommitted_work(connection):
+    from database import get_db_async
+
+    async with get_db_async() as session:
+        await session.cursor().execute("INSERT INTO System_Logs (log_message, log_level) VALUES (:1, :2)",
+                                       [RELEASE_MARKER, "INFO"])
+    async with get_db_async() as session:
+        cursor = session.cursor()
+        await cursor.execute("SELECT COUNT(*) FROM System_Logs WHERE log_message = :1", [RELEASE_MARKER])
+        count = (await cursor.fetchone())[0]
+        expect(count == 0, "releasing an async session did not roll back its uncommitted insert")
+
+
+# -------------------- Runner --------------------
+
+def _report(name, error):
+    if error is None:
+        print(f"  PASS  {name}")
+        return True
+    detail = str(error) if isinstance(error, ContractError) else traceback.format_exception_only(error)[-1].strip()
+    print(f"  FAIL  {name}: {detail}")
+    return False
+
+
+def run_sync():
+    from database import get_db
+
+    results = []
+    for fn in CHECKS:
+        with get_db() as connection:
+            try:
+                fn(connection)
+                error = None
+            except Exception as e:
+                error = e
+            finally:
+                connection.rollback()
+        results.append(_report(fn.__name__, error))
+    return results
+
+
+async def run_async():
+    from database import close_async_pool, get_db_async
+
+    results = []
+    try:
+        for fn in ASYNC_CHECKS:
+            async with get_db_async() as connection:
+                try:
+                    await fn(connection)
+                    error = None
+                except Exception as e:
+                    error = e
+                finally:
+                    await connection.rollback()
+            results.append(_report(fn.__name__, error))
+    finally:
+        await close_async_pool()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a storage backend against the routers' database contract.")
+    parser.add_argument("--backend", choices=("oracle", "sqlite"),
+                        help="Overrides STORAGE_BACKEND for this run")
+    parser.add_argument("--sqlite-path", help="SQLite database file (default: a temporary file)")
+    args = parser.parse_args()
+
+    if args.backend:
+        os.environ["STORAGE_BACKEND"] = args.backend
+    if os.getenv("STORAGE_BACKEND") == "sqlite" and (args.sqlite_path or args.backend):
+        os.environ["SQLITE_PATH"] = args.sqlite_path or os.path.join(tempfile.mkdtemp(), "contract.db")
+
+    import database
+
+    print(f"storage backend: {database.STORAGE_BACKEND}")
+    try:
+        with database.get_db():
+            pass
+    except database.get_backend().DatabaseError as e:
+        print(f"cannot open the {database.STORAGE_BACKEND} database: {e}")
+        sys.exit(2)
+    try:
+        results = run_sync() + asyncio.run(run_async())
+    finally:
+        database.close_pool()
+    print(f"{sum(results)}/{len(results)} checks passed")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import oracledb
+import os
+from dotenv import load_dotenv
+
+# Oracle storage backend (STORAGE_BACKEND=oracle, the default): python-oracledb
+# in thin mode, with a threaded session pool for sync handlers and an asyncio
+# pool for async ones. This is the only module that imports the Oracle driver,
+# so the SQLite backend runs without it installed.
+
+load_dotenv()
+
+DB_USER = os.getenv("ORACLE_USERNAME")
+DB_PASSWORD = os.getenv("ORACLE_PASSWORD")
+DB_DSN = os.getenv("ORACLE_DSN")
+
+DatabaseError = oracledb.DatabaseError
+
+
+def create_pool(min, max, increment=1, wait_timeout_ms=5000, ping_interval=60):
+    return oracledb.create_pool(
+        user=DB_USER,
+        password=DB_PASSWORD,
+        dsn=DB_DSN,
+        min=min,
+        max=max,
+        increment=increment,
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=wait_timeout_ms,
+        ping_interval=ping_interval,
+    )
+
+
+def create_pool_async(min, max, increment=1, wait_timeout_ms=5000, ping_interval=60):
+    return oracledb.create_pool_async(
+        user=DB_USER,
+        password=DB_PASSWORD,
+        dsn=DB_DSN,
+        min=min,
+        max=max,
+        increment=increment,
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=wait_timeout_ms,
+        ping_interval=ping_interval,
+    )
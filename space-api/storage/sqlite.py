@@ -0,0 +1,414 @@
+import asyncio
+import functools
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Embedded SQLite storage backend (STORAGE_BACKEND=sqlite), for edge
+# deployments and local performance work. It exposes the same pool, connection
+# and cursor surface the routers use with python-oracledb, so the
+# routers keep their SQL: statements are rewritten from Oracle to SQLite as
+# they are executed (binds, TO_CHAR/TO_DATE, FETCH FIRST, RETURNING ... INTO,
+# sequence CURRVAL) and cached per statement text.
+#
+# Each pooled session is its own SQLite connection on one database file in WAL
+# mode, so readers never block the writer or each other. Asyncio connections
+# run each call on a worker thread of their own, keeping the event loop free
+# like the thin-mode driver does. A shared executor would not do: writers
+# waiting out the busy timeout could take every thread and leave the
+# connection holding the write lock none to commit on.
+
+SQLITE_PATH = os.getenv("SQLITE_PATH", "space_api.db")
+# How long a write waits for another connection's write transaction
+SQLITE_BUSY_TIMEOUT_SECONDS = float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Missions (
+    mission_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_name TEXT NOT NULL,
+    launch_date TIMESTAMP,
+    mission_type TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS Satellites (
+    satellite_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    satellite_name TEXT NOT NULL,
+    launch_date TIMESTAMP,
+    orbit_type TEXT,
+    mission_id INTEGER REFERENCES Missions (mission_id)
+);
+CREATE TABLE IF NOT EXISTS Ground_Stations (
+    station_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    station_name TEXT NOT NULL,
+    location TEXT,
+    contact_frequency REAL
+);
+CREATE TABLE IF NOT EXISTS Satellite_Tracking (
+    track_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    satellite_id INTEGER NOT NULL REFERENCES Satellites (satellite_id),
+    station_id INTEGER NOT NULL REFERENCES Ground_Stations (station_id),
+    timestamp TIMESTAMP NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    altitude_km REAL
+);
+CREATE TABLE IF NOT EXISTS Space_Debris (
+    debris_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    description TEXT,
+    latitude REAL,
+    longitude REAL,
+    size_meters REAL,
+    risk_level TEXT
+);
+CREATE TABLE IF NOT EXISTS Predictions (
+    prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    satellite_id INTEGER REFERENCES Satellites (satellite_id),
+    prediction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status_prediction TEXT,
+    lifespan_months INTEGER,
+    collision_risk TEXT
+);
+CREATE TABLE IF NOT EXISTS System_Logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    log_message TEXT,
+    log_level TEXT,
+    log_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Same indexes as sql/indexes.sql, plus the foreign-key columns
+CREATE INDEX IF NOT EXISTS idx_tracking_time_id ON Satellite_Tracking (timestamp, track_id);
+CREATE INDEX IF NOT EXISTS idx_tracking_sat_time ON Satellite_Tracking (satellite_id, timestamp, track_id);
+CREATE INDEX IF NOT EXISTS idx_tracking_station_time ON Satellite_Tracking (station_id, timestamp, track_id);
+CREATE INDEX IF NOT EXISTS idx_logs_time_id ON System_Logs (log_time, log_id);
+CREATE INDEX IF NOT EXISTS idx_logs_level_time ON System_Logs (UPPER(log_level), log_time, log_id);
+CREATE INDEX IF NOT EXISTS idx_satellites_mission ON Satellites (mission_id);
+CREATE INDEX IF NOT EXISTS idx_predictions_sat_date ON Predictions (satellite_id, prediction_date);
+"""
+
+# Datetimes are stored as ISO 8601 text, which sorts chronologically
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+
+class DatabaseError(Exception):
+    """A SQLite error; handlers catch it as database.DatabaseError."""
+
+
+# -------------------- SQL translation --------------------
+
+_RETURNING = re.compile(r"RETURNING\s+(\w+)\s+INTO\s+:\w+", re.I)
+_REWRITES = [
+    (re.compile(r"TO_DATE\(\s*(:\w+)\s*,\s*'[^']*'\s*\)", re.I), r"\1"),
+    (re.compile(r"TO_CHAR\(\s*([\w.]+)\s*,\s*'YYYY-MM-DD HH24:MI:SS'\s*\)", re.I), r"strftime('%Y-%m-%d %H:%M:%S', \1)"),
+    (re.compile(r"TO_CHAR\(\s*([\w.]+)\s*,\s*'YYYY-MM-DD'\s*\)", re.I), r"strftime('%Y-%m-%d', \1)"),
+    (re.compile(r"FETCH\s+FIRST\s+(:\w+|\d+)\s+ROWS\s+ONLY", re.I), r"LIMIT \1"),
+    (re.compile(r"SELECT\s+\w+\.CURRVAL\s+FROM\s+dual", re.I), "SELECT last_insert_rowid()"),
+    (re.compile(r"\bSYSTIMESTAMP\b|\bSYSDATE\b", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"(?<![\w:]):(\d+)\b"), r"?\1"),
+]
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(sql):
+    """Oracle SQL as issued by the routers -> (SQLite SQL, whether it has RETURNING)."""
+    returning = _RETURNING.search(sql) is not None
+    sql = _RETURNING.sub(r"RETURNING \1", sql)
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql, returning
+
+
+class Var:
+    """Out bind for RETURNING ... INTO; getvalue() is a list, as for Oracle DML returning."""
+
+    def __init__(self, *args, **kwargs):
+        self._value = []
+
+    def getvalue(self, pos=0):
+        return self._value
+
+
+class BatchError:
+    def __init__(self, offset, message):
+        self.offset = offset
+        self.message = message
+
+
+def _split_binds(params):
+    """The in binds (out bind removed) and the out bind Var, if any."""
+    if params is None:
+        return (), None
+    if isinstance(params, dict):
+        out = next((value for value in params.values() if isinstance(value, Var)), None)
+        return ({k: v for k, v in params.items() if not isinstance(v, Var)} if out else params), out
+    out = next((value for value in params if isinstance(value, Var)), None)
+    return ([v for v in params if not isinstance(v, Var)] if out else params), out
+
+
+# -------------------- Connections --------------------
+
+class Cursor:
+    def __init__(self, connection):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self._batch_errors = []
+        self.arraysize = 100
+        self.prefetchrows = 2
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def var(self, *args, **kwargs):
+        return Var()
+
+    def execute(self, sql, params=None):
+        sql, returning = translate(sql)
+        binds, out = _split_binds(params)
+        with self._connection.lock:
+            try:
+                self._cursor.execute(sql, binds)
+                if returning:
+                    returned = self._cursor.fetchall()
+                    if out is not None:
+                        out._value = [row[0] for row in returned]
+            except sqlite3.Error as e:
+                raise DatabaseError(str(e)) from e
+
+    def executemany(self, sql, rows, batcherrors=False):
+        sql, _ = translate(sql)
+        self._batch_errors = []
+        with self._connection.lock:
+            try:
+                if not batcherrors:
+                    self._cursor.executemany(sql, rows)
+                    return
+                # Rows go in one at a time so a bad row is reported instead of failing the batch;
+                # inside one transaction this is still cheap for SQLite
+                for offset, row in enumerate(rows):
+                    try:
+                        self._cursor.execute(sql, row)
+                    except sqlite3.OperationalError:
+                        raise
+                    except sqlite3.Error as e:
+                        self._batch_errors.append(BatchError(offset, str(e)))
+            except sqlite3.Error as e:
+                raise DatabaseError(str(e)) from e
+
+    def getbatcherrors(self):
+        return self._batch_errors
+
+    def fetchone(self):
+        with self._connection.lock:
+            return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        with self._connection.lock:
+            return self._cursor.fetchmany(size or self.arraysize)
+
+    def fetchall(self):
+        with self._connection.lock:
+            return self._cursor.fetchall()
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+
+class AsyncCursor(Cursor):
+    async def execute(self, sql, params=None):
+        await self._connection.run(Cursor.execute, self, sql, params)
+
+    async def executemany(self, sql, rows, batcherrors=False):
+        await self._connection.run(Cursor.executemany, self, sql, rows, batcherrors)
+
+    async def fetchone(self):
+        # Rows are already materialised by SQLite's step; no thread hop for one row
+        return Cursor.fetchone(self)
+
+    async def fetchmany(self, size=None):
+        return await self._connection.run(Cursor.fetchmany, self, size)
+
+    async def fetchall(self):
+        return await self._connection.run(Cursor.fetchall, self)
+
+    async def __aiter__(self):
+        while True:
+            rows = await self.fetchmany()
+            if not rows:
+                return
+            for row in rows:
+                yield row
+
+
+def connect(path):
+    """A raw sqlite3 connection with the backend's settings (WAL, foreign keys, datetime types)."""
+    raw = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                          timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+    raw.execute("PRAGMA journal_mode=WAL")
+    raw.execute("PRAGMA synchronous=NORMAL")
+    raw.execute("PRAGMA foreign_keys=ON")
+    return raw
+
+
+def ensure_schema(path):
+    """Create any missing tables and indexes."""
+    raw = connect(path)
+    try:
+        raw.executescript(SCHEMA)
+    finally:
+        raw.close()
+
+
+class Connection:
+    cursor_type = Cursor
+
+    def __init__(self, path):
+        self.raw = connect(path)
+        self.lock = threading.Lock()
+
+    def cursor(self):
+        return self.cursor_type(self)
+
+    def commit(self):
+        with self.lock:
+            self.raw.commit()
+
+    def rollback(self):
+        with self.lock:
+            self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+
+class AsyncConnection(Connection):
+    cursor_type = AsyncCursor
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-session")
+
+    def run(self, fn, *args):
+        """Run a blocking call on this connection's worker thread."""
+        return asyncio.get_running_loop().run_in_executor(self._worker, fn, *args)
+
+    async def commit(self):
+        await self.run(Connection.commit, self)
+
+    async def rollback(self):
+        await self.run(Connection.rollback, self)
+
+    def close(self):
+        super().close()
+        self._worker.shutdown(wait=False)
+
+
+# -------------------- Pools --------------------
+
+class SessionPool:
+    """Counterpart of the python-oracledb session pool: at most `max` connections, idle ones reused."""
+    connection_type = Connection
+
+    def __init__(self, path, min=1, max=10, wait_timeout_ms=5000):
+        self.path = path
+        self.min = min
+        self.max = max
+        self.wait_timeout = wait_timeout_ms / 1000
+        self.opened = 0
+        self.busy = 0
+        self._idle = []
+        self._available = threading.Condition()
+
+    def _checkout(self):
+        # Called with the pool's condition held and a session available
+        self.busy += 1
+        if self._idle:
+            return self._idle.pop()
+        self.opened += 1
+        return None
+
+    def _open(self):
+        try:
+            return self.connection_type(self.path)
+        except sqlite3.Error as e:
+            with self._available:
+                self.opened -= 1
+                self.busy -= 1
+            raise DatabaseError(str(e)) from e
+
+    def acquire(self):
+        with self._available:
+            if not self._available.wait_for(lambda: self._idle or self.opened < self.max, self.wait_timeout):
+                raise DatabaseError(f"timed out after {self.wait_timeout:.1f}s waiting for a pooled connection")
+            connection = self._checkout()
+        return connection or self._open()
+
+    def release(self, connection):
+        # Uncommitted work is rolled back, as with Oracle
+        connection.rollback()
+        with self._available:
+            self._idle.append(connection)
+            self.busy -= 1
+            self._available.notify()
+
+    def close(self, force=False):
+        with self._available:
+            for connection in self._idle:
+                connection.close()
+            self._idle = []
+
+
+class AsyncSessionPool(SessionPool):
+    """Counterpart of the python-oracledb asyncio pool."""
+    connection_type = AsyncConnection
+
+    def __init__(self, path, min=1, max=10, wait_timeout_ms=5000):
+        super().__init__(path, min, max, wait_timeout_ms)
+        self._async_available = None
+
+    async def acquire(self):
+        if self._async_available is None:
+            self._async_available = asyncio.Condition()
+        async with self._async_available:
+            try:
+                await asyncio.wait_for(
+                    self._async_available.wait_for(lambda: self._idle or self.opened < self.max),
+                    self.wait_timeout
+                )
+            except asyncio.TimeoutError:
+                raise DatabaseError(f"timed out after {self.wait_timeout:.1f}s waiting for a pooled connection")
+            connection = self._checkout()
+        return connection or self._open()
+
+    async def release(self, connection):
+        await connection.rollback()
+        async with self._async_available:
+            self._idle.append(connection)
+            self.busy -= 1
+            self._async_available.notify()
+
+    async def close(self, force=False):
+        SessionPool.close(self)
+
+
+def create_pool(min, max, increment=1, wait_timeout_ms=5000, ping_interval=60, path=None):
+    path = path or SQLITE_PATH
+    ensure_schema(path)
+    return SessionPool(path, min=min, max=max, wait_timeout_ms=wait_timeout_ms)
+
+
+def create_pool_async(min, max, increment=1, wait_timeout_ms=5000, ping_interval=60, path=None):
+    path = path or SQLITE_PATH
+    ensure_schema(path)
+    return AsyncSessionPool(path, min=min, max=max, wait_timeout_ms=wait_timeout_ms)